@@ -14,6 +14,7 @@
   const kind = app.getAttribute("data-kind") || "docs";
   const indexUrl = app.getAttribute("data-index") || "index.json";
   const searchUrl = app.getAttribute("data-search") || "search.json";
+  const searchManifestUrl = app.getAttribute("data-search-manifest");
   const baseUrl = app.getAttribute("data-base") || "source/";
   const defaultId = app.getAttribute("data-default") || "start";
 
@@ -139,11 +140,11 @@
     return normalized || defaultId;
   }
 
-  function setCurrentId(id, { replace = false } = {}) {
+  function setCurrentId(id, { replace = false, hash } = {}) {
     const params = new URLSearchParams(globalThis.location.search);
     params.set("p", id);
     const next = `${globalThis.location.pathname}?${params.toString()}${
-      globalThis.location.hash || ""
+      hash ?? (globalThis.location.hash || "")
     }`;
     if (replace) {
       globalThis.history.replaceState({ p: id }, "", next);
@@ -415,7 +416,41 @@
     }
   }
 
+  // GitHub-style heading slugs; build-indexes.py mirrors this (`Slugger`) so
+  // search results can deep-link to a section.
+  function slugify(text) {
+    return String(text)
+      .toLowerCase()
+      .trim()
+      .replace(/<[!\/a-z].*?>/gi, "")
+      .replace(/[\u2000-\u206F\u2E00-\u2E7F\\'!"#$%&()*+,./:;<=>?@[\]^`{|}~]/g, "")
+      .replace(/\s/g, "-");
+  }
+
+  function assignHeadingIds(container) {
+    const seen = new Map();
+    const headings = Array.from(container.querySelectorAll("h1, h2, h3, h4, h5, h6"));
+    for (const h of headings) {
+      let slug = slugify(h.textContent || "");
+      if (seen.has(slug)) {
+        let count = seen.get(slug);
+        let candidate;
+        do {
+          count += 1;
+          candidate = `${slug}-${count}`;
+        } while (seen.has(candidate));
+        seen.set(slug, count);
+        seen.set(candidate, 0);
+        slug = candidate;
+      } else {
+        seen.set(slug, 0);
+      }
+      if (!h.getAttribute("id")) h.setAttribute("id", slug);
+    }
+  }
+
   function addHeadingAnchors(container) {
+    assignHeadingIds(container);
     const headings = Array.from(container.querySelectorAll("h2, h3, h4"));
     for (const h of headings) {
       const id = h.getAttribute("id");
@@ -632,13 +667,45 @@
     }
   }
 
-  function compileSearch(items) {
-    return items.map((item) => {
+  // Inverse of `compact_search_fields` in build-indexes.py.
+  function expandCompact(search) {
+    const sections = search.sections || [];
+    const pages = search.pages || {};
+    const records = search.records || {};
+    return (records.page || []).map((p, n) => ({
+      id: pages.id[p],
+      anchor: records.anchor[n],
+      title: records.title[n],
+      page: pages.title[p],
+      section: sections[pages.section[p]],
+      summary: records.summary[n],
+    }));
+  }
+
+  function compileSearch(search) {
+    // v5 renamed `items` to `records`: they no longer carry body text, which
+    // the pre-index linear scan below needs.
+    const items =
+      search?.format === "compact" ? expandCompact(search) : search?.records || search?.items || [];
+
+    // v2+ ships a prebuilt inverted index; keep the linear scan for older files.
+    if (search?.version >= 2 && search.index?.terms) {
+      const postings = search.index.terms;
+      return {
+        docs: items,
+        terms: Object.keys(postings).sort(),
+        postings,
+        parsed: new Map(),
+      };
+    }
+
+    const docs = items.map((item) => {
       const haystack = `${item.title} ${item.summary || ""} ${item.text || ""}`
         .toLowerCase()
         .replace(/\s+/g, " ");
       return { ...item, haystack };
     });
+    return { docs, terms: null };
   }
 
   function tokenize(query) {
@@ -650,6 +717,11 @@
       .slice(0, 8);
   }
 
+  // Must agree with `search_terms` in build-indexes.py.
+  function tokenizeTerms(query) {
+    return (String(query).toLowerCase().match(/[\p{L}\p{N}_]+/gu) || []).slice(0, 8);
+  }
+
   function scoreMatch(doc, terms) {
     let score = 0;
     const title = (doc.title || "").toLowerCase();
@@ -664,11 +736,95 @@
     return score;
   }
 
-  function searchDocs(searchIndex, query, limit = 20) {
+  function postingsFor(searchIndex, term) {
+    let list = searchIndex.parsed.get(term);
+    if (!list) {
+      list = [];
+      for (const entry of searchIndex.postings[term].split(";")) {
+        const [n, title, summary, text] = entry.split(",");
+        list.push(Number(n), Number(title), Number(summary), Number(text));
+      }
+      searchIndex.parsed.set(term, list);
+    }
+    return list;
+  }
+
+  function lowerBound(sorted, value) {
+    let lo = 0;
+    let hi = sorted.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >>> 1;
+      if (sorted[mid] < value) lo = mid + 1;
+      else hi = mid;
+    }
+    return lo;
+  }
+
+  // Docs containing a term that starts with `prefix`, mapped to summed
+  // [title, summary, text] frequencies. When `within` is given, only docs it
+  // contains are kept and their frequencies carry over.
+  function matchPrefix(searchIndex, prefix, within) {
+    const out = new Map();
+    const { terms } = searchIndex;
+    for (let i = lowerBound(terms, prefix); i < terms.length && terms[i].startsWith(prefix); i++) {
+      const list = postingsFor(searchIndex, terms[i]);
+      for (let j = 0; j < list.length; j += 4) {
+        const n = list[j];
+        let tf = out.get(n);
+        if (!tf) {
+          if (within && !within.has(n)) continue;
+          tf = within ? [...within.get(n)] : [0, 0, 0];
+          out.set(n, tf);
+        }
+        tf[0] += list[j + 1];
+        tf[1] += list[j + 2];
+        tf[2] += list[j + 3];
+      }
+    }
+    return out;
+  }
+
+  function scoreIndexed(doc, terms, tf) {
+    let score = 0;
+    const title = (doc.title || "").toLowerCase();
+    const summary = (doc.summary || "").toLowerCase();
+    for (const t of terms) {
+      if (title === t) score += 1000;
+      else if (title.startsWith(t)) score += 450;
+      else if (title.includes(t)) score += 220;
+      if (summary.includes(t)) score += 60;
+      score += 10;
+    }
+    // Body frequency only breaks ties between otherwise equal matches.
+    return score + Math.min(tf[2], 9);
+  }
+
+  function rankIndexed(searchIndex, query) {
+    const terms = tokenizeTerms(query);
+    if (!terms.length) return [];
+
+    // Intersect postings term by term; each pass keeps only docs matched so far.
+    let matched = null;
+    for (const t of terms) {
+      matched = matchPrefix(searchIndex, t, matched);
+      if (!matched.size) return [];
+    }
+
+    const out = [];
+    for (const [n, tf] of matched) {
+      const doc = searchIndex.docs[n];
+      if (doc) out.push({ doc, n, score: scoreIndexed(doc, terms, tf) });
+    }
+    return out;
+  }
+
+  function rankDocs(searchIndex, query) {
+    if (searchIndex.terms) return rankIndexed(searchIndex, query);
+
     const terms = tokenize(query);
     if (!terms.length) return [];
     const out = [];
-    for (const doc of searchIndex) {
+    for (const [n, doc] of searchIndex.docs.entries()) {
       let ok = true;
       for (const t of terms) {
         if (!doc.haystack.includes(t)) {
@@ -677,9 +833,112 @@
         }
       }
       if (!ok) continue;
-      out.push({ doc, score: scoreMatch(doc, terms) });
+      out.push({ doc, n, score: scoreMatch(doc, terms) });
     }
-    out.sort((a, b) => b.score - a.score);
+    return out;
+  }
+
+  // Ties keep index order (section order, then nav order).
+  function byScore(a, b) {
+    return b.score - a.score || a.shard - b.shard || a.n - b.n;
+  }
+
+  function searchDocs(searchIndex, query, limit = 20) {
+    const out = rankDocs(searchIndex, query);
+    for (const x of out) x.shard = 0;
+    out.sort(byScore);
+    return out.slice(0, limit).map((x) => x.doc);
+  }
+
+  // Sharded search: the manifest carries one bloom filter per section shard.
+  // Must agree with `build_bloom` in build-indexes.py.
+  const FNV_OFFSET = 0x811c9dc5;
+  const FNV_ALT_OFFSET = 0x9747b28c;
+  const FNV_PRIME = 0x01000193;
+  const utf8 = new TextEncoder();
+
+  function fnv1a32(bytes, seed) {
+    let h = seed >>> 0;
+    for (const b of bytes) {
+      h ^= b;
+      h = Math.imul(h, FNV_PRIME) >>> 0;
+    }
+    return h;
+  }
+
+  function decodeBloom(bloom) {
+    const bin = atob(bloom.data || "");
+    const bytes = new Uint8Array(bin.length);
+    for (let i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+    return { bits: bloom.bits, hashes: bloom.hashes, prefix: bloom.prefix, minPrefix: bloom.minPrefix || 1, bytes };
+  }
+
+  function bloomHas(bloom, term) {
+    const key = Array.from(term).slice(0, bloom.prefix).join("");
+    const raw = utf8.encode(key);
+    const h1 = fnv1a32(raw, FNV_OFFSET);
+    const h2 = (fnv1a32(raw, FNV_ALT_OFFSET) | 1) >>> 0;
+    for (let i = 0; i < bloom.hashes; i++) {
+      const bit = (h1 + i * h2) % bloom.bits;
+      if (!(bloom.bytes[bit >> 3] & (1 << (bit & 7)))) return false;
+    }
+    return true;
+  }
+
+  function compileShards(manifest, manifestUrl) {
+    const base = new URL(manifestUrl, globalThis.location.href);
+    return (manifest.shards || []).map((shard) => ({
+      section: shard.section,
+      url: new URL(shard.file, base).toString(),
+      bloom: decodeBloom(shard.bloom || {}),
+      loading: null,
+    }));
+  }
+
+  function loadShard(shard) {
+    if (!shard.loading) {
+      shard.loading = fetch(shard.url)
+        .then((r) => (r.ok ? r.json() : null))
+        .then((payload) => (payload ? compileSearch(payload) : null))
+        .catch(() => {
+          shard.loading = null;
+          return null;
+        });
+    }
+    return shard.loading;
+  }
+
+  // One- and two-character terms pass nearly every section's filter, so they
+  // are not probed; a query made only of them has to search every shard.
+  const MIN_PROBE_TERM = 3;
+
+  function probeTerms(shard, terms) {
+    const min = Math.max(MIN_PROBE_TERM, shard.bloom.minPrefix);
+    return terms.filter((t) => Array.from(t).length >= min);
+  }
+
+  async function runSearch(state, query, limit = 20) {
+    if (!state.shards) return searchDocs(state.searchIndex, query, limit);
+
+    const terms = tokenizeTerms(query);
+    if (!terms.length) return [];
+    // Shards are chosen by the long terms; with none, every shard is fetched,
+    // the same documents the monolithic search.json would have searched.
+    const wanted = state.shards.filter((shard) => {
+      const probes = probeTerms(shard, terms);
+      return probes.every((t) => bloomHas(shard.bloom, t));
+    });
+    const indexes = await Promise.all(wanted.map(loadShard));
+
+    const out = [];
+    indexes.forEach((searchIndex, shard) => {
+      if (!searchIndex) return;
+      for (const x of rankDocs(searchIndex, query)) {
+        x.shard = shard;
+        out.push(x);
+      }
+    });
+    out.sort(byScore);
     return out.slice(0, limit).map((x) => x.doc);
   }
 
@@ -696,8 +955,9 @@
     for (const r of results) {
       const a = document.createElement("a");
       a.className = "docs-search-result";
-      a.href = viewerHref(kind, r.id);
+      a.href = viewerHref(kind, r.id, r.anchor ? `#${r.anchor}` : "");
       a.dataset.docId = r.id;
+      if (r.anchor) a.dataset.anchor = r.anchor;
       if (r.id === currentId) a.dataset.active = "true";
 
       const title = document.createElement("div");
@@ -706,7 +966,11 @@
 
       const meta = document.createElement("div");
       meta.className = "docs-search-result-meta";
-      meta.textContent = humanizeSectionName(r.section);
+      // Heading-level results name the page they belong to.
+      meta.textContent =
+        r.anchor && r.page
+          ? `${humanizeSectionName(r.section)} / ${r.page}`
+          : humanizeSectionName(r.section);
 
       const summary = document.createElement("div");
       summary.className = "docs-search-result-summary";
@@ -721,7 +985,7 @@
     resultsRoot.replaceChildren(list);
   }
 
-  async function renderDoc(state, id, { replaceState = false } = {}) {
+  async function renderDoc(state, id, { replaceState = false, hash } = {}) {
     const currentId = state.itemById.has(id) ? id : defaultId;
     const item = state.itemById.get(currentId);
     if (!item) return;
@@ -731,7 +995,7 @@
     }
 
     renderNav(state.index, currentId);
-    setCurrentId(currentId, { replace: replaceState });
+    setCurrentId(currentId, { replace: replaceState, hash });
     updateBreadcrumb(item.section, item.title);
     renderPrevNext(state.flat, currentId);
 
@@ -789,10 +1053,17 @@
   async function init() {
     if (!navRoot || !contentRoot) return;
 
-    const [index, search] = await Promise.all([
-      fetch(indexUrl).then((r) => (r.ok ? r.json() : null)),
-      fetch(searchUrl).then((r) => (r.ok ? r.json() : null)),
+    const fetchJson = (url) =>
+      fetch(url)
+        .then((r) => (r.ok ? r.json() : null))
+        .catch(() => null);
+
+    // Prefer the small shard manifest; fall back to the monolithic search.json.
+    const [index, manifest] = await Promise.all([
+      fetchJson(indexUrl),
+      searchManifestUrl ? fetchJson(searchManifestUrl) : null,
     ]);
+    const search = manifest?.shards ? null : await fetchJson(searchUrl);
 
     if (!index || !index.sections) {
       contentRoot.innerHTML =
@@ -849,7 +1120,8 @@
       }
     } catch {}
 
-    const searchIndex = compileSearch(search?.items || []);
+    const shards = manifest?.shards ? compileShards(manifest, searchManifestUrl) : null;
+    const searchIndex = shards ? null : compileSearch(search);
 
     const state = {
       index,
@@ -860,13 +1132,14 @@
       docsIdByFile,
       wikiIdByFile,
       searchIndex,
+      shards,
     };
 
     const initial = getCurrentId();
     await renderDoc(state, initial, { replaceState: true });
 
-    function navigateToId(id) {
-      renderDoc(state, id).catch(() => {});
+    function navigateToId(id, hash) {
+      renderDoc(state, id, { hash }).catch(() => {});
     }
 
     navRoot.addEventListener("click", (event) => {
@@ -891,7 +1164,7 @@
         if (searchInput) searchInput.value = "";
         resultsRoot.hidden = true;
         navRoot.hidden = false;
-        navigateToId(id);
+        navigateToId(id, a.dataset.anchor ? `#${a.dataset.anchor}` : "");
       });
     }
 
@@ -925,7 +1198,9 @@
     });
 
     if (searchInput) {
-      searchInput.addEventListener("input", () => {
+      let searchSeq = 0;
+      searchInput.addEventListener("input", async () => {
+        const seq = ++searchSeq;
         const q = (searchInput.value || "").trim();
         if (!q) {
           if (resultsRoot) resultsRoot.hidden = true;
@@ -934,7 +1209,9 @@
         }
 
         const currentId = getCurrentId();
-        const results = searchDocs(state.searchIndex, q, 20);
+        const results = await runSearch(state, q, 20);
+        // Shards load asynchronously; drop results for queries typed over.
+        if (seq !== searchSeq) return;
         navRoot.hidden = true;
         if (resultsRoot) {
           resultsRoot.hidden = false;
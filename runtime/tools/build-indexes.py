@@ -2,12 +2,28 @@
 
 from __future__ import annotations
 
+import argparse
+import base64
+import bisect
+import functools
+import hashlib
+import inspect
 import json
+import math
+import os
 import re
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable
+
+from tool_loader import load_tool
+
+
+# Shared with build-llms-txt.py.
+siblings = load_tool("compressed_siblings")
 
 
 EXCLUDE_BASENAMES = {
@@ -30,6 +46,11 @@ SECTION_ORDER_DOCS = [
 SECTION_BY_BASENAME: dict[str, str] = {}
 
 
+# `rules_digest` hashes the code of `derive_item` and its helpers; bump this
+# only for a change it can't see (e.g. in a library they call).
+DERIVE_VERSION = 1
+
+
 PINNED_ORDER = [
     "start",
     # Guides
@@ -64,19 +85,24 @@ PINNED_ORDER = [
 ]
 
 
+@dataclass(frozen=True)
+class Chunk:
+    anchor: str
+    title: str
+    summary: str
+    text: str
+
+
 @dataclass(frozen=True)
 class Item:
     id: str
     title: str
     file: str
     section: str
-    text: str
     summary: str
+    chunks: tuple[Chunk, ...]
 
 
-def read_text(path: Path) -> str:
-    return path.read_text(encoding="utf-8")
-
 def read_json(path: Path) -> object | None:
     try:
         return json.loads(path.read_text(encoding="utf-8"))
@@ -140,6 +166,9 @@ def strip_markdown(markdown: str) -> str:
     return md
 
 
+# Memoized: build-all.py derives the index item and renders the llms.txt
+# entry from the same source text, so each source is sanitized once.
+@functools.lru_cache(maxsize=1 << 10)
 def sanitize_for_index(markdown: str) -> str:
     """
     Create a search-friendly version of markdown:
@@ -187,6 +216,113 @@ def sanitize_for_index(markdown: str) -> str:
     return "\n".join(out_lines)
 
 
+# Search chunks split at h2/h3, the levels the viewer lists in "On this page".
+CHUNK_MAX_LEVEL = 3
+WHITESPACE = re.compile(r"\s+")
+ATX_HEADING = re.compile(r"^(#{1,6})[ \t]+(.+?)(?:[ \t]+#+)?[ \t]*$")
+INLINE_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+INLINE_STRONG = re.compile(r"(\*\*|__)(.+?)\1")
+INLINE_EM = re.compile(r"\*(.+?)\*|(?<!\w)_(.+?)_(?!\w)")
+HTML_TAG = re.compile(r"<[!/a-z].*?>", flags=re.I)
+SLUG_PUNCTUATION = re.compile(r"[\u2000-\u206F\u2E00-\u2E7F\\'!\"#$%&()*+,./:;<=>?@\[\]^`{|}~]")
+SLUG_SPACE = re.compile(r"\s")
+
+
+def heading_text(raw: str) -> str:
+    """
+    Approximate the rendered text of an ATX heading (what the viewer reads
+    from `textContent`): inline code keeps its content, link and emphasis
+    markup is dropped.
+    """
+
+    parts = raw.split("`")
+    for i in range(0, len(parts), 2):
+        part = INLINE_LINK.sub(r"\1", parts[i])
+        part = INLINE_STRONG.sub(r"\2", part)
+        part = INLINE_EM.sub(lambda m: m.group(1) or m.group(2), part)
+        parts[i] = HTML_TAG.sub("", part)
+    return WHITESPACE.sub(" ", "".join(parts)).strip()
+
+
+class Slugger:
+    """
+    Heading ids as assigned by `slugify` in docs-viewer.js: GitHub-style
+    slugs, with `-1`, `-2`, ... appended to repeats within a page.
+    """
+
+    def __init__(self):
+        self.seen: dict[str, int] = {}
+
+    def slug(self, text: str) -> str:
+        slug = text.lower().strip()
+        slug = HTML_TAG.sub("", slug)
+        slug = SLUG_PUNCTUATION.sub("", slug)
+        slug = SLUG_SPACE.sub("-", slug)
+        if slug in self.seen:
+            count = self.seen[slug]
+            while True:
+                count += 1
+                candidate = f"{slug}-{count}"
+                if candidate not in self.seen:
+                    break
+            self.seen[slug] = count
+            self.seen[candidate] = 0
+            return candidate
+        self.seen[slug] = 0
+        return slug
+
+
+def split_chunks(markdown: str, title: str) -> tuple[Chunk, ...]:
+    """
+    Split a sanitized document at h2/h3 headings.
+
+    The first chunk covers everything before the first split heading and is
+    titled after the document (empty anchor). Every heading, including ones
+    that don't split, advances the slugger so anchors match the viewer's ids.
+    """
+
+    slugger = Slugger()
+    sections: list[tuple[str, str, list[str]]] = [(title, "", [])]
+    in_code = False
+    in_comment = False
+
+    for line in markdown.splitlines():
+        body = sections[-1][2]
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+            body.append(line)
+            continue
+        if not in_code:
+            if "<!--" in line:
+                in_comment = True
+            if in_comment:
+                if "-->" in line:
+                    in_comment = False
+                body.append(line)
+                continue
+            m = ATX_HEADING.match(line)
+            if m:
+                text = heading_text(m.group(2))
+                anchor = slugger.slug(text)
+                if 2 <= len(m.group(1)) <= CHUNK_MAX_LEVEL:
+                    sections.append((text or title, anchor, []))
+                    continue
+        body.append(line)
+
+    chunks: list[Chunk] = []
+    for chunk_title, anchor, lines in sections:
+        md = "\n".join(lines)
+        chunks.append(
+            Chunk(
+                anchor=anchor,
+                title=chunk_title,
+                summary=first_paragraph(md),
+                text=strip_markdown(md),
+            )
+        )
+    return tuple(chunks)
+
+
 def path_to_id(rel_path: str) -> str:
     rel = rel_path.replace("\\", "/")
     if rel.endswith(".md"):
@@ -202,36 +338,77 @@ def section_for_path(rel: str) -> str:
     return SECTION_BY_BASENAME.get(rel, "overview")
 
 
-def collect_items(source_root: Path, section_order: list[str]) -> list[Item]:
-    items: list[Item] = []
+def derive_item(rel: str, markdown: str) -> Item:
+    md = sanitize_for_index(markdown)
+    title = first_heading(md) or Path(rel).stem.replace("-", " ").replace("_", " ").title()
+    summary = first_paragraph(md)
+
+    return Item(
+        id=path_to_id(rel),
+        title=title,
+        file=rel,
+        section=section_for_path(rel),
+        summary=summary,
+        chunks=split_chunks(md, title),
+    )
+
+
+def resolve_jobs(jobs: int) -> int:
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def derive_items(pending: list[tuple[str, str]], jobs: int = 1) -> list[Item]:
+    """
+    Derive items for `(rel, markdown)` pairs, fanning out to a process pool
+    when `jobs > 1`. Results come back in input order.
+    """
+
+    if jobs <= 1 or len(pending) < 2:
+        return [derive_item(rel, md) for rel, md in pending]
+
+    rels = [rel for rel, _ in pending]
+    texts = [md for _, md in pending]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as pool:
+        return list(pool.map(derive_item, rels, texts))
+
+
+def collect_items(
+    source_root: Path,
+    section_order: list[str],
+    *,
+    jobs: int = 1,
+    read_bytes: Callable[[Path], bytes] = Path.read_bytes,
+) -> list[Item]:
+    """
+    Derive an `Item` per source file. `read_bytes` lets a caller that also
+    needs the raw sources (see build-all.py) share a single read per file.
+    """
+
+    pending: list[tuple[str, str]] = []
 
     for path in sorted(source_root.rglob("*")):
-        if not path.is_file():
-            continue
-        if path.name in EXCLUDE_BASENAMES:
-            continue
-        if path.suffix not in {".md", ".txt"}:
+        if not is_source_file(path):
             continue
 
         rel = path.relative_to(source_root).as_posix()
-        section = section_for_path(rel)
-
-        md = sanitize_for_index(read_text(path))
-        title = first_heading(md) or path.stem.replace("-", " ").replace("_", " ").title()
-        summary = first_paragraph(md)
-        text = strip_markdown(md)
-
-        items.append(
-            Item(
-                id=path_to_id(rel),
-                title=title,
-                file=rel,
-                section=section,
-                text=text,
-                summary=summary,
-            )
-        )
+        pending.append((rel, read_bytes(path).decode("utf-8")))
+
+    return sort_items(derive_items(pending, jobs), section_order)
+
+
+def is_source_file(path: Path) -> bool:
+    return path.is_file() and path.name not in EXCLUDE_BASENAMES and path.suffix in {".md", ".txt"}
+
+
+def sort_items(items: Iterable[Item], section_order: list[str]) -> list[Item]:
+    """Order items by section, pinned position, then title."""
 
+    return sorted(items, key=item_sort_key(section_order))
+
+
+def item_sort_key(section_order: list[str]) -> Callable[[Item], tuple]:
     order_index = {name: i for i, name in enumerate(section_order)}
     pinned_index = {doc_id: i for i, doc_id in enumerate(PINNED_ORDER)}
 
@@ -243,102 +420,410 @@ def collect_items(source_root: Path, section_order: list[str]) -> list[Item]:
             item.id,
         )
 
-    items.sort(key=sort_key)
-    return items
+    return sort_key
 
 
-def group_sections(items: Iterable[Item], section_order: list[str]):
+def ordered_sections(items: Iterable[Item], section_order: list[str]) -> list[tuple[str, list[Item]]]:
     grouped: dict[str, list[Item]] = {}
     for item in items:
         grouped.setdefault(item.section, []).append(item)
 
-    out = []
-    seen = set()
-    for name in section_order:
-        if name in grouped:
-            out.append(
-                {
-                    "name": name,
-                    "items": [{"id": i.id, "title": i.title, "file": i.file} for i in grouped[name]],
-                }
-            )
-            seen.add(name)
-    for name in sorted(k for k in grouped.keys() if k not in seen):
-        out.append(
-            {
-                "name": name,
-                "items": [{"id": i.id, "title": i.title, "file": i.file} for i in grouped[name]],
-            }
-        )
-    return out
+    names = [name for name in section_order if name in grouped]
+    names.extend(sorted(k for k in grouped.keys() if k not in section_order))
+    return [(name, grouped[name]) for name in names]
 
 
-def write_json(path: Path, payload: object):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+def group_sections(items: Iterable[Item], section_order: list[str]):
+    return [
+        {
+            "name": name,
+            "items": [{"id": i.id, "title": i.title, "file": i.file} for i in section_items],
+        }
+        for name, section_items in ordered_sections(items, section_order)
+    ]
+
 
-def write_json_if_changed(path: Path, payload: object, *, preserve_generated_at: bool = False) -> bool:
+SEARCH_VERSION = 5
+SEARCH_FIELDS = ("title", "summary", "text")
+SEARCH_TOKEN = re.compile(r"\w+")
+
+
+def search_terms(text: str) -> list[str]:
+    return SEARCH_TOKEN.findall(text.lower())
+
+
+def search_records(items: list[Item]) -> list[dict]:
+    """
+    One search record per heading chunk, in item order. `page` is the title of
+    the document a chunk belongs to; `anchor` is empty for the lead chunk.
+    Body text is not written: the inverted index already carries its terms.
+    Payloads list them under `records` since version 5; the `items` of older
+    versions held the text that pre-index clients scan, so that key is gone
+    rather than left without it.
     """
-    Avoid churning generated artifacts when inputs haven't changed.
 
-    If `preserve_generated_at` is set and the only difference is `generatedAt`,
-    keep the existing file verbatim.
+    return [
+        {
+            "id": i.id,
+            "anchor": c.anchor,
+            "title": c.title,
+            "page": i.title,
+            "section": i.section,
+            "summary": c.summary,
+        }
+        for i in items
+        for c in i.chunks
+    ]
+
+
+def build_search_index(items: list[Item]) -> dict:
     """
+    Inverted index over the search records of `items` for the docs viewer.
 
-    path.parent.mkdir(parents=True, exist_ok=True)
+    Each term maps to a posting string `"n,title,summary,text;..."`: the
+    record's position followed by the term frequency in each field. Records are
+    listed in ascending order.
+    """
 
-    existing = read_json(path)
-    if preserve_generated_at and isinstance(existing, dict) and isinstance(payload, dict):
-        if "generatedAt" in existing and "generatedAt" in payload:
-            preserved = dict(payload)
-            preserved["generatedAt"] = existing["generatedAt"]
-            if existing == preserved:
-                return False
+    postings: dict[str, list[str]] = {}
+    chunks = (c for i in items for c in i.chunks)
+    for n, c in enumerate(chunks):
+        for term, tf in chunk_term_counts(c).items():
+            postings.setdefault(term, []).append(f"{n},{tf[0]},{tf[1]},{tf[2]}")
 
-    if existing == payload:
-        return False
+    return {
+        "fields": list(SEARCH_FIELDS),
+        "terms": {term: ";".join(postings[term]) for term in sorted(postings)},
+    }
 
-    write_json(path, payload)
-    return True
 
+# Memoized: search.json and the section shards count the same chunks, and
+# build-all.py --watch hands unchanged items back between builds.
+@functools.lru_cache(maxsize=1 << 16)
+def chunk_term_counts(c: Chunk) -> dict[str, tuple[int, int, int]]:
+    """Frequency of each term in the chunk's title, summary and text (in `SEARCH_FIELDS` order)."""
 
-def build(docs_root: Path):
-    source_root = docs_root / "source"
-    items = collect_items(source_root, SECTION_ORDER_DOCS)
+    counts: dict[str, list[int]] = {}
+    for f, value in enumerate((c.title, c.summary, c.text)):
+        for term in search_terms(value):
+            tf = counts.get(term)
+            if tf is None:
+                tf = counts[term] = [0, 0, 0]
+            tf[f] += 1
+    return {term: (tf[0], tf[1], tf[2]) for term, tf in counts.items()}
 
-    generated_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
 
-    index_payload = {
+SHARD_DIR = "search"
+BLOOM_PREFIX = 6
+# Shorter prefixes match nearly every shard, so the viewer never probes them.
+BLOOM_MIN_PREFIX = 3
+BLOOM_FALSE_POSITIVE = 0.01
+FNV_OFFSET = 0x811C9DC5
+FNV_ALT_OFFSET = 0x9747B28C
+FNV_PRIME = 0x01000193
+
+
+def fnv1a32(data: bytes, seed: int = FNV_OFFSET) -> int:
+    h = seed
+    for b in data:
+        h ^= b
+        h = (h * FNV_PRIME) & 0xFFFFFFFF
+    return h
+
+
+def build_bloom(terms: Iterable[str]) -> dict:
+    """
+    Bloom filter over every prefix of `terms` from `BLOOM_MIN_PREFIX` up to
+    `BLOOM_PREFIX` characters.
+
+    The viewer probes a query term's first `BLOOM_PREFIX` characters, so a
+    miss proves no term in the shard starts with it. Terms shorter than
+    `BLOOM_MIN_PREFIX` are not probed and never cause a shard fetch. Bit positions use double
+    hashing over two FNV-1a seeds; docs-viewer.js mirrors this exactly.
+    """
+
+    keys: set[str] = set()
+    for term in terms:
+        for n in range(BLOOM_MIN_PREFIX, min(len(term), BLOOM_PREFIX) + 1):
+            keys.add(term[:n])
+
+    count = max(len(keys), 1)
+    bits = math.ceil(-count * math.log(BLOOM_FALSE_POSITIVE) / (math.log(2) ** 2))
+    bits = max(64, (bits + 7) // 8 * 8)
+    hashes = max(1, round(bits / count * math.log(2)))
+
+    data = bytearray(bits // 8)
+    for key in sorted(keys):
+        raw = key.encode("utf-8")
+        h1 = fnv1a32(raw)
+        h2 = fnv1a32(raw, FNV_ALT_OFFSET) | 1
+        for i in range(hashes):
+            bit = (h1 + i * h2) % bits
+            data[bit >> 3] |= 1 << (bit & 7)
+
+    return {
+        "bits": bits,
+        "hashes": hashes,
+        "prefix": BLOOM_PREFIX,
+        "minPrefix": BLOOM_MIN_PREFIX,
+        "data": base64.b64encode(bytes(data)).decode("ascii"),
+    }
+
+
+def compact_search_fields(items: list[Item]) -> dict:
+    """
+    Dictionary-encoded, columnar form of `search_records`.
+
+    Sections are listed once and referenced by position; per-document fields
+    (`id`, `title`, `section`) live in `pages`, and each record points at its
+    page. Body text is left out: the inverted index already carries it and the
+    viewer only reads `text` for pre-index payloads.
+    """
+
+    sections = list(dict.fromkeys(i.section for i in items))
+    section_ids = {name: n for n, name in enumerate(sections)}
+    chunks = [(n, c) for n, i in enumerate(items) for c in i.chunks]
+    return {
+        "sections": sections,
+        "pages": {
+            "id": [i.id for i in items],
+            "title": [i.title for i in items],
+            "section": [section_ids[i.section] for i in items],
+        },
+        "records": {
+            "page": [n for n, _ in chunks],
+            "anchor": [c.anchor for _, c in chunks],
+            "title": [c.title for _, c in chunks],
+            "summary": [c.summary for _, c in chunks],
+        },
+    }
+
+
+def search_payload(
+    items: list[Item],
+    *,
+    kind: str,
+    generated_at: str,
+    compact: bool = False,
+    **extra: object,
+) -> dict:
+    records = search_records(items)
+    payload: dict = {
         "generatedAt": generated_at,
-        "kind": "docs",
+        "version": SEARCH_VERSION,
+        "kind": kind,
+        **extra,
+    }
+    if compact:
+        payload["format"] = "compact"
+    payload["documents"] = len(items)
+    payload["count"] = len(records)
+    if compact:
+        payload.update(compact_search_fields(items))
+    else:
+        payload["records"] = records
+    payload["index"] = build_search_index(items)
+    return payload
+
+
+def describe_compaction(path: Path, payload: dict, items: list[Item]) -> str:
+    """Compare a compact artifact on disk with the size of its indented, row-per-record form."""
+
+    full = {k: v for k, v in payload.items() if k not in ("format", "sections", "pages", "records")}
+    full["records"] = search_records(items)
+    before = len((json.dumps(full, indent=2) + "\n").encode("utf-8"))
+    after = path.stat().st_size
+    return f"{path.name}: {before / 1024:,.0f} KB -> {after / 1024:,.0f} KB ({(after - before) / before:+.0%})"
+
+
+def search_shard(kind: str, name: str, items: list[Item], generated_at: str, *, compact: bool = False) -> tuple[dict, dict]:
+    """One section's search payload and its manifest entry (with the bloom filter)."""
+
+    payload, entry = section_search_shard(kind, name, tuple(items), compact)
+    return {"generatedAt": generated_at, **payload}, entry
+
+
+# Memoized on the section's items, so build-all.py --watch only re-indexes
+# the sections an edit touched. Callers must not modify the returned dicts.
+@functools.lru_cache(maxsize=64)
+def section_search_shard(kind: str, name: str, items: tuple[Item, ...], compact: bool) -> tuple[dict, dict]:
+    payload = search_payload(list(items), kind=kind, generated_at="", compact=compact, section=name)
+    del payload["generatedAt"]
+    entry = {
+        "section": name,
+        "file": f"{name}.json",
         "count": len(items),
-        "sections": group_sections(items, SECTION_ORDER_DOCS),
+        "bloom": build_bloom(payload["index"]["terms"].keys()),
     }
+    return payload, entry
 
-    search_payload = {
+
+def shard_manifest(kind: str, count: int, entries: list[dict], generated_at: str) -> dict:
+    return {
         "generatedAt": generated_at,
-        "kind": "docs",
-        "count": len(items),
-        "items": [
-            {
-                "id": i.id,
-                "title": i.title,
-                "section": i.section,
-                "summary": i.summary,
-                "text": i.text,
-            }
-            for i in items
-        ],
+        "version": SEARCH_VERSION,
+        "kind": kind,
+        "count": count,
+        "shards": entries,
     }
 
-    written = []
-    index_path = docs_root / "index.json"
-    search_path = docs_root / "search.json"
-    if write_json_if_changed(index_path, index_payload, preserve_generated_at=True):
-        written.append(index_path)
-    if write_json_if_changed(search_path, search_payload, preserve_generated_at=True):
-        written.append(search_path)
 
+def search_shards(
+    kind: str,
+    items: list[Item],
+    section_order: list[str],
+    generated_at: str,
+    *,
+    compact: bool = False,
+) -> tuple[dict[str, dict], dict]:
+    """
+    One search payload per section (keyed by file name) plus the manifest
+    that lets the viewer fetch only the shards whose bloom filter admits
+    every query term.
+    """
+
+    shards: dict[str, dict] = {}
+    entries = []
+    for name, section_items in ordered_sections(items, section_order):
+        payload, entry = search_shard(kind, name, section_items, generated_at, compact=compact)
+        shards[entry["file"]] = payload
+        entries.append(entry)
+    return shards, shard_manifest(kind, len(items), entries, generated_at)
+
+
+def write_search_shards(
+    kind_root: Path,
+    kind: str,
+    items: list[Item],
+    section_order: list[str],
+    generated_at: str,
+    *,
+    compress: bool = True,
+    compact: bool = False,
+) -> list[Path]:
+    """Write the payloads from `search_shards` under `<kind_root>/search/`."""
+
+    shard_root = kind_root / SHARD_DIR
+    written: list[Path] = []
+    shards, manifest = search_shards(kind, items, section_order, generated_at, compact=compact)
+    for name, payload in shards.items():
+        written.extend(write_artifact(shard_root / name, payload, compress=compress, compact=compact))
+
+    manifest_path = shard_root / "manifest.json"
+    written.extend(write_artifact(manifest_path, manifest, compress=compress))
+
+    # Drop shards (and their compressed siblings) for sections that no longer exist.
+    keep = {*shards, manifest_path.name}
+    for stale in sorted(shard_root.glob("*.json*")):
+        base = stale.name.removesuffix(siblings.GZIP_SUFFIX).removesuffix(siblings.BROTLI_SUFFIX)
+        if base not in keep:
+            stale.unlink()
+            written.append(stale)
+
+    return written
+
+
+def dump_json(payload: object, *, compact: bool = False) -> str:
+    if compact:
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + "\n"
+    return json.dumps(payload, indent=2) + "\n"
+
+
+def write_json(path: Path, payload: object, *, compact: bool = False):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(dump_json(payload, compact=compact), encoding="utf-8")
+
+CONTENT_DIGEST_KEY = "contentDigest"
+SOURCE_COMMIT_KEY = "sourceCommit"
+RULES_DIGEST_KEY = "rulesDigest"
+CONTENT_DIGEST = re.compile(r'"contentDigest":\s*"([0-9a-f]{64})"')
+DIGEST_HEAD_BYTES = 4096
+
+
+def content_digest(payload: dict, *, exclude: tuple[str, ...] = ()) -> str:
+    body = {k: v for k, v in payload.items() if k != CONTENT_DIGEST_KEY and k not in exclude}
+    text = json.dumps(body, separators=(",", ":"), check_circular=False)
+    return hashlib.sha256(text.encode("ascii")).hexdigest()
+
+
+def read_content_digest(path: Path) -> str | None:
+    """
+    Pull `contentDigest` out of the head of an existing artifact without
+    parsing it. The field is written right after `generatedAt`, so the first
+    few KB always contain it.
+    """
+
+    try:
+        with path.open("rb") as f:
+            head = f.read(DIGEST_HEAD_BYTES)
+    except FileNotFoundError:
+        return None
+    match = CONTENT_DIGEST.search(head.decode("utf-8", errors="replace"))
+    return match.group(1) if match else None
+
+
+def stamp_content_digest(payload: dict, digest: str) -> dict:
+    stamped: dict = {}
+    if "generatedAt" in payload:
+        stamped["generatedAt"] = payload["generatedAt"]
+    stamped[CONTENT_DIGEST_KEY] = digest
+    stamped.update((k, v) for k, v in payload.items() if k not in stamped)
+    return stamped
+
+
+def write_json_if_changed(
+    path: Path,
+    payload: object,
+    *,
+    preserve_generated_at: bool = False,
+    compact: bool = False,
+) -> bool:
+    """
+    Avoid churning generated artifacts when inputs haven't changed.
+
+    Object payloads are stamped with a `contentDigest` and compared against
+    the digest in the existing file's header, so the no-change path never
+    parses the old artifact. If `preserve_generated_at` is set, `generatedAt`
+    is left out of the digest and a timestamp-only difference keeps the
+    existing file verbatim.
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if isinstance(payload, dict):
+        digest = content_digest(payload, exclude=("generatedAt",) if preserve_generated_at else ())
+        if read_content_digest(path) == digest:
+            return False
+        payload = stamp_content_digest(payload, digest)
+    elif read_json(path) == payload:
+        return False
+
+    write_json(path, payload, compact=compact)
+    return True
+
+
+def write_artifact(path: Path, payload: object, *, compress: bool, compact: bool = False) -> list[Path]:
+    """
+    `write_json_if_changed` plus compressed siblings. With compression off,
+    siblings of a rewritten artifact are removed so they never go stale.
+    """
+
+    changed = write_json_if_changed(path, payload, preserve_generated_at=True, compact=compact)
+    written = [path] if changed else []
+    if compress:
+        written.extend(siblings.write_compressed_siblings(path, changed=bool(written)))
+    elif written:
+        written.extend(siblings.drop_compressed_siblings(path))
+    return written
+
+
+def build(docs_root: Path, *, jobs: int = 1, compress: bool = True, compact: bool = False):
+    source_root = docs_root / "source"
+    items = collect_items(source_root, SECTION_ORDER_DOCS, jobs=jobs)
+    report(write_indexes(docs_root, items, compress=compress, compact=compact))
+
+
+def report(written: list[Path]):
     if written:
         print("Wrote:")
         for path in written:
@@ -347,11 +832,444 @@ def build(docs_root: Path):
         print("Unchanged: index.json and search.json")
 
 
+DERIVE_PATTERNS = (
+    WHITESPACE,
+    ATX_HEADING,
+    INLINE_LINK,
+    INLINE_STRONG,
+    INLINE_EM,
+    HTML_TAG,
+    SLUG_PUNCTUATION,
+    SLUG_SPACE,
+)
+
+
+def derivation_code(roots: Iterable[object]) -> dict:
+    """
+    Source of `roots` and of every function or class in this script they
+    reach through global names, plus the plain constants (strings, numbers,
+    sets, patterns) those reference. Editing any helper of `derive_item`
+    therefore changes `rules_digest` without a `DERIVE_VERSION` bump.
+    """
+
+    namespace = derive_item.__globals__
+    sources: dict[str, str] = {}
+    constants: dict[str, str] = {}
+    pending = list(roots)
+    while pending:
+        obj = pending.pop()
+        if obj.__qualname__ in sources:
+            continue
+        sources[obj.__qualname__] = inspect.getsource(obj)
+        members = vars(obj).values() if inspect.isclass(obj) else [obj]
+        codes = [m.__code__ for m in (getattr(m, "__func__", m) for m in members) if inspect.isfunction(m)]
+        while codes:
+            code = codes.pop()
+            codes.extend(const for const in code.co_consts if inspect.iscode(const))
+            for name in code.co_names:
+                value = namespace.get(name)
+                if inspect.isfunction(value) or inspect.isclass(value):
+                    if value.__module__ == namespace["__name__"]:
+                        pending.append(value)
+                elif name not in constants and not inspect.ismodule(value) and value is not None:
+                    try:
+                        constants[name] = json.dumps(value, sort_keys=True, default=plain_constant)
+                    except TypeError:
+                        pass
+    return {"sources": dict(sorted(sources.items())), "constants": dict(sorted(constants.items()))}
+
+
+def plain_constant(value: object) -> object:
+    if isinstance(value, re.Pattern):
+        return [value.pattern, value.flags]
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    raise TypeError(type(value).__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def rules_digest() -> str:
+    """
+    Digest of what turns a markdown file into an `Item`: `DERIVE_VERSION`,
+    the chunking patterns and tables, and the code of `derive_item` and its
+    helpers (see `derivation_code`). Artifacts record it, so an
+    incremental build never patches output that older rules wrote, while
+    edits elsewhere in this script (writers, CLI, help text) leave it alone.
+    """
+
+    payload = {
+        "version": DERIVE_VERSION,
+        "code": derivation_code([derive_item]),
+        "patterns": [(pattern.pattern, pattern.flags) for pattern in DERIVE_PATTERNS],
+        "sections": SECTION_BY_BASENAME,
+        "chunkMaxLevel": CHUNK_MAX_LEVEL,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def git(source_root: Path, *args: str) -> list[str] | None:
+    """NUL-separated output of `git -C source_root args...`, or None if git fails or is missing."""
+
+    try:
+        result = subprocess.run(["git", "-C", str(source_root), *args], capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return [part for part in result.stdout.decode("utf-8").split("\0") if part]
+
+
+def source_commit(source_root: Path) -> str | None:
+    """
+    The commit the sources were built from: the last one that touched
+    `source_root`, provided nothing under it differs from HEAD (untracked
+    files included). Otherwise None, since the sources then match no commit.
+
+    Committing the artifacts themselves does not move it, so it can be part
+    of `contentDigest` without every commit forcing a rewrite.
+    """
+
+    last = git(source_root, "log", "-1", "--format=%H", "--", ".")
+    status = git(source_root, "status", "--porcelain", "-z", "--untracked-files=all", "--", ".")
+    if not last or status is None or status:
+        return None
+    return last[0].strip()
+
+
+def source_build_info(source_root: Path) -> dict:
+    """The `rulesDigest`/`sourceCommit` pair stamped on index.json and search.json."""
+
+    return {RULES_DIGEST_KEY: rules_digest(), SOURCE_COMMIT_KEY: source_commit(source_root)}
+
+
+def changed_since(source_root: Path, commit: str) -> set[str] | None:
+    """Paths under `source_root` (relative to it) that differ from `commit` in the working tree."""
+
+    diff = git(source_root, "diff", "--name-only", "-z", "--no-renames", "--relative", commit, "--", ".")
+    untracked = git(source_root, "ls-files", "-z", "--others", "--exclude-standard", "--", ".")
+    if diff is None or untracked is None:
+        return None
+    return {*diff, *untracked}
+
+
+class IncrementalUnavailable(Exception):
+    """Why `build_incremental` has to fall back to a full build."""
+
+
+def expand_search_records(search: dict) -> list[dict]:
+    """The `search_records` of a search payload in either format (inverse of `compact_search_fields`)."""
+
+    if search.get("format") != "compact":
+        return search["records"]
+    sections = search["sections"]
+    pages = search["pages"]
+    records = search["records"]
+    return [
+        {
+            "id": pages["id"][page],
+            "anchor": records["anchor"][n],
+            "title": records["title"][n],
+            "page": pages["title"][page],
+            "section": sections[pages["section"][page]],
+            "summary": records["summary"][n],
+        }
+        for n, page in enumerate(records["page"])
+    ]
+
+
+def indexed_text(index: dict, count: int) -> list[str]:
+    """
+    Each record's body text as the bag of indexed terms it contains, from the
+    postings of `build_search_index`. Tokenizing it again yields the same term
+    frequencies, and those are all the index and bloom filters are built from.
+    """
+
+    field_pos = 1 + index["fields"].index("text")
+    bags: list[list[str]] = [[] for _ in range(count)]
+    for term, postings in index["terms"].items():
+        for posting in postings.split(";"):
+            parts = posting.split(",")
+            tf = int(parts[field_pos])
+            if tf:
+                bags[int(parts[0])].extend([term] * tf)
+    return [" ".join(bag) for bag in bags]
+
+
+def recorded_items(docs_root: Path) -> tuple[set[str], dict[str, Item]]:
+    """
+    The source commits recorded in the existing index.json and search.json
+    (None when the sources were dirty), and the `Item`s they were written
+    from, keyed by source path in the artifacts' order.
+
+    Body text is not stored, so each chunk's text is rebuilt from the index
+    postings as the bag of terms it contains (see `indexed_text`). Item
+    summaries are not stored either and come back empty; nothing written
+    from items reads more than that.
+    """
+
+    index = read_json(docs_root / "index.json")
+    search = read_json(docs_root / "search.json")
+    if not isinstance(index, dict) or not isinstance(search, dict):
+        raise IncrementalUnavailable("no existing index.json/search.json")
+    rules = rules_digest()
+    if index.get(RULES_DIGEST_KEY) != rules or search.get(RULES_DIGEST_KEY) != rules:
+        raise IncrementalUnavailable("artifacts were written by a different build-indexes.py")
+    commits = {index.get(SOURCE_COMMIT_KEY), search.get(SOURCE_COMMIT_KEY)}
+    if search.get("version") != SEARCH_VERSION:
+        raise IncrementalUnavailable("search.json was written in an older format")
+    records = expand_search_records(search)
+
+    files = {entry["id"]: entry["file"] for section in index["sections"] for entry in section["items"]}
+    chunks: dict[str, list[Chunk]] = {}
+    pages: dict[str, tuple[str, str]] = {}
+    for record, text in zip(records, indexed_text(search["index"], len(records))):
+        chunk = Chunk(anchor=record["anchor"], title=record["title"], summary=record["summary"], text=text)
+        chunks.setdefault(record["id"], []).append(chunk)
+        pages[record["id"]] = (record["page"], record["section"])
+    if chunks.keys() != files.keys():
+        raise IncrementalUnavailable("index.json and search.json list different documents")
+
+    items = {
+        files[doc_id]: Item(
+            id=doc_id,
+            title=pages[doc_id][0],
+            file=files[doc_id],
+            section=pages[doc_id][1],
+            summary="",
+            chunks=tuple(doc_chunks),
+        )
+        for doc_id, doc_chunks in chunks.items()
+    }
+    return commits, items
+
+
+def build_incremental(docs_root: Path, *, jobs: int = 1, compress: bool = True, compact: bool = False):
+    """
+    Re-derive only the sources git reports as changed since the commit
+    recorded in the existing artifacts, and write them back together with the
+    recorded items of every other source. The output is the same as a full
+    build's. Falls back to `build` when the recorded state is unusable.
+    """
+
+    source_root = docs_root / "source"
+    try:
+        commits, items = recorded_items(docs_root)
+        if None in commits:
+            raise IncrementalUnavailable("no source commit recorded")
+        changed: set[str] = set()
+        for commit in commits:
+            paths = changed_since(source_root, commit)
+            if paths is None:
+                raise IncrementalUnavailable(f"git cannot diff against {commit[:12]}")
+            changed |= paths
+    except IncrementalUnavailable as e:
+        print(f"Full build ({e})")
+        build(docs_root, jobs=jobs, compress=compress, compact=compact)
+        return
+
+    pending: list[tuple[str, str]] = []
+    removed = 0
+    for rel in sorted(changed):
+        path = source_root / rel
+        if is_source_file(path):
+            pending.append((rel, path.read_text(encoding="utf-8")))
+        elif items.pop(rel, None) is not None:
+            removed += 1
+    for item in derive_items(pending, jobs):
+        items[item.file] = item
+    since = ", ".join(sorted(commit[:12] for commit in commits))
+    print(f"{len(pending)} changed, {removed} removed since {since}")
+
+    ordered = sort_items(items.values(), SECTION_ORDER_DOCS)
+    report(write_indexes(docs_root, ordered, compress=compress, compact=compact))
+
+
+def source_for_id(source_root: Path, doc_id: str) -> str | None:
+    """The source path (relative to `source_root`) that `doc_id` is derived from, if it exists."""
+
+    for suffix in (".md", ".txt"):
+        rel = doc_id + suffix
+        if is_source_file(source_root / rel):
+            return rel
+    return None
+
+
+def only_build_info(source_root: Path, commits: set[str | None], recorded: dict[str, Item], listed: set[str]) -> dict:
+    """
+    The `rulesDigest`/`sourceCommit` pair for `build_only`: whatever a full
+    build would record (see `source_build_info`), provided every source that
+    changed since the recorded commit is among the re-derived `listed` paths.
+    Otherwise the output still holds stale `recorded` items, matches no commit,
+    and gets None.
+    """
+
+    build_info = source_build_info(source_root)
+    commit = next(iter(commits)) if len(commits) == 1 else None
+    changed = changed_since(source_root, commit) if commit is not None else None
+    if changed is None or any(is_source_file(source_root / rel) or rel in recorded for rel in changed - listed):
+        build_info[SOURCE_COMMIT_KEY] = None
+    return build_info
+
+
+def splice_items(
+    items: list[Item],
+    doc_ids: Iterable[str],
+    derived: list[Item],
+    section_order: list[str],
+) -> list[Item]:
+    """
+    Drop every item in sorted `items` whose id is in `doc_ids` and insert
+    `derived` at their `sort_items` positions.
+    """
+
+    drop = set(doc_ids)
+    spliced = [item for item in items if item.id not in drop]
+    key = item_sort_key(section_order)
+    for item in derived:
+        bisect.insort(spliced, item, key=key)
+    return spliced
+
+
+def build_only(
+    docs_root: Path,
+    doc_ids: list[str],
+    *,
+    jobs: int = 1,
+    compress: bool = True,
+    compact: bool = False,
+):
+    """
+    Re-derive only the documents in `doc_ids` and splice them into the items
+    recorded in the existing artifacts. A document whose source is gone is
+    dropped. As long as no other source changed since the last build, the
+    output is the same as a full build's. Falls back to `build` when the
+    recorded state is unusable.
+    """
+
+    source_root = docs_root / "source"
+    try:
+        commits, recorded = recorded_items(docs_root)
+    except IncrementalUnavailable as e:
+        print(f"Full build ({e})")
+        build(docs_root, jobs=jobs, compress=compress, compact=compact)
+        return
+
+    known = {item.id for item in recorded.values()}
+    pending: list[tuple[str, str]] = []
+    removed = 0
+    for doc_id in doc_ids:
+        rel = source_for_id(source_root, doc_id)
+        if rel is not None:
+            pending.append((rel, (source_root / rel).read_text(encoding="utf-8")))
+        elif doc_id in known:
+            removed += 1
+    print(f"{len(pending)} re-derived, {removed} removed")
+
+    listed = {rel for rel, _ in pending} | {rel for rel, item in recorded.items() if item.id in doc_ids}
+    build_info = only_build_info(source_root, commits, recorded, listed)
+
+    items = splice_items(list(recorded.values()), doc_ids, derive_items(pending, jobs), SECTION_ORDER_DOCS)
+    report(write_indexes(docs_root, items, compress=compress, compact=compact, build_info=build_info))
+
+
+def parse_only(value: str) -> list[str]:
+    doc_ids = [path_to_id(part.strip()) for part in value.split(",") if part.strip()]
+    if not doc_ids:
+        raise argparse.ArgumentTypeError("expected at least one document id")
+    return doc_ids
+
+
+def index_payload(items: list[Item], generated_at: str, **extra: object) -> dict:
+    return {
+        "generatedAt": generated_at,
+        "kind": "docs",
+        "count": len(items),
+        "sections": group_sections(items, SECTION_ORDER_DOCS),
+        **extra,
+    }
+
+
+def write_indexes(
+    docs_root: Path,
+    items: list[Item],
+    *,
+    compress: bool = True,
+    compact: bool = False,
+    build_info: dict | None = None,
+) -> list[Path]:
+    """
+    Write index.json, search.json and the search shards for derived `items`.
+    `build_info` replaces the `rulesDigest`/`sourceCommit` pair that is
+    otherwise taken from the source tree (see `build_only`).
+    """
+
+    generated_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    if build_info is None:
+        build_info = source_build_info(docs_root / "source")
+    index = index_payload(items, generated_at, **build_info)
+    search = search_payload(items, kind="docs", generated_at=generated_at, compact=compact, **build_info)
+
+    written: list[Path] = []
+    index_path = docs_root / "index.json"
+    search_path = docs_root / "search.json"
+    written.extend(write_artifact(index_path, index, compress=compress))
+    written.extend(write_artifact(search_path, search, compress=compress, compact=compact))
+    written.extend(
+        write_search_shards(
+            docs_root, "docs", items, SECTION_ORDER_DOCS, generated_at, compress=compress, compact=compact
+        )
+    )
+    if compact:
+        print(describe_compaction(search_path, search, items))
+    return written
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Build index.json and search.json for the Runtime docs.")
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Derive items in N worker processes (0 = one per CPU). Output is identical to a serial build.",
+    )
+    parser.add_argument(
+        "--no-compress",
+        action="store_true",
+        help="Skip the precompressed .gz/.br siblings (siblings of rewritten artifacts are removed).",
+    )
+    parser.add_argument(
+        "--search-format",
+        choices=("full", "compact"),
+        default="full",
+        help="`compact` writes search.json and shards unindented, dictionary-encoded and columnar, without body text.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-derive the sources git reports as changed since the commit recorded in index.json/search.json.",
+    )
+    parser.add_argument(
+        "--only",
+        type=parse_only,
+        metavar="ID[,ID...]",
+        help="Re-derive just these documents (e.g. `javascript/fs`) and splice them into the existing artifacts.",
+    )
+    args = parser.parse_args()
+    if args.only and args.incremental:
+        parser.error("--only and --incremental are mutually exclusive")
+
     repo_root = Path(__file__).resolve().parents[3]
     docs_root = repo_root / "website" / "runtime" / "docs"
 
-    build(docs_root)
+    jobs = resolve_jobs(args.jobs)
+    compress = not args.no_compress
+    compact = args.search_format == "compact"
+    if args.only:
+        build_only(docs_root, args.only, jobs=jobs, compress=compress, compact=compact)
+    elif args.incremental:
+        build_incremental(docs_root, jobs=jobs, compress=compress, compact=compact)
+    else:
+        build(docs_root, jobs=jobs, compress=compress, compact=compact)
 
 
 if __name__ == "__main__":
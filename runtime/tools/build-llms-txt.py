@@ -2,13 +2,27 @@
 
 from __future__ import annotations
 
+import argparse
+import functools
+import hashlib
 import json
+import os
 import re
-from dataclasses import dataclass
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
 from urllib.parse import quote
 
+from tool_loader import load_tool
+
+
+# Shared with build-indexes.py.
+siblings = load_tool("compressed_siblings")
+# `sanitize_markdown` is its `sanitize_for_index`.
+indexes = load_tool("build-indexes")
+
 
 @dataclass(frozen=True)
 class DocItem:
@@ -46,55 +60,22 @@ def section_label(name: str) -> str:
     return name.replace("-", " ").replace("_", " ").title()
 
 
+def doc_key(item: DocItem) -> str:
+    return item.id
+
+
 def doc_url(item: DocItem) -> str:
     return f"/runtime/docs/?p={quote(item.id)}"
 
 
 def sanitize_markdown(markdown: str) -> str:
     """
-    Create LLM-friendly content:
-    - Drop Status / Implementation status sections.
-    - Drop references to STATUS/PLAN/README/llms meta files.
+    Create LLM-friendly content: build-indexes.py's `sanitize_for_index`
+    (Status sections and STATUS/PLAN/README/llms references dropped), ending
+    in exactly one newline. build-all.py gets both from one sanitizing pass.
     """
 
-    drop_line = re.compile(r"(STATUS\.md|PLAN\.md|README\.md|\bllms\.txt\b)", flags=re.I)
-    status_heading = re.compile(r"^(#{1,6})\s+(Status|Implementation status)\b", flags=re.I)
-    status_line = re.compile(r"^(Status:|Implementation status:)\s*", flags=re.I)
-
-    out_lines: list[str] = []
-    in_code = False
-    skip_level: int | None = None
-
-    for raw in markdown.splitlines():
-        trimmed = raw.lstrip()
-        if trimmed.startswith("```"):
-            in_code = not in_code
-            if skip_level is None:
-                out_lines.append(raw)
-            continue
-
-        if not in_code:
-            heading_match = re.match(r"^(#{1,6})\s+(.+?)\s*$", raw)
-            if skip_level is not None and heading_match:
-                level = len(heading_match.group(1))
-                if level <= skip_level:
-                    skip_level = None
-
-            if skip_level is None:
-                status_match = status_heading.match(raw)
-                if status_match:
-                    skip_level = len(status_match.group(1))
-                    continue
-
-        if skip_level is not None:
-            continue
-
-        if not in_code and (status_line.match(raw) or drop_line.search(raw)):
-            continue
-
-        out_lines.append(raw)
-
-    return "\n".join(out_lines).rstrip() + "\n"
+    return indexes.sanitize_for_index(markdown).rstrip() + "\n"
 
 
 def load_items(docs_root: Path) -> list[DocItem]:
@@ -108,6 +89,11 @@ def load_items(docs_root: Path) -> list[DocItem]:
     sections = index.get("sections") if isinstance(index, dict) else None
     if not isinstance(sections, list):
         raise SystemExit(f"Invalid index.json shape at {index_path}")
+    return items_from_sections(sections)
+
+
+def items_from_sections(sections: list) -> list[DocItem]:
+    """Flatten the `sections` array of an index.json payload into pack items."""
 
     items: list[DocItem] = []
     for section in sections:
@@ -126,86 +112,598 @@ def load_items(docs_root: Path) -> list[DocItem]:
     return items
 
 
-def normalize_generated_line(text: str) -> str:
+
+def iter_llms_lines(
+    docs_root: Path,
+    *,
+    items: list[DocItem] | None = None,
+    read: Callable[[Path], str] | None = None,
+    sink: Callable[[DocItem, list[str]], None] | None = None,
+    entry: EntryLoader | None = None,
+) -> Iterator[str]:
     """
-    Normalize only the *header* Generated timestamp so we can avoid rewriting
-    llms.txt when content is unchanged.
+    Yield the pack line by line (a document's sanitized body is one entry).
+    `items` and `read` default to loading index.json and reading sources from
+    disk; build-all.py passes its in-memory copies instead. `sink` also
+    receives each document's lines (see `SplitPacks`). `entry` renders one
+    document (defaults to `entry_lines`; see `EntryCache`).
     """
 
-    lines = text.splitlines()
-    out: list[str] = []
-    in_header = True
-    replaced = False
-
-    for line in lines:
-        if in_header and not replaced and line.startswith("Generated: "):
-            out.append("Generated: <preserved>")
-            replaced = True
-            continue
-        out.append(line)
-        if line.strip() == "How to link:":
-            in_header = False
-
-    return "\n".join(out).rstrip() + "\n"
-
-
-def main():
-    repo_root = Path(__file__).resolve().parents[3]
-    docs_root = repo_root / "website" / "runtime" / "docs"
-    out_path = repo_root / "website" / "runtime" / "llms.txt"
-
-    items = load_items(docs_root)
+    if items is None:
+        items = load_items(docs_root)
+    if read is None:
+        read = read_text
+    if entry is None:
+        entry = entry_lines
     generated_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
 
-    lines: list[str] = []
-    lines.append("Oro Runtime · LLMS Pack")
-    lines.append("======================")
-    lines.append("")
-    lines.append("This file concatenates the full Oro Runtime documentation hosted on this website,")
-    lines.append("so an LLM can answer questions using the same source of truth as readers.")
-    lines.append("")
-    lines.append(f"Generated: {generated_at}")
-    lines.append("")
-    lines.append("How to link:")
-    lines.append("- Docs: /runtime/docs/?p=<id>")
-    lines.append("")
-    lines.append("Table of contents")
-    lines.append("-----------------")
-    lines.append("")
-    lines.append("Runtime Docs")
+    yield "Oro Runtime · LLMS Pack"
+    yield "======================"
+    yield ""
+    yield "This file concatenates the full Oro Runtime documentation hosted on this website,"
+    yield "so an LLM can answer questions using the same source of truth as readers."
+    yield ""
+    yield f"Generated: {generated_at}"
+    yield ""
+    yield "How to link:"
+    yield "- Docs: /runtime/docs/?p=<id>"
+    yield ""
+    yield "Table of contents"
+    yield "-----------------"
+    yield ""
+    yield "Runtime Docs"
 
     current_section: str | None = None
     for item in items:
         if item.section != current_section:
             current_section = item.section
-            lines.append(f"- {section_label(current_section)}")
-        lines.append(f"  - {item.id} — {item.title} — {doc_url(item)}")
+            yield f"- {section_label(current_section)}"
+        yield f"  - {item.id} — {item.title} — {doc_url(item)}"
 
-    lines.append("")
+    yield ""
 
     source_root = docs_root / "source"
     for item in items:
-        lines.append("=" * 78)
-        lines.append(f"DOCS: {item.title} ({item.id})")
-        lines.append(f"URL: {doc_url(item)}")
-        lines.append("=" * 78)
+        lines = entry(item, source_root / item.file, read)
+        if sink is not None:
+            sink(item, lines)
+        yield from lines
+
+
+def entry_lines(item: DocItem, content_path: Path, read: Callable[[Path], str]) -> list[str]:
+    lines = [
+        "=" * 78,
+        f"DOCS: {item.title} ({item.id})",
+        f"URL: {doc_url(item)}",
+        "=" * 78,
+        "",
+    ]
+    if not content_path.exists():
+        lines.append(f"(Missing source file: {item.file})")
         lines.append("")
-        content_path = source_root / item.file
-        if not content_path.exists():
-            lines.append(f"(Missing source file: {item.file})")
-            lines.append("")
+        return lines
+    lines.append(sanitize_markdown(read(content_path)))
+    return lines
+
+
+EntryLoader = Callable[[DocItem, Path, Callable[[Path], str]], list[str]]
+
+
+@dataclass
+class EntryCache:
+    """
+    `entry_lines` memoized per item and source text, so a long-running caller
+    (build-all.py --watch) only re-sanitizes the documents that changed.
+    """
+
+    entries: dict[DocItem, tuple[str, list[str]]] = field(default_factory=dict)
+
+    def __call__(self, item: DocItem, source_path: Path, read: Callable[[Path], str]) -> list[str]:
+        if not source_path.exists():
+            self.entries.pop(item, None)
+            return entry_lines(item, source_path, read)
+        text = read(source_path)
+        cached = self.entries.get(item)
+        if cached is None or cached[0] != text:
+            cached = (text, entry_lines(item, source_path, lambda _: text))
+            self.entries[item] = cached
+        return cached[1]
+
+
+class PackDigest:
+    """
+    Incremental sha256 of a pack with the *header* `Generated:` timestamp
+    masked, so a rebuild with unchanged content hashes the same.
+
+    Note: later `Generated:` lines inside documentation content are hashed
+    as-is.
+    """
+
+    def __init__(self) -> None:
+        self._sha = hashlib.sha256()
+        self._partial = b""
+        self._in_header = True
+        self._masked = False
+
+    def update(self, data: bytes) -> None:
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._line(line + b"\n")
+
+    def _line(self, line: bytes) -> None:
+        if self._in_header:
+            if not self._masked and line.startswith(b"Generated: "):
+                line = b"Generated: <preserved>\n"
+                self._masked = True
+            elif line.strip() == b"How to link:":
+                self._in_header = False
+        self._sha.update(line)
+
+    def hexdigest(self) -> str:
+        if self._partial:
+            self._line(self._partial)
+            self._partial = b""
+        return self._sha.hexdigest()
+
+
+def file_digest(path: Path, block_size: int = 1 << 16) -> str | None:
+    try:
+        f = path.open("rb")
+    except FileNotFoundError:
+        return None
+    digest = PackDigest()
+    with f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PackWriter:
+    """
+    Stream lines to `<path>.tmp` as `"\n".join(lines).rstrip() + "\n"` would
+    render them, hashing as it goes. `close` moves the file into place only if
+    its digest differs from the existing one (ignoring the header timestamp).
+    With `count` set, `tokens` tracks the estimated size of what was written.
+
+    `entries` collects the byte span of each document for the pack's
+    `.idx.json` sidecar (see `mark`).
+    """
+
+    def __init__(self, path: Path, *, count: bool = True) -> None:
+        self.path = path
+        self.tmp = path.with_name(path.name + ".tmp")
+        self.count = count
+        self.tokens = 0
+        self.size = 0
+        self.entries: dict[str, dict] = {}
+        self._digest = PackDigest()
+        self._pending = ""
+        self._first = True
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.tmp.open("wb")
+
+    def write(self, lines: Iterable[str], *, tokens: int | None = None) -> None:
+        """Append `lines`; `tokens` is their precomputed `estimate_lines` count."""
+
+        counted = 0
+        for line in lines:
+            if tokens is None and self.count:
+                counted += estimate_tokens(line) + 1
+            # Trailing whitespace is held back until more content follows it.
+            piece = line if self._first else "\n" + line
+            self._first = False
+            body = piece.rstrip()
+            if body:
+                self._emit(self._pending + body)
+                self._pending = piece[len(body) :]
+            else:
+                self._pending += piece
+        self.tokens += counted if tokens is None else tokens
+
+    def _emit(self, text: str) -> None:
+        data = text.encode("utf-8")
+        self._file.write(data)
+        self._digest.update(data)
+        self.size += len(data)
+
+    def mark(self, key: str, lines: list[str]) -> None:
+        """
+        Record where `lines`, written next, will land: the entry starts at its
+        banner and ends at its last non-blank character. `lines[0]` must not
+        be blank.
+        """
+
+        body = "\n".join(lines).rstrip().encode("utf-8")
+        offset = self.size + len(self._pending.encode("utf-8")) + (0 if self._first else 1)
+        self.entries[key] = {
+            "offset": offset,
+            "length": len(body),
+            "sha256": hashlib.sha256(body).hexdigest(),
+        }
+
+    @property
+    def index_path(self) -> Path:
+        return self.path.with_name(self.path.stem + ".idx.json")
+
+    def write_index(self) -> bool:
+        """Write `<stem>.idx.json`, mapping document ids to their byte spans."""
+
+        return write_json_if_changed(self.index_path, {"pack": self.path.name, "docs": self.entries})
+
+    def close(self) -> bool:
+        """Finish the file and return whether `path` changed."""
+
+        self._emit("\n")
+        self._file.close()
+        changed = self._digest.hexdigest() != file_digest(self.path)
+        if changed:
+            os.replace(self.tmp, self.path)
+        else:
+            self.tmp.unlink()
+        return changed
+
+    def abort(self) -> None:
+        self._file.close()
+        self.tmp.unlink(missing_ok=True)
+
+
+def sync_siblings(path: Path, *, changed: bool, compress: bool) -> list[Path]:
+    if compress:
+        return siblings.write_compressed_siblings(path, changed=changed)
+    return siblings.drop_compressed_siblings(path) if changed else []
+
+
+def write_pack(
+    out_path: Path,
+    lines: Iterable[str],
+    *,
+    split: SplitPacks | None = None,
+    compress: bool = True,
+) -> list[Path]:
+    """
+    Stream the pack to disk (see `PackWriter`) and sync its compressed
+    siblings, then finish `split` (the `sink` that produced `lines`), if any.
+    Returns every path written or removed.
+    """
+
+    writer = PackWriter(out_path, count=split is not None)
+    if split is not None:
+        split.pack = writer
+    try:
+        writer.write(lines)
+    except BaseException:
+        writer.abort()
+        if split is not None:
+            split.abort()
+        raise
+    changed = writer.close()
+    written = [out_path] if changed else []
+    written.extend(sync_siblings(out_path, changed=changed, compress=compress))
+    if split is not None:
+        written.extend(split.close())
+    return written
+
+
+# Rough stand-in for a BPE tokenizer, so budgets need no model files or
+# network: letters cost one token per 5 characters, digits go in threes,
+# punctuation in pairs, and each line break run and indentation run costs one.
+# It errs high on code-heavy pages, which keeps chunks inside the budget.
+TOKEN_PIECE = re.compile(r"[^\W\d_]+|\d{1,3}|\n+|[ \t]{2,}|[^\w\s]{1,2}|_")
+TOKEN_ESTIMATOR = "pieces-v1"
+DEFAULT_CHUNK_TOKENS = 32_000
+
+
+# Memoized: the monolithic pack and the split packs estimate the same lines,
+# and build-all.py --watch hands unchanged entries back between builds.
+@functools.lru_cache(maxsize=1 << 16)
+def estimate_tokens(text: str) -> int:
+    tokens = 0
+    for piece in TOKEN_PIECE.findall(text):
+        tokens += 1 + (len(piece) - 1) // 5 if piece[0].isalpha() else 1
+    return tokens
+
+
+def estimate_lines(lines: Iterable[str]) -> int:
+    return sum(estimate_tokens(line) + 1 for line in lines)
+
+
+def split_header(title: str, note: str) -> list[str]:
+    return [
+        title,
+        "=" * len(title),
+        "",
+        note,
+        "",
+        "How to link:",
+        "- Docs: /runtime/docs/?p=<id>",
+        "",
+    ]
+
+
+# Retrieval statistics for `llms_bm25.py`. Terms are lowercased `\w+` runs,
+# the same split the viewer's search index uses.
+BM25_TOKEN = re.compile(r"\w+")
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+@dataclass
+class Bm25Stats:
+    """
+    Per-document term counts of a pack, stored as an inverted index: each
+    term maps to a `"n,tf;n,tf"` posting string (document position in `docs`,
+    term frequency), so a term's document frequency is its posting count and
+    a query only has to decode the postings of its own terms.
+    """
+
+    docs: list[str] = field(default_factory=list)
+    lengths: list[int] = field(default_factory=list)
+    postings: dict[str, list[str]] = field(default_factory=dict)
+
+    def add(self, key: str, lines: list[str]) -> None:
+        counts = bm25_term_counts(tuple(lines))
+        n = len(self.docs)
+        self.docs.append(key)
+        self.lengths.append(sum(counts.values()))
+        for term, tf in counts.items():
+            self.postings.setdefault(term, []).append(f"{n},{tf}")
+
+    def payload(self, pack: PackWriter) -> dict:
+        return {
+            "version": 1,
+            "pack": pack.path.name,
+            "index": pack.index_path.name,
+            "tokenizer": BM25_TOKEN.pattern,
+            "k1": BM25_K1,
+            "b": BM25_B,
+            "avgLength": round(sum(self.lengths) / len(self.lengths), 3) if self.lengths else 0.0,
+            "docs": self.docs,
+            "lengths": self.lengths,
+            "terms": {term: ";".join(self.postings[term]) for term in sorted(self.postings)},
+        }
+
+
+# Memoized: build-all.py --watch hands unchanged entries back between builds.
+@functools.lru_cache(maxsize=1 << 12)
+def bm25_term_counts(lines: tuple[str, ...]) -> Counter[str]:
+    return Counter(BM25_TOKEN.findall("\n".join(lines).lower()))
+
+
+@dataclass
+class SplitPacks:
+    """
+    Sink for `iter_llms_lines` that writes, next to the monolithic pack:
+
+    - `llms-<section>.txt`: every document of one section;
+    - `llms-chunks/NNN.txt`: the pack cut into consecutive chunks of at most
+      `budget` estimated tokens (a document larger than the budget is split at
+      blank lines outside code fences);
+    - `llms-manifest.json`: each file's document ids and token estimate;
+    - `<stem>.idx.json` for the monolithic and section packs: each document's
+      byte offset, length and sha256, for Range requests or mmap;
+    - `llms.bm25.json`: BM25 statistics of the monolithic pack's documents
+      (see `Bm25Stats`).
+
+    `write_pack` attaches the monolithic pack's writer as `pack`. The sink
+    runs before a document's lines are yielded, so `pack` has written
+    everything before them and can `mark` where they start.
+    """
+
+    root: Path
+    budget: int = DEFAULT_CHUNK_TOKENS
+    compress: bool = True
+    sections: dict[str, PackWriter] = field(default_factory=dict)
+    pack: PackWriter | None = None
+    chunks: list[dict] = field(default_factory=list)
+    chunk: PackWriter | None = None
+    finished: list[tuple[Path, bool]] = field(default_factory=list)
+    bm25: Bm25Stats = field(default_factory=Bm25Stats)
+
+    @property
+    def chunk_root(self) -> Path:
+        return self.root / "llms-chunks"
+
+    def __call__(self, item: DocItem, lines: list[str]) -> None:
+        tokens = estimate_lines(lines)
+        key = doc_key(item)
+        if self.pack is not None:
+            self.pack.mark(key, lines)
+        self.bm25.add(key, lines)
+
+        writer = self.sections.get(item.section)
+        if writer is None:
+            writer = PackWriter(self.root / f"llms-{item.section}.txt")
+            writer.write(
+                split_header(
+                    f"Oro Runtime · LLMS Pack · {section_label(item.section)}",
+                    f"The {section_label(item.section)} section of the full pack at /runtime/llms.txt.",
+                )
+            )
+            self.sections[item.section] = writer
+        writer.mark(key, lines)
+        writer.write(lines, tokens=tokens)
+
+        # Every chunk opens with a header, so a part only gets what is left of
+        # the budget after it.
+        room = self.budget - estimate_lines(self._chunk_header(len(self.chunks) + 1))
+        parts = [(lines, tokens)] if tokens <= room else split_entry(lines, room)
+        for part, part_tokens in parts:
+            if self.chunk is None or (self.chunks[-1]["docs"] and self.chunk.tokens + part_tokens > self.budget):
+                self._next_chunk()
+            assert self.chunk is not None
+            self.chunk.write(part, tokens=part_tokens)
+            docs = self.chunks[-1]["docs"]
+            if not docs or docs[-1] != key:
+                docs.append(key)
+
+    def _next_chunk(self) -> None:
+        self._finish_chunk()
+        number = len(self.chunks) + 1
+        self.chunk = PackWriter(self.chunk_root / f"{number:03d}.txt")
+        self.chunk.write(self._chunk_header(number))
+        self.chunks.append({"file": f"llms-chunks/{self.chunk.path.name}", "docs": [], "tokens": 0})
+
+    def _chunk_header(self, number: int) -> list[str]:
+        return split_header(
+            f"Oro Runtime · LLMS Pack · Chunk {number}",
+            "Consecutive slice of the full pack at /runtime/llms.txt; see llms-manifest.json for the others.",
+        )
+
+    def _finish_chunk(self) -> None:
+        if self.chunk is not None:
+            self.chunks[-1]["tokens"] = self.chunk.tokens
+            self.finished.append((self.chunk.path, self.chunk.close()))
+            self.chunk = None
+
+    def abort(self) -> None:
+        for writer in [*self.sections.values(), *([self.chunk] if self.chunk else [])]:
+            writer.abort()
+
+    def close(self) -> list[Path]:
+        """
+        Finish every file, drop stale ones and write the manifest and indexes.
+        Call after the monolithic pack is closed.
+        """
+
+        assert self.pack is not None
+        self._finish_chunk()
+        self.finished.append((self.pack.index_path, self.pack.write_index()))
+        sections = []
+        for name, writer in self.sections.items():
+            sections.append(
+                {
+                    "section": name,
+                    "file": writer.path.name,
+                    "index": writer.index_path.name,
+                    "docs": list(writer.entries),
+                    "tokens": writer.tokens,
+                }
+            )
+            self.finished.append((writer.path, writer.close()))
+            self.finished.append((writer.index_path, writer.write_index()))
+
+        manifest = {
+            "generatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "estimator": TOKEN_ESTIMATOR,
+            "budget": self.budget,
+            "pack": {"file": self.pack.path.name, "index": self.pack.index_path.name, "tokens": self.pack.tokens},
+            "sections": sections,
+            "chunks": self.chunks,
+        }
+        manifest_path = self.root / "llms-manifest.json"
+        self.finished.append((manifest_path, write_json_if_changed(manifest_path, manifest)))
+        bm25_path = self.root / "llms.bm25.json"
+        self.finished.append((bm25_path, write_json_if_changed(bm25_path, self.bm25.payload(self.pack), compact=True)))
+
+        written: list[Path] = []
+        for path, changed in self.finished:
+            if changed:
+                written.append(path)
+            written.extend(sync_siblings(path, changed=changed, compress=self.compress))
+
+        keep = {path.name for path, _ in self.finished}
+        stale = [
+            *self.root.glob("llms-*.txt*"),
+            *self.root.glob("llms-*.idx.json*"),
+            *self.chunk_root.glob("*.txt*"),
+        ]
+        for path in sorted(stale):
+            if path.name.removesuffix(siblings.GZIP_SUFFIX).removesuffix(siblings.BROTLI_SUFFIX) not in keep:
+                path.unlink()
+                written.append(path)
+        return written
+
+
+def split_entry(lines: list[str], budget: int) -> list[tuple[list[str], int]]:
+    """
+    Cut an entry larger than `budget` at blank lines outside code fences.
+    Each part repeats the entry's banner with a `(part i/n)` suffix; a single
+    block larger than the budget is kept whole.
+    """
+
+    banner, body = lines[:5], "\n".join(lines[5:]).split("\n")
+    # Reserve the banner as it reads once the `(part i/n)` suffix is added.
+    widest = [*banner]
+    widest[1] = f"{banner[1]} (part 999/999)"
+    room = max(budget - estimate_lines(widest), 1)
+
+    parts: list[list[str]] = [[]]
+    used = 0
+    block: list[str] = []
+    in_code = False
+    for line in [*body, ""]:
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+        block.append(line)
+        if in_code or line.strip():
             continue
-        lines.append(sanitize_markdown(read_text(content_path)))
+        tokens = estimate_lines(block)
+        if parts[-1] and used + tokens > room:
+            parts.append([])
+            used = 0
+        parts[-1].extend(block)
+        used += tokens
+        block = []
+    parts[-1].extend(block)
+
+    out = []
+    for n, part in enumerate(parts, start=1):
+        head = [*banner]
+        head[1] = f"{banner[1]} (part {n}/{len(parts)})"
+        part_lines = head + part
+        out.append((part_lines, estimate_lines(part_lines)))
+    return out
+
+
+def write_json_if_changed(path: Path, payload: dict, *, compact: bool = False) -> bool:
+    """Write `payload` unless it only differs from the existing file in `generatedAt`."""
+
+    try:
+        existing = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        existing = None
+    if isinstance(existing, dict) and {**existing, "generatedAt": None} == {**payload, "generatedAt": None}:
+        return False
+    if compact:
+        text = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    else:
+        text = json.dumps(payload, indent=2)
+    path.write_text(text + "\n", encoding="utf-8")
+    return True
 
-    next_text = "\n".join(lines).rstrip() + "\n"
-    prev_text = out_path.read_text(encoding="utf-8") if out_path.exists() else None
 
-    if prev_text is not None and normalize_generated_line(prev_text) == normalize_generated_line(next_text):
-        print(f"Unchanged: {out_path}")
-        return
+def main():
+    parser = argparse.ArgumentParser(description="Build website/runtime/llms.txt from the Runtime docs.")
+    parser.add_argument(
+        "--no-compress",
+        action="store_true",
+        help="Skip the precompressed .gz/.br siblings (siblings of a rewritten pack are removed).",
+    )
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=DEFAULT_CHUNK_TOKENS,
+        help=f"Estimated token budget per llms-chunks/ file (default {DEFAULT_CHUNK_TOKENS}).",
+    )
+    parser.add_argument(
+        "--no-split",
+        action="store_true",
+        help="Only write llms.txt (skip the section packs, chunks and llms-manifest.json).",
+    )
+    args = parser.parse_args()
 
-    out_path.write_text(next_text, encoding="utf-8")
-    print(f"Wrote: {out_path}")
+    repo_root = Path(__file__).resolve().parents[3]
+    docs_root = repo_root / "website" / "runtime" / "docs"
+    out_path = repo_root / "website" / "runtime" / "llms.txt"
+
+    compress = not args.no_compress
+    split = None if args.no_split else SplitPacks(out_path.parent, budget=args.chunk_tokens, compress=compress)
+    written = write_pack(out_path, iter_llms_lines(docs_root, sink=split), split=split, compress=compress)
+    if out_path not in written:
+        print(f"Unchanged: {out_path}")
+    for path in written:
+        print(f"Wrote: {path}")
 
 
 if __name__ == "__main__":
@@ -2,12 +2,22 @@
 
 from __future__ import annotations
 
+import io
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Iterable, Iterator
 
 
-MODULE_START = re.compile(r"^declare module ['\"](?P<name>oro:[^'\"]+)['\"]\s*\{\s*$")
+# Matched against the top-level code (comments dropped) that precedes a `{`.
+MODULE_HEADER = re.compile(r"\bdeclare\s+module\s+(['\"])(?P<name>oro:[^'\"]+)\1\s*$")
+EXPORTED_SYMBOL = re.compile(
+    r"\bexport\s+(?:declare\s+)?(?:default\s+)?(?:abstract\s+)?"
+    r"(?P<kind>function|class|interface|type)\b\s*\*?\s*(?P<name>[A-Za-z_$][\w$]*)"
+)
+CODE_TOKEN = re.compile(r"//|/\*|['\"`{};]")
+STRING_TOKEN = {quote: re.compile(rf"\\(?:\r\n|.)|{quote}", re.S) for quote in "'\""}
+TEMPLATE_TOKEN = re.compile(r"\\(?:\r\n|.)|`|\$\{", re.S)
 
 
 CURATED_FAMILIES = {
@@ -38,10 +48,215 @@ REF_START = "<!-- GENERATED: ORO_API_REFERENCE_START -->"
 REF_END = "<!-- GENERATED: ORO_API_REFERENCE_END -->"
 
 
+@dataclass(frozen=True)
+class ModuleSymbols:
+    """Names a module exports, by kind, in declaration order (overloads listed once)."""
+
+    functions: tuple[str, ...] = ()
+    classes: tuple[str, ...] = ()
+    interfaces: tuple[str, ...] = ()
+    types: tuple[str, ...] = ()
+
+
 @dataclass(frozen=True)
 class ModuleBlock:
     spec: str
     block: str
+    symbols: ModuleSymbols = field(default_factory=ModuleSymbols)
+
+
+SYMBOL_FIELDS = {"function": "functions", "class": "classes", "interface": "interfaces", "type": "types"}
+
+
+@dataclass
+class OpenModule:
+    spec: str
+    lines: list[str]
+    symbols: dict[str, dict[str, None]] = field(default_factory=lambda: {kind: {} for kind in SYMBOL_FIELDS})
+    # Module-level code since the last `{`, `}` or `;`, scanned for `export ...` declarations.
+    statement: list[str] = field(default_factory=list)
+
+    def flush_statement(self):
+        for m in EXPORTED_SYMBOL.finditer("".join(self.statement)):
+            self.symbols[m.group("kind")].setdefault(m.group("name"))
+        self.statement.clear()
+
+    def finish(self) -> ModuleBlock:
+        self.flush_statement()
+        block = "\n".join(line.rstrip() for line in self.lines).rstrip() + "\n"
+        symbols = ModuleSymbols(**{SYMBOL_FIELDS[kind]: tuple(names) for kind, names in self.symbols.items()})
+        return ModuleBlock(spec=self.spec, block=block, symbols=symbols)
+
+
+class DeclarationScanner:
+    """
+    Splits an index.d.ts into `declare module 'oro:*' { ... }` blocks one line
+    at a time.
+
+    Braces are counted outside comments, string literals and template text
+    (`${...}` nests), so a block ends at the `}` that balances its opening
+    brace however the file is formatted. Each character is looked at once and
+    only the lines of the open module are kept, so memory is bounded by the
+    largest block rather than the file.
+    """
+
+    def __init__(self):
+        # One entry per open `{`, `${` or template literal.
+        self.stack: list[str] = []
+        self.string_quote: str | None = None
+        self.in_comment = False
+        self.module: OpenModule | None = None
+        # Top-level code on the current line, and the earlier `(line, code)`
+        # pairs since the last line that mentioned `declare`.
+        self.line_code: list[str] = []
+        self.header: list[tuple[str, str]] = []
+
+    def feed(self, line: str) -> list[ModuleBlock]:
+        if self.in_comment and "*/" not in line and self.module is not None:
+            # Doc comment bodies are most of a declaration file.
+            self.module.lines.append(line)
+            return []
+
+        finished: list[ModuleBlock] = []
+        pos = 0
+        end = len(line)
+
+        while pos < end:
+            if self.in_comment:
+                close = line.find("*/", pos)
+                if close < 0:
+                    break
+                self.in_comment = False
+                pos = close + 2
+                continue
+
+            if self.string_quote is not None:
+                start = pos
+                closed = continued = False
+                for m in STRING_TOKEN[self.string_quote].finditer(line, pos):
+                    if m.group() == self.string_quote:
+                        closed = True
+                        pos = m.end()
+                        break
+                    continued = m.end() == end and m.group()[1] in "\r\n"
+                if not closed:
+                    pos = end
+                # A string literal only runs past the end of a line after a backslash.
+                if closed or not continued:
+                    self.string_quote = None
+                self.code(line[start:pos])
+                continue
+
+            if self.stack and self.stack[-1] == "`":
+                m = TEMPLATE_TOKEN.search(line, pos)
+                while m is not None and m.group().startswith("\\"):
+                    m = TEMPLATE_TOKEN.search(line, m.end())
+                if m is None:
+                    break
+                pos = m.end()
+                if m.group() == "`":
+                    self.stack.pop()
+                else:
+                    self.stack.append("${")
+                continue
+
+            m = CODE_TOKEN.search(line, pos)
+            if m is None:
+                self.code(line[pos:end])
+                break
+            self.code(line[pos : m.start()])
+            token = m.group()
+            pos = m.end()
+            if token == "//":
+                break
+            if token == "/*":
+                self.in_comment = True
+            elif token in "'\"":
+                self.string_quote = token
+                self.code(token)
+            elif token == "`":
+                self.stack.append("`")
+            elif token == "{":
+                if not self.stack:
+                    self.open_module()
+                self.boundary()
+                self.stack.append("{")
+            elif token == "}":
+                self.boundary()
+                if self.stack:
+                    self.stack.pop()
+                if not self.stack and self.module is not None:
+                    self.module.lines.append(line)
+                    finished.append(self.module.finish())
+                    self.module = None
+            else:
+                self.boundary()
+
+        # Keep statements on separate lines apart even when a comment ate the newline.
+        self.code("\n")
+        if self.module is not None:
+            self.module.lines.append(line)
+        elif not self.stack:
+            self.end_header_line(line)
+        self.line_code.clear()
+        return finished
+
+    def close(self):
+        if self.module is not None:
+            raise SystemExit(f"Unterminated `declare module '{self.module.spec}'` block.")
+
+    def code(self, text: str):
+        """Record code (string literals included) at the top level or directly inside a module."""
+
+        if not text:
+            return
+        if not self.stack:
+            self.line_code.append(text)
+        elif self.module is not None and len(self.stack) == 1:
+            self.module.statement.append(text)
+
+    def boundary(self):
+        """`{`, `}` and `;` end the pending top-level header or module-level statement."""
+
+        if not self.stack:
+            self.line_code.clear()
+            self.header.clear()
+        elif self.module is not None and len(self.stack) == 1:
+            self.module.flush_statement()
+
+    def open_module(self):
+        """Start a module if the top-level code before this `{` is a `declare module 'oro:*'` header."""
+
+        codes = [code for _, code in self.header]
+        codes.append("".join(self.line_code))
+        m = MODULE_HEADER.search("\n".join(codes))
+        if m is None:
+            return
+        # Start the block on the line holding the matched `declare`.
+        offset = 0
+        first = len(self.header)
+        for n, code in enumerate(codes):
+            if m.start() < offset + len(code) + 1:
+                first = n
+                break
+            offset += len(code) + 1
+        self.module = OpenModule(spec=m.group("name").strip(), lines=[line for line, _ in self.header[first:]])
+
+    def end_header_line(self, line: str):
+        code = "".join(self.line_code)
+        if "declare" in code:
+            self.header = [(line, code)]
+        elif self.header:
+            self.header.append((line, code))
+
+
+def iter_module_blocks(lines: Iterable[str]) -> Iterator[ModuleBlock]:
+    """Yield each `declare module 'oro:*'` block of an index.d.ts as soon as its closing brace is read."""
+
+    scanner = DeclarationScanner()
+    for line in lines:
+        yield from scanner.feed(line)
+    scanner.close()
 
 
 def repo_root() -> Path:
@@ -61,36 +276,20 @@ def write_text_if_changed(path: Path, text: str) -> bool:
     return True
 
 
-def parse_index_d_ts(text: str) -> dict[str, ModuleBlock]:
-    lines = text.splitlines()
-    out: dict[str, ModuleBlock] = {}
-    i = 0
-
-    while i < len(lines):
-        m = MODULE_START.match(lines[i])
-        if not m:
-            i += 1
-            continue
-
-        spec = m.group("name").strip()
-        buf: list[str] = [lines[i].rstrip()]
-        i += 1
+def collect_module_blocks(blocks: Iterable[ModuleBlock]) -> dict[str, ModuleBlock]:
+    out = {block.spec: block for block in blocks}
+    if not out:
+        raise SystemExit("No `declare module 'oro:*' { ... }` blocks found.")
+    return out
 
-        while i < len(lines):
-            line = lines[i].rstrip()
-            buf.append(line)
-            if line == "}" and not lines[i].startswith((" ", "\t")):
-                break
-            i += 1
 
-        block = "\n".join(buf).rstrip() + "\n"
-        out[spec] = ModuleBlock(spec=spec, block=block)
-        i += 1
+def parse_index_d_ts(text: str) -> dict[str, ModuleBlock]:
+    return collect_module_blocks(iter_module_blocks(io.StringIO(text)))
 
-    if not out:
-        raise SystemExit("No `declare module 'oro:*' { ... }` blocks found.")
 
-    return out
+def read_index_d_ts(path: Path) -> dict[str, ModuleBlock]:
+    with path.open(encoding="utf-8") as f:
+        return collect_module_blocks(iter_module_blocks(f))
 
 
 def family_of(spec: str) -> str:
@@ -222,7 +421,7 @@ def main() -> None:
     if not index_path.exists():
         raise SystemExit(f"Missing {index_path}")
 
-    blocks = parse_index_d_ts(read_text(index_path))
+    blocks = read_index_d_ts(index_path)
 
     families: dict[str, list[str]] = {}
     for spec in blocks.keys():
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+
+GENERATOR_VERSION = 1
+
+# Pages per section in runtime/docs/source ("overview" is the top-level
+# start.md). `--scale N` multiplies these counts.
+DOCS_SECTIONS = {
+    "overview": 1,
+    "guides": 4,
+    "cli": 14,
+    "config": 3,
+    "javascript": 86,
+}
+# `declare module` blocks in the declarations embedded in the JavaScript pages.
+DEFAULT_MODULES = 224
+SUBMODULES_PER_FAMILY = 4
+
+# Page sizes are log-normal around the real corpus' median (bytes).
+PAGE_MEDIAN = 3200
+PAGE_SIGMA = 0.9
+PAGE_MAX = 200_000
+
+FENCE_LANGS = {"": 40, "js": 25, "text": 25, "bash": 10}
+
+WORDS = (
+    "application bridge buffer channel child config context dialog directory document entry event "
+    "file handle hook index ipc listener menu message module network notification option path "
+    "permission platform process promise protocol queue request resource response runtime secure "
+    "service signal socket storage stream target timer token tray url user value window worker"
+).split()
+VERBS = "accepts closes creates dispatches emits opens posts reads resolves returns sends stores watches writes".split()
+TYPES = "string number boolean object Uint8Array ArrayBuffer any".split()
+
+STATUS_PHRASES = (
+    "See `docs/{section}/{word}.md` for details.",
+    "Tracked in STATUS.md.",
+    "Also covered by `llms.txt`.",
+)
+SECTION_HEADINGS = ("Usage", "Options", "Examples", "Events", "Errors", "Notes", "Platform support")
+
+
+def page_rng(seed: int, *parts: object) -> random.Random:
+    """
+    An RNG for one page or module. String seeds are hashed (SHA-512) by
+    `random`, so the output depends only on the seed and its position, never
+    on how many pages or modules come before or after it.
+    """
+
+    return random.Random(":".join(str(part) for part in (GENERATOR_VERSION, seed, *parts)))
+
+
+@dataclass
+class TextGenerator:
+    rng: random.Random
+
+    def word(self) -> str:
+        return self.rng.choice(WORDS)
+
+    def ident(self) -> str:
+        first, *rest = (self.word() for _ in range(self.rng.randint(1, 2)))
+        return first + "".join(word.capitalize() for word in rest)
+
+    def title(self) -> str:
+        return " ".join(self.word() for _ in range(self.rng.randint(1, 3))).capitalize()
+
+    def sentence(self, section: str) -> str:
+        words = [self.word() for _ in range(self.rng.randint(6, 18))]
+        roll = self.rng.random()
+        if roll < 0.25:
+            words[self.rng.randrange(len(words))] = f"`{self.ident()}()`"
+        elif roll < 0.35:
+            words[self.rng.randrange(len(words))] = f"**{self.word()}**"
+        words.insert(self.rng.randint(1, len(words) - 1), self.rng.choice(VERBS))
+        text = " ".join(words)
+        text = text[0].upper() + text[1:] + "."
+        if self.rng.random() < 0.05:
+            text += " " + self.rng.choice(STATUS_PHRASES).format(word=self.word(), section=section)
+        return text
+
+    def paragraph(self, section: str) -> list[str]:
+        text = " ".join(self.sentence(section) for _ in range(self.rng.randint(1, 5)))
+        return wrap(text)
+
+    def bullets(self, section: str) -> list[str]:
+        lines: list[str] = []
+        for _ in range(self.rng.randint(2, 7)):
+            lines.append(f"- {self.sentence(section)}")
+            if self.rng.random() < 0.2:
+                lines.extend(f"  - `{self.ident()}` {self.rng.choice(VERBS)} a {self.word()}" for _ in range(2))
+        return lines
+
+    def table(self) -> list[str]:
+        columns = self.rng.randint(2, 4)
+        header = [self.word().capitalize() for _ in range(columns)]
+        lines = ["| " + " | ".join(header) + " |", "|" + "|".join("---" for _ in header) + "|"]
+        for _ in range(self.rng.randint(2, 8)):
+            cells = [f"`{self.ident()}`", *(self.word() for _ in range(columns - 1))]
+            lines.append("| " + " | ".join(cells) + " |")
+        return lines
+
+    def comment(self, section: str) -> list[str]:
+        if self.rng.random() < 0.5:
+            return [f"<!-- {self.sentence(section)} -->"]
+        return ["<!--", *self.paragraph(section), "-->"]
+
+    def code(self) -> list[str]:
+        lang = self.rng.choices(list(FENCE_LANGS), weights=list(FENCE_LANGS.values()))[0]
+        body = {"js": self.js_code, "bash": self.bash_code, "text": self.plain_code, "": self.plain_code}[lang]()
+        return [f"```{lang}", *body, "```"]
+
+    def js_code(self) -> list[str]:
+        name = self.ident()
+        lines = [f"import {{ {name} }} from 'oro:{self.word()}'", ""]
+        for _ in range(self.rng.randint(1, 6)):
+            if self.rng.random() < 0.2:
+                lines.append(f"// {self.word()} {self.word()}")
+            lines.append(f"const {self.ident()} = await {name}({{ {self.word()}: {self.rng.randint(0, 99)} }})")
+        return lines
+
+    def bash_code(self) -> list[str]:
+        lines = []
+        for _ in range(self.rng.randint(1, 4)):
+            line = f"oroc {self.rng.choice(('build', 'run', 'init', 'env'))} --{self.word()}={self.word()}"
+            if self.rng.random() < 0.3:
+                line += f"  # {self.word()} {self.word()}"
+            lines.append(line)
+        return lines
+
+    def plain_code(self) -> list[str]:
+        return [" ".join(self.word() for _ in range(self.rng.randint(2, 8))) for _ in range(self.rng.randint(1, 5))]
+
+    def doc_comment(self, indent: str) -> list[str]:
+        lines = [f"{indent}/**"]
+        lines.extend(f"{indent} * {line}" for line in wrap(self.sentence("javascript"), 76))
+        if self.rng.random() < 0.5:
+            lines.append(f"{indent} * @param {{{self.rng.choice(TYPES)}}} {self.word()}")
+        if self.rng.random() < 0.3:
+            lines.append(f"{indent} * @see {{@link oro:{self.word()}}}")
+        lines.append(f"{indent} */")
+        return lines
+
+    def params(self) -> str:
+        params = []
+        for _ in range(self.rng.randint(0, 3)):
+            optional = "?" if self.rng.random() < 0.3 else ""
+            params.append(f"{self.word()}{optional}: {self.rng.choice(TYPES)}")
+        if self.rng.random() < 0.2:
+            params.append(f"options?: {{ {self.word()}?: {self.rng.choice(TYPES)}; {self.word()}?: string }}")
+        return ", ".join(params)
+
+    def export(self, other: str) -> list[str]:
+        """One exported declaration, shaped like the ones tsc emits for the runtime's modules."""
+
+        indent = "  "
+        lines = self.doc_comment(indent) if self.rng.random() < 0.7 else []
+        name = self.ident()
+        type_name = name[0].upper() + name[1:]
+        kind = self.rng.choices(
+            ("const", "function", "class", "interface", "type", "import"), weights=(30, 30, 15, 8, 10, 7)
+        )[0]
+        if kind == "const":
+            lines.append(f"{indent}export const {name.upper()}: {self.rng.choice(TYPES)}")
+        elif kind == "function":
+            result = self.rng.choice((*TYPES, "void", "Promise<void>"))
+            lines.append(f"{indent}export function {name}({self.params()}): {result}")
+        elif kind == "class":
+            lines.append(f"{indent}export class {type_name} extends EventTarget {{")
+            lines.append(f"{indent}  constructor({self.params()})")
+            for _ in range(self.rng.randint(1, 6)):
+                if self.rng.random() < 0.3:
+                    lines.append(f"{indent}  get {self.ident()}(): {{")
+                    lines.append(f"{indent}    {self.word()}: number")
+                    lines.append(f"{indent}  }}")
+                else:
+                    lines.append(f"{indent}  {self.ident()}({self.params()}): {self.rng.choice(TYPES)}")
+            lines.append(f"{indent}}}")
+        elif kind == "interface":
+            lines.append(f"{indent}export interface {type_name} {{")
+            lines.extend(f"{indent}  {self.word()}: {self.rng.choice(TYPES)}" for _ in range(self.rng.randint(1, 5)))
+            lines.append(f"{indent}}}")
+        elif kind == "type":
+            members = " | ".join(f"'{self.word()}'" for _ in range(self.rng.randint(2, 4)))
+            lines.append(f"{indent}export type {type_name} = {members}")
+        else:
+            lines = [f"{indent}import {{ {type_name} }} from '{other}'"]
+        return lines
+
+
+def wrap(text: str, width: int = 88) -> list[str]:
+    lines: list[str] = []
+    line = ""
+    for word in text.split(" "):
+        if line and len(line) + 1 + len(word) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+
+def module_spec(seed: int, n: int) -> str:
+    """`oro:<family>` for the first module of each family, then `oro:<family>/<name>`."""
+
+    family, index = divmod(n, SUBMODULES_PER_FAMILY)
+    gen = TextGenerator(page_rng(seed, "family", family))
+    spec = f"oro:{gen.word()}-{family}"
+    if index:
+        spec += f"/{TextGenerator(page_rng(seed, 'module', n)).word()}-{index}"
+    return spec
+
+
+def module_block(seed: int, n: int) -> str:
+    spec = module_spec(seed, n)
+    gen = TextGenerator(page_rng(seed, "module", n, "body"))
+    lines = [f"declare module '{spec}' {{"]
+    for _ in range(gen.rng.randint(1, 24)):
+        lines.extend(gen.export(module_spec(seed, gen.rng.randrange(n + 1))))
+    if gen.rng.random() < 0.4:
+        lines.extend(["  const _default: any", "  export default _default"])
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def iter_index_d_ts(*, seed: int, modules: int) -> Iterator[str]:
+    """Yield an index.d.ts one `declare module` block at a time, so huge files need not fit in memory."""
+
+    yield f"// Synthetic declarations (generator v{GENERATOR_VERSION}, seed {seed}, {modules} modules).\n\n"
+    for n in range(modules):
+        yield module_block(seed, n)
+        yield "\n"
+
+
+def page_title(gen: TextGenerator, section: str) -> str:
+    if section == "cli":
+        return f"`oroc {gen.word()}`"
+    if section == "javascript":
+        return f"`oro:{gen.word()}`"
+    return gen.title()
+
+
+def page_markdown(gen: TextGenerator, section: str, *, declarations: str | None = None) -> str:
+    """One page: a title, an optional Status line, then `##` sections of mixed blocks up to a sampled size."""
+
+    target = min(PAGE_MAX, int(gen.rng.lognormvariate(0, PAGE_SIGMA) * PAGE_MEDIAN))
+    lines = [f"# {page_title(gen, section)}", ""]
+    if gen.rng.random() < 0.1:
+        lines.extend([f"Status: **{gen.title()}**. {gen.sentence(section)}", ""])
+    lines.extend([*gen.paragraph(section), ""])
+
+    size = sum(len(line) + 1 for line in lines)
+    while size < target:
+        heading = gen.rng.choice(SECTION_HEADINGS) if gen.rng.random() < 0.4 else gen.title()
+        block = [f"## {heading}", ""]
+        for _ in range(gen.rng.randint(1, 5)):
+            make = gen.rng.choices(
+                (gen.paragraph, gen.bullets, gen.code, gen.table, gen.comment, None),
+                weights=(40, 25, 20, 5, 3, 7),
+            )[0]
+            if make is None:
+                block.extend([f"### {gen.title()}", ""])
+            elif make in (gen.code, gen.table):
+                block.extend([*make(), ""])
+            else:
+                block.extend([*make(section), ""])
+        lines.extend(block)
+        size += sum(len(line) + 1 for line in block)
+
+    if declarations is not None:
+        lines.extend(["## API reference", "", "```ts", *declarations.rstrip().splitlines(), "```", ""])
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def iter_pages(*, seed: int, scale: int = 1) -> Iterator[tuple[str, str]]:
+    """
+    Yield `(rel, markdown)` for every page: `scale` times the real number of
+    pages per section, each named `<words>-<n>.md` (the overview pages are
+    `start.md`, `start-2.md`, ...). JavaScript pages end with the declaration
+    of one module, like the generated API reference pages.
+    """
+
+    for section, count in DOCS_SECTIONS.items():
+        for n in range(1, count * scale + 1):
+            gen = TextGenerator(page_rng(seed, "docs", section, n))
+            if section == "overview":
+                rel = "start.md" if n == 1 else f"start-{n}.md"
+            else:
+                rel = f"{section}/{gen.word()}-{gen.word()}-{n}.md"
+            declarations = module_block(seed, n - 1) if section == "javascript" else None
+            yield rel, page_markdown(gen, section, declarations=declarations)
+
+
+def write_corpus(dest: Path, *, seed: int, scale: int = 1, modules: int | None = None) -> dict[str, dict]:
+    """
+    Write `<dest>/docs/source/...` and `<dest>/index.d.ts` (`modules` blocks,
+    default `scale` times the real count) and return file and byte counts.
+    """
+
+    source_root = dest / "docs" / "source"
+    if source_root.exists():
+        shutil.rmtree(source_root)
+    files = size = 0
+    for rel, text in iter_pages(seed=seed, scale=scale):
+        path = source_root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = text.encode("utf-8")
+        path.write_bytes(data)
+        files += 1
+        size += len(data)
+
+    if modules is None:
+        modules = DEFAULT_MODULES * scale
+    dts_size = 0
+    dest.mkdir(parents=True, exist_ok=True)
+    with (dest / "index.d.ts").open("w", encoding="utf-8", newline="\n") as f:
+        for block in iter_index_d_ts(seed=seed, modules=modules):
+            f.write(block)
+            dts_size += len(block.encode("utf-8"))
+
+    return {"docs": {"files": files, "bytes": size}, "index.d.ts": {"modules": modules, "bytes": dts_size}}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate a seeded, deterministic docs tree and index.d.ts shaped like the Oro Runtime sources."
+    )
+    parser.add_argument("dest", type=Path, help="Output directory (gets docs/source and index.d.ts).")
+    parser.add_argument("--seed", type=int, default=1, help="Same seed, same bytes (default: 1).")
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=1,
+        help="Multiply the real corpus' page count per section (default: 1).",
+    )
+    parser.add_argument(
+        "--modules",
+        type=int,
+        help=f"Number of `declare module` blocks in index.d.ts (default: {DEFAULT_MODULES} x scale).",
+    )
+    args = parser.parse_args()
+    if args.scale < 1:
+        parser.error("--scale must be at least 1")
+
+    stats = write_corpus(args.dest, seed=args.seed, scale=args.scale, modules=args.modules)
+    docs, dts = stats["docs"], stats["index.d.ts"]
+    print(f"docs: {docs['files']} files, {docs['bytes'] / 1e6:.1f} MB -> {args.dest / 'docs' / 'source'}")
+    print(f"index.d.ts: {dts['modules']} modules, {dts['bytes'] / 1e6:.1f} MB -> {args.dest / 'index.d.ts'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import math
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+# Must agree with `BM25_TOKEN` in build-llms-txt.py.
+TOKEN = re.compile(r"\w+")
+
+
+def terms(text: str) -> list[str]:
+    return TOKEN.findall(text.lower())
+
+
+@dataclass(frozen=True)
+class Hit:
+    key: str
+    score: float
+    offset: int
+    length: int
+
+
+@dataclass
+class Bm25Index:
+    """
+    Query API over the `llms.bm25.json` bundle written by build-llms-txt.py.
+
+    The bundle holds each document's length and, per term, a posting string
+    `"n,tf;..."` (document position, term frequency); a term's document
+    frequency is its number of postings. Postings are only parsed for terms
+    that appear in a query, so loading stays cheap and a top-k search touches
+    only the matching documents.
+    """
+
+    path: Path
+    pack: Path
+    docs: list[str]
+    lengths: list[int]
+    spans: dict[str, dict]
+    raw_terms: dict[str, str]
+    k1: float
+    b: float
+    avg_length: float
+    parsed: dict[str, list[tuple[int, int]]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> Bm25Index:
+        bundle = json.loads(path.read_text(encoding="utf-8"))
+        index = json.loads((path.parent / bundle["index"]).read_text(encoding="utf-8"))
+        return cls(
+            path=path,
+            pack=path.parent / bundle["pack"],
+            docs=bundle["docs"],
+            lengths=bundle["lengths"],
+            spans=index["docs"],
+            raw_terms=bundle["terms"],
+            k1=bundle["k1"],
+            b=bundle["b"],
+            avg_length=bundle["avgLength"],
+        )
+
+    def postings(self, term: str) -> list[tuple[int, int]]:
+        parsed = self.parsed.get(term)
+        if parsed is None:
+            raw = self.raw_terms.get(term, "")
+            parsed = []
+            for posting in raw.split(";") if raw else ():
+                n, tf = posting.split(",")
+                parsed.append((int(n), int(tf)))
+            self.parsed[term] = parsed
+        return parsed
+
+    def search(self, query: str, k: int = 10) -> list[Hit]:
+        count = len(self.docs)
+        scores: dict[int, float] = {}
+        for term in dict.fromkeys(terms(query)):
+            postings = self.postings(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+            for n, tf in postings:
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[n] / self.avg_length)
+                scores[n] = scores.get(n, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        best = heapq.nlargest(k, scores.items(), key=lambda pair: (pair[1], -pair[0]))
+        hits = []
+        for n, score in best:
+            key = self.docs[n]
+            span = self.spans[key]
+            hits.append(Hit(key=key, score=score, offset=span["offset"], length=span["length"]))
+        return hits
+
+    def read(self, hit: Hit) -> str:
+        """Read one document's text from the pack without loading the rest."""
+
+        with self.pack.open("rb") as f:
+            f.seek(hit.offset)
+            return f.read(hit.length).decode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query the BM25 bundle of an LLMS pack.")
+    parser.add_argument("query", nargs="+", help="Search terms.")
+    parser.add_argument(
+        "--bundle",
+        type=Path,
+        default=Path(__file__).resolve().parents[1] / "llms.bm25.json",
+        help="Bundle to query (defaults to website/runtime/llms.bm25.json).",
+    )
+    parser.add_argument("-k", type=int, default=10, help="Number of results.")
+    parser.add_argument("--show", action="store_true", help="Print the text of the top result.")
+    args = parser.parse_args()
+
+    index = Bm25Index.load(args.bundle)
+    hits = index.search(" ".join(args.query), args.k)
+    for hit in hits:
+        print(f"{hit.score:8.3f}  {hit.key}  (bytes {hit.offset}+{hit.length})")
+    if args.show and hits:
+        print()
+        print(index.read(hits[0]))
+
+
+if __name__ == "__main__":
+    main()
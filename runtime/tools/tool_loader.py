@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+
+TOOLS_ROOT = Path(__file__).resolve().parent
+
+
+def load_tool(name: str) -> ModuleType:
+    """
+    Import a sibling `<name>.py` script. The module is registered in
+    `sys.modules` before it runs so its dataclasses (and process-pool workers)
+    can resolve it by name.
+    """
+
+    module_name = name.replace("-", "_")
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, TOOLS_ROOT / f"{name}.py")
+    if spec is None or spec.loader is None:
+        raise SystemExit(f"Cannot load {name}.py from {TOOLS_ROOT}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+import traceback
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+from tool_loader import load_tool
+
+
+TOOLS_ROOT = Path(__file__).resolve().parent
+
+
+# Loaded at import time so spawned `--jobs` workers see the same modules.
+indexes = load_tool("build-indexes")
+llms = load_tool("build-llms-txt")
+
+
+@dataclass
+class Sources:
+    """Source files read during the build, so each is read from disk once."""
+
+    data: dict[Path, bytes] = field(default_factory=dict)
+
+    def read_bytes(self, path: Path) -> bytes:
+        data = self.data.get(path)
+        if data is None:
+            data = path.read_bytes()
+            self.data[path] = data
+        return data
+
+    def read_text(self, path: Path) -> str:
+        return self.read_bytes(path).decode("utf-8")
+
+    def forget(self, path: Path) -> None:
+        self.data.pop(path, None)
+
+
+@dataclass
+class Timings:
+    stages: list[tuple[str, float]] = field(default_factory=list)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - start))
+
+    def report(self) -> None:
+        width = max(len(name) for name, _ in self.stages)
+        print("Timings:")
+        for name, seconds in self.stages:
+            print(f"- {name:<{width}}  {seconds * 1000:8.1f} ms")
+        total = sum(seconds for _, seconds in self.stages)
+        print(f"- {'total':<{width}}  {total * 1000:8.1f} ms")
+
+
+@dataclass
+class Kind:
+    """One corpus (docs or wiki) and the items derived from its sources, keyed by path."""
+
+    name: str
+    root: Path
+    section_order: list[str]
+    cache: indexes.BuildCache | None = None
+    items: dict[str, indexes.Item] = field(default_factory=dict)
+
+    @property
+    def source_root(self) -> Path:
+        return self.root / "source"
+
+    def ordered(self) -> list[indexes.Item]:
+        return indexes.sort_items(self.items.values(), self.section_order)
+
+
+@dataclass
+class SiteBuild:
+    """
+    Everything one build needs, kept between builds so `--watch` only
+    re-derives the sources that changed and re-renders their pack entries.
+    """
+
+    site_root: Path
+    kinds: list[Kind]
+    args: argparse.Namespace
+    sources: Sources = field(default_factory=Sources)
+    entries: llms.EntryCache = field(default_factory=llms.EntryCache)
+
+    def collect(self, kind: Kind) -> bool:
+        if not self.args.no_cache:
+            kind.cache = indexes.load_cache(self.args.cache_dir / f"build-indexes-{kind.name}.json")
+        items = indexes.collect_items(
+            kind.source_root,
+            kind.section_order,
+            kind.cache,
+            jobs=indexes.resolve_jobs(self.args.jobs),
+            read_bytes=self.sources.read_bytes,
+            sidecar=not self.args.no_sidecar,
+        )
+        if kind.cache is not None:
+            indexes.save_cache(kind.cache)
+            print(f"{kind.name}: {kind.cache.report()}")
+        kind.items = {item.file: item for item in items}
+        return True
+
+    def refresh(self, kind: Kind, changed: set[Path]) -> bool:
+        """
+        Re-derive the items whose source (or a directory above it) is in
+        `changed`, add new sources and drop deleted ones. Returns whether
+        anything in `kind` was touched.
+        """
+
+        paths = {
+            path.relative_to(kind.source_root).as_posix(): path
+            for path in sorted(kind.source_root.rglob("*"))
+            if indexes.is_source_file(path)
+        }
+        dirty = [
+            rel
+            for rel, path in paths.items()
+            if rel not in kind.items or path in changed or not changed.isdisjoint(path.parents)
+        ]
+        removed = [rel for rel in kind.items if rel not in paths]
+        if not dirty and not removed:
+            return False
+
+        for rel in removed:
+            del kind.items[rel]
+            self.sources.forget(kind.source_root / rel)
+            if kind.cache is not None:
+                kind.cache.seen.discard(rel)
+        for rel in dirty:
+            path = paths[rel]
+            self.sources.forget(path)
+            if kind.cache is None:
+                item, markdown = None, self.sources.read_text(path)
+            else:
+                item, markdown = kind.cache.lookup(rel, path, self.sources.read_bytes)
+            if item is None:
+                item = indexes.derive_item(rel, markdown)
+                if kind.cache is not None:
+                    kind.cache.store(item)
+            kind.items[rel] = item
+        if kind.cache is not None:
+            indexes.save_cache(kind.cache)
+        print(f"{kind.name}: {len(dirty)} changed, {len(removed)} removed")
+        return True
+
+    def run(self, changed: set[Path] | None = None) -> None:
+        """Build everything, or (given `changed`) only what those paths affect."""
+
+        args = self.args
+        compress = not args.no_compress
+        compact = args.search_format == "compact"
+        timings = Timings()
+        written: list[Path] = []
+
+        affected = False
+        for kind in self.kinds:
+            with timings.stage(f"items ({kind.name})"):
+                touched = self.collect(kind) if changed is None else self.refresh(kind, changed)
+            if not touched:
+                continue
+            affected = True
+            with timings.stage(f"indexes ({kind.name})"):
+                written.extend(
+                    indexes.write_indexes(
+                        kind.root, kind.name, kind.ordered(), kind.section_order, compress=compress, compact=compact
+                    )
+                )
+        if not affected:
+            return
+
+        with timings.stage("llms.txt"):
+            docs_items, wiki_items = (
+                llms.items_from_sections(indexes.group_sections(kind.ordered(), kind.section_order), kind.name)
+                for kind in self.kinds
+            )
+            split = None if args.no_split else llms.SplitPacks(self.site_root, budget=args.chunk_tokens, compress=compress)
+            dedupe = None if args.no_dedupe else llms.ParagraphDedupe()
+            lines = llms.iter_llms_lines(
+                self.site_root,
+                items=(docs_items, wiki_items),
+                read=self.sources.read_text,
+                sink=split,
+                dedupe=dedupe,
+                entry=self.entries,
+            )
+            written.extend(llms.write_pack(self.site_root / "llms.txt", lines, split=split, compress=compress))
+
+        if written:
+            print("Wrote:")
+            for path in written:
+                print(f"- {path}")
+        else:
+            print("No changes.")
+        if dedupe is not None:
+            print(dedupe.report())
+
+        if changed is None:
+            size = sum(len(data) for data in self.sources.data.values())
+            print(f"Read {len(self.sources.data)} source files once ({size / 1024:,.0f} KB).")
+        timings.report()
+
+
+# inotify(7) constants from <sys/inotify.h>.
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+INOTIFY_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (then `len` bytes of name)
+
+
+class InotifyWatcher:
+    """Linux inotify through libc (ctypes), with one watch per source directory."""
+
+    def __init__(self, roots: list[Path]) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.libc = libc
+        self.roots = roots
+        self.fd = libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: dict[int, Path] = {}
+        for root in roots:
+            self.add_tree(root)
+
+    def add_tree(self, root: Path) -> None:
+        for directory in [root, *sorted(path for path in root.rglob("*") if path.is_dir())]:
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), INOTIFY_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+            self.dirs[wd] = directory
+
+    def wait(self, timeout: float | None) -> set[Path]:
+        """Paths touched since the last call, or an empty set after `timeout` seconds."""
+
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        data = os.read(self.fd, 64 * 1024)
+        changed: set[Path] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                changed.update(self.roots)
+                continue
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            directory = self.dirs.get(wd)
+            if directory is None:
+                continue
+            path = directory / name if name else directory
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self.add_tree(path)
+            changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback that compares file sizes and mtimes every `interval` seconds."""
+
+    def __init__(self, roots: list[Path], interval: float = 0.5) -> None:
+        self.roots = roots
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self) -> dict[Path, tuple[int, int]]:
+        snapshot: dict[Path, tuple[int, int]] = {}
+        for root in self.roots:
+            for path in root.rglob("*"):
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                if not path.is_dir():
+                    snapshot[path] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def wait(self, timeout: float | None) -> set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            pause = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            time.sleep(max(pause, 0.0))
+            snapshot = self.scan()
+            changed = {path for path in snapshot.keys() | self.snapshot.keys() if snapshot.get(path) != self.snapshot.get(path)}
+            self.snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self) -> None:
+        pass
+
+
+def open_watcher(roots: list[Path], *, poll: bool) -> InotifyWatcher | PollingWatcher:
+    if not poll:
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError) as exc:
+            print(f"inotify unavailable ({exc}); polling instead.")
+    return PollingWatcher(roots)
+
+
+def watch(build: SiteBuild, *, debounce: float, poll: bool) -> None:
+    """
+    Rebuild whenever a source changes. Events are collected until the tree
+    has been quiet for `debounce` seconds, so an editor's save (or a
+    checkout) triggers one rebuild.
+    """
+
+    roots = [kind.source_root for kind in build.kinds]
+    watcher = open_watcher(roots, poll=poll)
+    print(f"Watching {', '.join(map(str, roots))} ({type(watcher).__name__}); press Ctrl-C to stop.")
+    try:
+        while True:
+            changed = watcher.wait(None)
+            while more := watcher.wait(debounce):
+                changed |= more
+            try:
+                build.run(changed)
+            except Exception:
+                traceback.print_exc()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Build index.json, search.json and llms.txt for the Silk docs + wiki in one pass."
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=TOOLS_ROOT / ".cache",
+        help="Where to keep the incremental build cache (defaults to website/silk/tools/.cache).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-derive every item from source and leave the cache untouched.",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Derive changed items in N worker processes (0 = one per CPU).",
+    )
+    parser.add_argument(
+        "--no-compress",
+        action="store_true",
+        help="Skip the precompressed .gz/.br siblings (siblings of rewritten artifacts are removed).",
+    )
+    parser.add_argument(
+        "--search-format",
+        choices=("full", "compact"),
+        default="full",
+        help="Layout of search.json and its shards (see build-indexes.py).",
+    )
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=llms.DEFAULT_CHUNK_TOKENS,
+        help="Estimated token budget per llms-chunks/ file (see build-llms-txt.py).",
+    )
+    parser.add_argument(
+        "--no-split",
+        action="store_true",
+        help="Only write llms.txt (skip the section packs, chunks and llms-manifest.json).",
+    )
+    parser.add_argument(
+        "--no-sidecar",
+        action="store_true",
+        help="Parse every source even when the sync step left a matching .sync-items.json entry.",
+    )
+    parser.add_argument(
+        "--no-dedupe",
+        action="store_true",
+        help="Keep wiki paragraphs that repeat a docs paragraph (see build-llms-txt.py).",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="After the build, keep running and rebuild what changed under docs/source and wiki/source.",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="With --watch, poll file mtimes instead of using inotify.",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.2,
+        help="With --watch, seconds of quiet to wait for before rebuilding (default 0.2).",
+    )
+    args = parser.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[3]
+    site_root = repo_root / "website" / "silk"
+    kinds = [
+        Kind("docs", site_root / "docs", indexes.SECTION_ORDER_DOCS),
+        Kind("wiki", site_root / "wiki", indexes.SECTION_ORDER_WIKI),
+    ]
+    build = SiteBuild(site_root, kinds, args)
+    build.run()
+    if args.watch:
+        watch(build, debounce=args.debounce, poll=args.poll)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,25 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
 import json
+import os
 import re
-from dataclasses import dataclass
+import struct
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from tool_loader import load_tool
+
+
+# Shared with build-indexes.py.
+siblings = load_tool("compressed_siblings")
+# `sanitize_markdown` builds on its `frame_markdown` pass.
+indexes = load_tool("build-indexes")
 
 
 @dataclass(frozen=True)
@@ -19,8 +33,12 @@ class DocItem:
     file: str
 
 
+def read_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
 def read_json(path: Path) -> object:
-    return json.loads(path.read_text(encoding="utf-8"))
+    return json.loads(read_text(path))
 
 
 def file_to_id(file: str) -> str:
@@ -40,6 +58,11 @@ def load_items(kind_root: Path, kind: str) -> list[DocItem]:
     sections = index.get("sections") if isinstance(index, dict) else None
     if not isinstance(sections, list):
         raise SystemExit(f"Invalid index.json shape at {index_path}")
+    return items_from_sections(sections, kind)
+
+
+def items_from_sections(sections: list, kind: str) -> list[DocItem]:
+    """Flatten the `sections` array of an index.json payload into pack items."""
 
     items: list[DocItem] = []
     for section in sections:
@@ -67,6 +90,11 @@ def section_label(name: str) -> str:
     return name.replace("-", " ").replace("_", " ").title()
 
 
+def doc_key(item: DocItem) -> str:
+    # Docs and wiki share ids (e.g. language/enums), so qualify them.
+    return f"{item.kind}:{item.id}"
+
+
 def doc_url(item: DocItem) -> str:
     if item.kind == "docs":
         m = re.match(r"^spec/(\d{4})$", item.id)
@@ -77,203 +105,155 @@ def doc_url(item: DocItem) -> str:
     return f"/silk/docs/?p={item.id}"
 
 
-def sanitize_markdown(markdown: str) -> str:
-    """
-    Create LLM-friendly content:
-    - Drop status/meta framing (Status sections, PLAN/STATUS/README/llms refs).
-    - Avoid "subset"/"works today" tone in prose and comments.
-    - Avoid leaking internal file-path references like docs/... and tests/...
-      outside of code fences (the LLMS pack already includes the full content).
-    """
-
-    drop_line = re.compile(
-        r"(STATUS\.md|PLAN\.md|README\.md|\bllms\.txt\b|_template-[^`\s]+|style-guide\.md|\bdocs/|\btests/)",
-        flags=re.I,
-    )
-    status_heading = re.compile(r"^(#{1,6})\s+(Status|Implementation status)\b", flags=re.I)
-    status_line = re.compile(r"^(Status:|Implementation status:)\s*", flags=re.I)
-    status_prefix = re.compile(r"^(\s*)(Status:|Implementation status:)\s*", flags=re.I)
-
-    def strip_status_line(line: str) -> str:
-        m = status_prefix.match(line)
-        if not m:
-            return line
-        leading = m.group(1)
-        rest = line[m.end() :]
-        delims = [". ", ": ", "— ", "– "]
-        cuts: list[tuple[int, int]] = []
-        for d in delims:
-            idx = rest.find(d)
-            if idx != -1:
-                cuts.append((idx, len(d)))
-        if not cuts:
-            return ""
-        idx, dlen = min(cuts, key=lambda x: x[0])
-        return leading + rest[idx + dlen :]
-
-    def rewrite_text(text: str) -> str:
-        out = text
-        out = re.sub(r"^(\s*#{1,6}\s+)What works today\b", r"\1Supported behavior", out, flags=re.I)
-        out = re.sub(r"\bwhat works today\b", "supported behavior", out, flags=re.I)
-        out = re.sub(r"^(\s*#{1,6}\s+)Syntax\s*\(Selected\)\s*$", r"\1Syntax", out, flags=re.I)
-        out = re.sub(r"\bCurrent limitations\b", "Limitations", out, flags=re.I)
-        out = out.replace("Implemented in", "Defined in")
-
-        out = re.sub(r"\bExamples\s*\(Works today\)\b", "Examples", out, flags=re.I)
-        out = re.sub(r"\bExample\s*\(Works today\)\s*:", "Example:", out, flags=re.I)
-        out = re.sub(r"^(\s*#{1,6}\s+)Works today:\s*", r"\1Example: ", out, flags=re.I)
-        out = re.sub(r"^(\s*#{1,6}\s+)Works today\b", r"\1Example", out, flags=re.I)
-        out = re.sub(r"^(\s*[-*+]\s+)Works today:\s*", r"\1Example: ", out, flags=re.I)
-        out = re.sub(r"^(\s*[-*+]\s+)Works today\b", r"\1Example", out, flags=re.I)
-        out = re.sub(r"^\s*Works today:\s*", "Example: ", out, flags=re.I)
-        out = re.sub(r"^(\s*)Works today\b", r"\1Example", out, flags=re.I)
-        out = re.sub(r"\(Works today\)", "", out, flags=re.I)
-
-        out = re.sub(
-            r"^(\s*(?:[-*+]\s+)?)in the current (?:compiler/backend|compiler|backend|scalar-slot backend)?\s*subset\b",
-            r"\1In Silk",
-            out,
-            flags=re.I,
-        )
-        out = re.sub(
-            r"\bin the current (?:compiler/backend|compiler|backend|scalar-slot backend)?\s*subset\b",
-            "in Silk",
-            out,
-            flags=re.I,
-        )
-        out = re.sub(r"\bthe current compiler/backend subset\b", "the compiler", out, flags=re.I)
-        out = re.sub(r"\bthe current compiler subset\b", "the compiler", out, flags=re.I)
-        out = re.sub(r"\bthe current scalar-slot backend subset\b", "the scalar-slot backend", out, flags=re.I)
-        out = re.sub(r"\bthe current backend subset\b", "the backend", out, flags=re.I)
-        out = re.sub(r"\bCurrent subset limitation\b", "Limitation", out, flags=re.I)
-        out = re.sub(r"\bcurrent\s+(?:subset|support)\b", "", out, flags=re.I)
-        out = re.sub(r"\s*\(\s*current\s+(?:subset|support)[^)]*\)", "", out, flags=re.I)
-
-        if re.match(r"^\s*#{1,6}\s", out):
-            out = re.sub(
-                r"\s*\([^)]*(works today|implemented|planned|selected|current\s+(?:subset|compiler|backend|checker|implementation))[^)]*\)",
-                "",
-                out,
-                flags=re.I,
-            )
+HEADING_LINE = re.compile(r"^\s*#{1,6}\s")
+DROP_LINE = re.compile(
+    r"(STATUS\.md|PLAN\.md|README\.md|\bllms\.txt\b|_template-[^`\s]+|style-guide\.md|\bdocs/|\btests/)",
+    flags=re.I,
+)
 
-        out = re.sub(
-            r"^(\s*#{1,6}\s+.+?)\s*\(([^)]+)\)\s*$",
-            lambda m: m.group(1)
-            if re.search(
-                r"(works today|implemented|planned|selected|current\s+(?:subset|compiler|backend|checker|implementation))",
-                m.group(2),
-                flags=re.I,
-            )
-            else m.group(0),
-            out,
-        )
-        out = re.sub(
-            r"^(\s*#{1,6}\s+)(?:Current\s+|Initial\s+)?Implemented\s+Subset\s*$",
-            r"\1Details",
-            out,
-            flags=re.I,
-        )
-        out = re.sub(r"^(\s*#{1,6}\s+)Implemented\s*$", r"\1Details", out, flags=re.I)
-        out = re.sub(r"^(\s*#{1,6}\s+)Implemented\s+API\b", r"\1API", out, flags=re.I)
-        out = re.sub(r"^(\s*[-*+]\s+)Implemented\s*:\s*", r"\1", out, flags=re.I)
-        out = re.sub(r"^\s*Implemented\s*:\s*", "", out, flags=re.I)
-        out = re.sub(r"^(\s*(?:[-*+]\s+)?)Implemented subset notes:\s*", r"\1Notes: ", out, flags=re.I)
-        out = re.sub(r"^(\s*(?:[-*+]\s+)?)Implemented initial subset:\s*", r"\1Notes: ", out, flags=re.I)
-        out = re.sub(r"^(\s*(?:[-*+]\s+)?)Implemented subset:\s*", r"\1Notes: ", out, flags=re.I)
-        out = re.sub(r"^(\s*(?:[-*+]\s+)?)Implemented runtime areas\b", r"\1Runtime areas", out, flags=re.I)
-        out = re.sub(r"^(\s*(?:[-*+]\s+)?)Implemented as\b", r"\1Designed as", out, flags=re.I)
-        out = re.sub(r"\s*\(\s*Implemented[^)]*\)", "", out, flags=re.I)
-
-        out = re.sub(r"\bcurrently\s+not\b", "not", out, flags=re.I)
-
-        return out
-
-    def rewrite_comment(text: str) -> str:
-        out = text
-        out = re.sub(r"\bwhat works today\b", "supported behavior", out, flags=re.I)
-        out = re.sub(r"\bworks today\b", "Example", out, flags=re.I)
-        out = re.sub(r"\bcurrent\s+(?:subset|support)\b", "", out, flags=re.I)
-        out = re.sub(r"\bcurrently\s+not\b", "not", out, flags=re.I)
-        return out
+STATUS_WORDS = r"(works today|implemented|planned|selected|current\s+(?:subset|compiler|backend|checker|implementation))"
+STATUS_WORDS_RE = re.compile(STATUS_WORDS, flags=re.I)
 
-    out_lines: list[str] = []
-    in_code = False
-    skip_level: int | None = None
-    code_lang: str | None = None
+# Every rewrite below needs one of these words to change anything, so lines
+# without a match skip the rule tables entirely.
+STATUS_TRIGGER = re.compile(r"works today|implemented|current|planned|selected", flags=re.I)
 
-    def drop_proposal_process(md: str) -> str:
-        lines = md.splitlines()
-        out: list[str] = []
-        i = 0
-        while i < len(lines):
-            if re.match(r"^##\s+Silk Proposal Process\b", lines[i], flags=re.I):
-                i += 1
-                while i < len(lines) and not re.match(r"^##\s+", lines[i]):
-                    i += 1
-                continue
-            out.append(lines[i])
-            i += 1
-        return "\n".join(out)
 
-    markdown = drop_proposal_process(markdown)
+@dataclass(frozen=True)
+class RewriteRule:
+    """
+    One declarative rewrite, compiled once at import time.
 
-    for raw in markdown.splitlines():
-        trimmed = raw.lstrip()
+    `headings_only` rules apply only while the text still looks like a heading.
+    """
 
-        if trimmed.startswith("```"):
-            entering = not in_code
-            in_code = not in_code
-            if entering:
-                lang = trimmed[3:].strip().split(maxsplit=1)[0] if trimmed[3:].strip() else ""
-                code_lang = lang.lower() if lang else None
-            else:
-                code_lang = None
-            if skip_level is None:
-                out_lines.append(raw)
-            continue
+    pattern: str
+    repl: str | Callable[[re.Match[str]], str]
+    flags: int = re.I
+    headings_only: bool = False
+    regex: re.Pattern[str] = field(init=False, repr=False, compare=False)
 
-        if not in_code:
-            heading_match = re.match(r"^(#{1,6})\s+(.+?)\s*$", raw)
-            if skip_level is not None and heading_match:
-                level = len(heading_match.group(1))
-                if level <= skip_level:
-                    skip_level = None
+    def __post_init__(self):
+        object.__setattr__(self, "regex", re.compile(self.pattern, self.flags))
 
-            if skip_level is None:
-                status_match = status_heading.match(raw)
-                if status_match:
-                    skip_level = len(status_match.group(1))
-                    continue
 
-        if skip_level is not None:
+def apply_rules(rules: tuple[RewriteRule, ...], text: str) -> str:
+    out = text
+    for rule in rules:
+        if rule.headings_only and not HEADING_LINE.match(out):
             continue
+        out = rule.regex.sub(rule.repl, out)
+    return out
+
+
+def _drop_status_parenthetical(m: re.Match[str]) -> str:
+    return m.group(1) if STATUS_WORDS_RE.search(m.group(2)) else m.group(0)
+
+
+# Rewrites for prose lines, applied in order. Avoids "subset" / "works today"
+# tone in the pack.
+TEXT_REWRITES = (
+    RewriteRule(r"^(\s*#{1,6}\s+)What works today\b", r"\1Supported behavior"),
+    RewriteRule(r"\bwhat works today\b", "supported behavior"),
+    RewriteRule(r"^(\s*#{1,6}\s+)Syntax\s*\(Selected\)\s*$", r"\1Syntax"),
+    RewriteRule(r"\bCurrent limitations\b", "Limitations"),
+    RewriteRule(r"Implemented in", "Defined in", flags=0),
+    RewriteRule(r"\bExamples\s*\(Works today\)\b", "Examples"),
+    RewriteRule(r"\bExample\s*\(Works today\)\s*:", "Example:"),
+    RewriteRule(r"^(\s*#{1,6}\s+)Works today:\s*", r"\1Example: "),
+    RewriteRule(r"^(\s*#{1,6}\s+)Works today\b", r"\1Example"),
+    RewriteRule(r"^(\s*[-*+]\s+)Works today:\s*", r"\1Example: "),
+    RewriteRule(r"^(\s*[-*+]\s+)Works today\b", r"\1Example"),
+    RewriteRule(r"^\s*Works today:\s*", "Example: "),
+    RewriteRule(r"^(\s*)Works today\b", r"\1Example"),
+    RewriteRule(r"\(Works today\)", ""),
+    RewriteRule(
+        r"^(\s*(?:[-*+]\s+)?)in the current (?:compiler/backend|compiler|backend|scalar-slot backend)?\s*subset\b",
+        r"\1In Silk",
+    ),
+    RewriteRule(
+        r"\bin the current (?:compiler/backend|compiler|backend|scalar-slot backend)?\s*subset\b",
+        "in Silk",
+    ),
+    RewriteRule(r"\bthe current compiler/backend subset\b", "the compiler"),
+    RewriteRule(r"\bthe current compiler subset\b", "the compiler"),
+    RewriteRule(r"\bthe current scalar-slot backend subset\b", "the scalar-slot backend"),
+    RewriteRule(r"\bthe current backend subset\b", "the backend"),
+    RewriteRule(r"\bCurrent subset limitation\b", "Limitation"),
+    RewriteRule(r"\bcurrent\s+(?:subset|support)\b", ""),
+    RewriteRule(r"\s*\(\s*current\s+(?:subset|support)[^)]*\)", ""),
+    RewriteRule(r"\s*\([^)]*" + STATUS_WORDS + r"[^)]*\)", "", headings_only=True),
+    RewriteRule(r"^(\s*#{1,6}\s+.+?)\s*\(([^)]+)\)\s*$", _drop_status_parenthetical, flags=0),
+    RewriteRule(r"^(\s*#{1,6}\s+)(?:Current\s+|Initial\s+)?Implemented\s+Subset\s*$", r"\1Details"),
+    RewriteRule(r"^(\s*#{1,6}\s+)Implemented\s*$", r"\1Details"),
+    RewriteRule(r"^(\s*#{1,6}\s+)Implemented\s+API\b", r"\1API"),
+    RewriteRule(r"^(\s*[-*+]\s+)Implemented\s*:\s*", r"\1"),
+    RewriteRule(r"^\s*Implemented\s*:\s*", ""),
+    RewriteRule(r"^(\s*(?:[-*+]\s+)?)Implemented subset notes:\s*", r"\1Notes: "),
+    RewriteRule(r"^(\s*(?:[-*+]\s+)?)Implemented initial subset:\s*", r"\1Notes: "),
+    RewriteRule(r"^(\s*(?:[-*+]\s+)?)Implemented subset:\s*", r"\1Notes: "),
+    RewriteRule(r"^(\s*(?:[-*+]\s+)?)Implemented runtime areas\b", r"\1Runtime areas"),
+    RewriteRule(r"^(\s*(?:[-*+]\s+)?)Implemented as\b", r"\1Designed as"),
+    RewriteRule(r"\s*\(\s*Implemented[^)]*\)", ""),
+    RewriteRule(r"\bcurrently\s+not\b", "not"),
+)
+
+# Rewrites for comment text inside code fences.
+COMMENT_REWRITES = (
+    RewriteRule(r"\bwhat works today\b", "supported behavior"),
+    RewriteRule(r"\bworks today\b", "Example"),
+    RewriteRule(r"\bcurrent\s+(?:subset|support)\b", ""),
+    RewriteRule(r"\bcurrently\s+not\b", "not"),
+)
+
+SLASH_COMMENT_LANGS = {"silk", "slk", "c", "cpp", "cc", "c++", "js", "javascript", "ts", "typescript", "zig"}
+HASH_COMMENT_LANGS = {"bash", "sh", "zsh", "fish", "toml", "yaml", "yml"}
+
+
+def rewrite_text(text: str) -> str:
+    if not STATUS_TRIGGER.search(text):
+        return text
+    return apply_rules(TEXT_REWRITES, text)
+
+
+def rewrite_comment(text: str) -> str:
+    if not STATUS_TRIGGER.search(text):
+        return text
+    return apply_rules(COMMENT_REWRITES, text)
 
-        if not in_code and status_line.match(raw):
-            raw = strip_status_line(raw)
-            if not raw.strip():
-                continue
 
-        if not in_code and drop_line.search(raw):
-            continue
+def sanitize_markdown(markdown: str) -> str:
+    """
+    Create LLM-friendly content:
+    - Drop status/meta framing (Status sections, PLAN/STATUS/README/llms refs).
+    - Avoid "subset"/"works today" tone in prose and comments.
+    - Avoid leaking internal file-path references like docs/... and tests/...
+      outside of code fences (the LLMS pack already includes the full content).
+
+    The structural pass is build-indexes.py's `frame_markdown`, so build-all.py
+    parses each source once for both outputs.
+    """
 
-        if not in_code:
-            line = rewrite_text(raw)
-            out_lines.append(line)
+    out_lines: list[str] = []
+    for raw, code_lang in indexes.frame_markdown(markdown):
+        if code_lang is None:
+            if not DROP_LINE.search(raw):
+                out_lines.append(rewrite_text(raw))
             continue
 
         # In code fences: only rewrite comment text.
+        trimmed = raw.lstrip()
         if trimmed.startswith(("//", "#", "--", "/*", "*")):
             out_lines.append(rewrite_comment(raw))
             continue
 
-        if code_lang in {"silk", "slk", "c", "cpp", "cc", "c++", "js", "javascript", "ts", "typescript", "zig"}:
+        if code_lang in SLASH_COMMENT_LANGS:
             idx = raw.find("//")
             if idx != -1 and (idx == 0 or raw[idx - 1].isspace()):
                 out_lines.append(raw[:idx] + rewrite_comment(raw[idx:]))
                 continue
 
-        if code_lang in {"bash", "sh", "zsh", "fish", "toml", "yaml", "yml"}:
+        if code_lang in HASH_COMMENT_LANGS:
             idx = raw.find("#")
             if idx != -1 and (idx == 0 or raw[idx - 1].isspace()):
                 out_lines.append(raw[:idx] + rewrite_comment(raw[idx:]))
@@ -284,18 +264,39 @@ def sanitize_markdown(markdown: str) -> str:
     return "\n".join(out_lines).rstrip() + "\n"
 
 
-def build_llms_txt(site_root: Path) -> str:
+def iter_llms_lines(
+    site_root: Path,
+    *,
+    items: tuple[list[DocItem], list[DocItem]] | None = None,
+    read: Callable[[Path], str] | None = None,
+    sink: Callable[[DocItem, list[str]], None] | None = None,
+    entry: EntryLoader | None = None,
+    dedupe: ParagraphDedupe | None = None,
+) -> Iterator[str]:
+    """
+    Yield the pack line by line (a document's sanitized body is one entry).
+    `items` (docs, wiki) and `read` default to loading each kind's index.json
+    and reading sources from disk; build-all.py passes its in-memory copies
+    instead. `sink` also receives each document's lines (see `SplitPacks`).
+    `dedupe` replaces wiki paragraphs that repeat a docs paragraph with a
+    cross-reference (see `ParagraphDedupe`). `entry` renders one document
+    (defaults to `entry_lines`; see `EntryCache`).
+    """
+
     docs_root = site_root / "docs"
     wiki_root = site_root / "wiki"
 
-    docs_items = load_items(docs_root, "docs")
-    wiki_items = load_items(wiki_root, "wiki")
-
-    all_items = docs_items + wiki_items
+    if items is None:
+        items = (load_items(docs_root, "docs"), load_items(wiki_root, "wiki"))
+    docs_items, wiki_items = items
+    if read is None:
+        read = read_text
+    if entry is None:
+        entry = entry_lines
 
     generated_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
 
-    header = [
+    yield from [
         "Silk · LLMS Pack",
         "================",
         "",
@@ -313,81 +314,716 @@ def build_llms_txt(site_root: Path) -> str:
         "",
     ]
 
-    toc_lines: list[str] = []
-    toc_lines.append("Silk Docs")
+    yield "Silk Docs"
     current = None
     for item in docs_items:
         if item.section != current:
             current = item.section
-            toc_lines.append(f"- {section_label(current)}")
-        toc_lines.append(f"  - {item.id} — {item.title} — {doc_url(item)}")
+            yield f"- {section_label(current)}"
+        yield f"  - {item.id} — {item.title} — {doc_url(item)}"
 
-    toc_lines.append("")
-    toc_lines.append("Silk Wiki")
+    yield ""
+    yield "Silk Wiki"
     current = None
     for item in wiki_items:
         if item.section != current:
             current = item.section
-            toc_lines.append(f"- {section_label(current)}")
-        toc_lines.append(f"  - {item.id} — {item.title} — {doc_url(item)}")
-
-    body: list[str] = []
-    body.extend(header)
-    body.extend(toc_lines)
-    body.append("")
-    body.append("Content")
-    body.append("-------")
-    body.append("")
-
-    for item in all_items:
+            yield f"- {section_label(current)}"
+        yield f"  - {item.id} — {item.title} — {doc_url(item)}"
+
+    yield ""
+    yield "Content"
+    yield "-------"
+    yield ""
+
+    def load(item: DocItem) -> list[str]:
         source_root = docs_root if item.kind == "docs" else wiki_root
-        source_path = source_root / "source" / item.file
+        return entry(item, source_root / "source" / item.file, read)
+
+    wiki_entries: dict[DocItem, list[str]] = {}
+    if dedupe is not None:
+        for item in wiki_items:
+            wiki_entries[item] = load(item)
+            dedupe.add_wiki(item, wiki_entries[item])
+
+    for item in (*docs_items, *wiki_items):
+        lines = wiki_entries.pop(item, None) or load(item)
+        if dedupe is not None:
+            lines = dedupe(item, lines)
+        if sink is not None:
+            sink(item, lines)
+        yield from lines
+
+
+def entry_lines(item: DocItem, source_path: Path, read: Callable[[Path], str]) -> list[str]:
+    if not source_path.exists():
+        # Keep the pack buildable even if a source file is missing.
+        return [
+            "=" * 78,
+            f"{item.kind.upper()}: {item.title} ({item.id})",
+            f"URL: {doc_url(item)}",
+            "ERROR: source file missing",
+            "=" * 78,
+            "",
+        ]
+
+    content = sanitize_markdown(read(source_path))
+    return [
+        "=" * 78,
+        f"{item.kind.upper()}: {item.title} ({item.id})",
+        f"URL: {doc_url(item)}",
+        "=" * 78,
+        "",
+        content.rstrip(),
+        "",
+    ]
+
+
+EntryLoader = Callable[[DocItem, Path, Callable[[Path], str]], list[str]]
+
+
+@dataclass
+class EntryCache:
+    """
+    `entry_lines` memoized per item and source text, so a long-running caller
+    (build-all.py --watch) only re-sanitizes the documents that changed.
+    """
+
+    entries: dict[DocItem, tuple[str, list[str]]] = field(default_factory=dict)
+
+    def __call__(self, item: DocItem, source_path: Path, read: Callable[[Path], str]) -> list[str]:
         if not source_path.exists():
-            # Keep the pack buildable even if a source file is missing.
-            body.append("=" * 78)
-            body.append(f"{item.kind.upper()}: {item.title} ({item.id})")
-            body.append(f"URL: {doc_url(item)}")
-            body.append("ERROR: source file missing")
-            body.append("=" * 78)
-            body.append("")
+            self.entries.pop(item, None)
+            return entry_lines(item, source_path, read)
+        text = read(source_path)
+        cached = self.entries.get(item)
+        if cached is None or cached[0] != text:
+            cached = (text, entry_lines(item, source_path, lambda _: text))
+            self.entries[item] = cached
+        return cached[1]
+
+
+def iter_blocks(body: list[str]) -> Iterator[list[str]]:
+    """
+    Group body lines into paragraphs: runs ending at a blank line outside a
+    code fence (the blank line included). The last block may lack one.
+    """
+
+    block: list[str] = []
+    in_code = False
+    for line in body:
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+        block.append(line)
+        if in_code or line.strip():
             continue
+        yield block
+        block = []
+    if block:
+        yield block
+
+
+# Paragraph shingles are word 3-grams. A MinHash signature reads the 64-byte
+# blake2b digest of each shingle as MINHASH_PERMUTATIONS 32-bit hashes and
+# keeps the minimum of each; bands of MINHASH_BAND_ROWS rows key the LSH table.
+SHINGLE_WORDS = 3
+MINHASH_PERMUTATIONS = 16
+MINHASH_BAND_ROWS = 2
+MINHASH = struct.Struct(f"<{MINHASH_PERMUTATIONS}I")
+# Shorter paragraphs (headings, one-liners) are never collapsed.
+MIN_SHINGLES = 8
+DEDUPE_THRESHOLD = 0.8
+
+
+@dataclass
+class ParagraphDedupe:
+    """
+    Collapse wiki paragraphs that near-duplicate a docs paragraph.
+
+    `iter_llms_lines` hands over the (much smaller) wiki entries first with
+    `add_wiki`, which puts each paragraph's MinHash signature in an LSH
+    table. Docs entries then stream through `__call__`: a docs paragraph is
+    only signed and looked up if enough of its shingles occur anywhere in the
+    wiki to reach `threshold`, and candidates are confirmed by the exact
+    Jaccard similarity of the shingle sets. Code blocks must match exactly,
+    since a changed token in an example usually matters. When a wiki entry
+    comes through, each run of matched paragraphs becomes one line pointing
+    at the docs pages that keep them (unless that line would be longer).
+    Among equally similar docs paragraphs, the one on the docs page with the
+    wiki page's id wins, then one in the same section, then the first seen.
+    """
+
+    threshold: float = DEDUPE_THRESHOLD
+    wiki: list[tuple[str, int, frozenset[tuple[str, ...]]]] = field(default_factory=list)
+    wiki_shingles: set[tuple[str, ...]] = field(default_factory=set)
+    wiki_code: dict[str, list[tuple[str, int]]] = field(default_factory=dict)
+    wiki_items: dict[str, DocItem] = field(default_factory=dict)
+    bands: dict[tuple[int, tuple[int, ...]], list[int]] = field(default_factory=dict)
+    matches: dict[tuple[str, int], tuple[tuple[float, int], DocItem]] = field(default_factory=dict)
+    collapsed: int = 0
+    saved_bytes: int = 0
+    saved_tokens: int = 0
+
+    def add_wiki(self, item: DocItem, lines: list[str]) -> None:
+        key = doc_key(item)
+        self.wiki_items[key] = item
+        for n, block in enumerate(iter_blocks(entry_body(lines))):
+            text = "\n".join(block).strip()
+            if text.startswith("```"):
+                self.wiki_code.setdefault(text, []).append((key, n))
+                continue
+            shingles = paragraph_shingles(text)
+            if len(shingles) < MIN_SHINGLES:
+                continue
+            self.wiki_shingles |= shingles
+            for band in signature_bands(shingles):
+                self.bands.setdefault(band, []).append(len(self.wiki))
+            self.wiki.append((key, n, shingles))
+
+    def __call__(self, item: DocItem, lines: list[str]) -> list[str]:
+        if item.kind == "docs":
+            for block in iter_blocks(entry_body(lines)):
+                self._match(item, "\n".join(block).strip())
+            return lines
+
+        key = doc_key(item)
+        out: list[str] = []
+        run: list[list[str]] = []
+        sources: dict[str, DocItem] = {}
+        for n, block in enumerate(iter_blocks(entry_body(lines))):
+            match = self.matches.get((key, n))
+            if match is not None:
+                run.append(block)
+                sources.setdefault(doc_key(match[1]), match[1])
+                continue
+            out.extend(self._collapse(run, sources))
+            run, sources = [], {}
+            out.extend(block)
+        out.extend(self._collapse(run, sources))
+        return [*lines[:5], *out]
+
+    def _match(self, item: DocItem, text: str) -> None:
+        if text.startswith("```"):
+            for target in self.wiki_code.get(text, ()):
+                self._offer(target, 1.0, item)
+            return
+        shingles = paragraph_shingles(text)
+        # |A ∩ B| >= threshold * |A| is necessary for Jaccard(A, B) >= threshold.
+        if len(shingles) < MIN_SHINGLES or len(shingles & self.wiki_shingles) < self.threshold * len(shingles):
+            return
+        candidates = {n for band in signature_bands(shingles) for n in self.bands.get(band, ())}
+        for n in sorted(candidates):
+            key, block, other = self.wiki[n]
+            score = len(shingles & other) / len(shingles | other)
+            if score >= self.threshold:
+                self._offer((key, block), score, item)
+
+    def _offer(self, target: tuple[str, int], score: float, item: DocItem) -> None:
+        """Keep `item` as the source of wiki paragraph `target` if it ranks above the current one."""
+
+        wiki = self.wiki_items[target[0]]
+        affinity = 2 if item.id == wiki.id else 1 if item.section == wiki.section else 0
+        best = self.matches.get(target)
+        if best is None or (score, affinity) > best[0]:
+            self.matches[target] = ((score, affinity), item)
+
+    def _collapse(self, run: list[list[str]], sources: dict[str, DocItem]) -> list[str]:
+        dropped = [line for block in run for line in block]
+        if not run:
+            return dropped
+        refs = ", ".join(f"{source.title} ({doc_url(source)})" for source in sources.values())
+        noun = "block" if len(run) == 1 else "blocks"
+        ref = [f"[{len(run)} {noun} omitted, same as the docs: {refs}]", ""]
+        saved = len("\n".join(dropped).encode("utf-8")) - len("\n".join(ref).encode("utf-8"))
+        if saved <= 0:
+            return dropped
+        self.collapsed += len(run)
+        self.saved_bytes += saved
+        self.saved_tokens += estimate_lines(dropped) - estimate_lines(ref)
+        return ref
+
+    def report(self) -> str:
+        return (
+            f"Collapsed {self.collapsed} wiki blocks duplicated in the docs: "
+            f"saved {self.saved_bytes:,} bytes, ~{self.saved_tokens:,} tokens."
+        )
+
+
+def entry_body(lines: list[str]) -> list[str]:
+    """The lines after an entry's 5-line banner (see `entry_lines`), one per line."""
+
+    return "\n".join(lines[5:]).split("\n")
 
-        raw = source_path.read_text(encoding="utf-8")
-        content = sanitize_markdown(raw)
 
-        body.append("=" * 78)
-        body.append(f"{item.kind.upper()}: {item.title} ({item.id})")
-        body.append(f"URL: {doc_url(item)}")
-        body.append("=" * 78)
-        body.append("")
-        body.append(content.rstrip())
-        body.append("")
+# Memoized, like `estimate_tokens`: under build-all.py --watch most paragraphs
+# come back unchanged.
+@functools.lru_cache(maxsize=1 << 16)
+def paragraph_shingles(text: str) -> frozenset[tuple[str, ...]]:
+    words = BM25_TOKEN.findall(text.lower())
+    return frozenset(zip(*(words[i:] for i in range(SHINGLE_WORDS))))
 
-    return "\n".join(body).rstrip() + "\n"
 
+@functools.lru_cache(maxsize=1 << 16)
+def signature_bands(shingles: frozenset[tuple[str, ...]]) -> tuple[tuple[int, tuple[int, ...]], ...]:
+    hashes = (MINHASH.unpack(hashlib.blake2b(" ".join(shingle).encode("utf-8")).digest()) for shingle in shingles)
+    signature = [min(column) for column in zip(*hashes)]
+    rows = MINHASH_BAND_ROWS
+    return tuple((i, tuple(signature[i * rows : (i + 1) * rows])) for i in range(MINHASH_PERMUTATIONS // rows))
 
-def normalize_generated_line(text: str) -> str:
+
+class PackDigest:
     """
-    Normalize only the *header* Generated timestamp so we can avoid rewriting
-    `llms.txt` when content is unchanged.
+    Incremental sha256 of a pack with the *header* `Generated:` timestamp
+    masked, so a rebuild with unchanged content hashes the same.
 
-    Note: we intentionally do not rewrite any later `Generated:` occurrences
-    inside documentation content.
+    Note: later `Generated:` lines inside documentation content are hashed
+    as-is.
     """
 
-    lines = text.splitlines()
-    out: list[str] = []
-    in_header = True
-    replaced = False
-    for line in lines:
-        if in_header and not replaced and line.startswith("Generated: "):
-            out.append("Generated: <preserved>")
-            replaced = True
-            continue
-        out.append(line)
-        if line.strip() == "How to link:":
-            in_header = False
-    return "\n".join(out).rstrip() + "\n"
+    def __init__(self) -> None:
+        self._sha = hashlib.sha256()
+        self._partial = b""
+        self._in_header = True
+        self._masked = False
+
+    def update(self, data: bytes) -> None:
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._line(line + b"\n")
+
+    def _line(self, line: bytes) -> None:
+        if self._in_header:
+            if not self._masked and line.startswith(b"Generated: "):
+                line = b"Generated: <preserved>\n"
+                self._masked = True
+            elif line.strip() == b"How to link:":
+                self._in_header = False
+        self._sha.update(line)
+
+    def hexdigest(self) -> str:
+        if self._partial:
+            self._line(self._partial)
+            self._partial = b""
+        return self._sha.hexdigest()
+
+
+def file_digest(path: Path, block_size: int = 1 << 16) -> str | None:
+    try:
+        f = path.open("rb")
+    except FileNotFoundError:
+        return None
+    digest = PackDigest()
+    with f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PackWriter:
+    """
+    Stream lines to `<path>.tmp` as `"\n".join(lines).rstrip() + "\n"` would
+    render them, hashing as it goes. `close` moves the file into place only if
+    its digest differs from the existing one (ignoring the header timestamp).
+    With `count` set, `tokens` tracks the estimated size of what was written.
+
+    `entries` collects the byte span of each document for the pack's
+    `.idx.json` sidecar (see `mark`).
+    """
+
+    def __init__(self, path: Path, *, count: bool = True) -> None:
+        self.path = path
+        self.tmp = path.with_name(path.name + ".tmp")
+        self.count = count
+        self.tokens = 0
+        self.size = 0
+        self.entries: dict[str, dict] = {}
+        self._digest = PackDigest()
+        self._pending = ""
+        self._first = True
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.tmp.open("wb")
+
+    def write(self, lines: Iterable[str], *, tokens: int | None = None) -> None:
+        """Append `lines`; `tokens` is their precomputed `estimate_lines` count."""
+
+        counted = 0
+        for line in lines:
+            if tokens is None and self.count:
+                counted += estimate_tokens(line) + 1
+            # Trailing whitespace is held back until more content follows it.
+            piece = line if self._first else "\n" + line
+            self._first = False
+            body = piece.rstrip()
+            if body:
+                self._emit(self._pending + body)
+                self._pending = piece[len(body) :]
+            else:
+                self._pending += piece
+        self.tokens += counted if tokens is None else tokens
+
+    def _emit(self, text: str) -> None:
+        data = text.encode("utf-8")
+        self._file.write(data)
+        self._digest.update(data)
+        self.size += len(data)
+
+    def mark(self, key: str, lines: list[str]) -> None:
+        """
+        Record where `lines`, written next, will land: the entry starts at its
+        banner and ends at its last non-blank character. `lines[0]` must not
+        be blank.
+        """
+
+        body = "\n".join(lines).rstrip().encode("utf-8")
+        offset = self.size + len(self._pending.encode("utf-8")) + (0 if self._first else 1)
+        self.entries[key] = {
+            "offset": offset,
+            "length": len(body),
+            "sha256": hashlib.sha256(body).hexdigest(),
+        }
+
+    @property
+    def index_path(self) -> Path:
+        return self.path.with_name(self.path.stem + ".idx.json")
+
+    def write_index(self) -> bool:
+        """Write `<stem>.idx.json`, mapping document ids to their byte spans."""
+
+        return write_json_if_changed(self.index_path, {"pack": self.path.name, "docs": self.entries})
+
+    def close(self) -> bool:
+        """Finish the file and return whether `path` changed."""
+
+        self._emit("\n")
+        self._file.close()
+        changed = self._digest.hexdigest() != file_digest(self.path)
+        if changed:
+            os.replace(self.tmp, self.path)
+        else:
+            self.tmp.unlink()
+        return changed
+
+    def abort(self) -> None:
+        self._file.close()
+        self.tmp.unlink(missing_ok=True)
+
+
+def sync_siblings(path: Path, *, changed: bool, compress: bool) -> list[Path]:
+    if compress:
+        return siblings.write_compressed_siblings(path, changed=changed)
+    return siblings.drop_compressed_siblings(path) if changed else []
+
+
+def write_pack(
+    out_path: Path,
+    lines: Iterable[str],
+    *,
+    split: SplitPacks | None = None,
+    compress: bool = True,
+) -> list[Path]:
+    """
+    Stream the pack to disk (see `PackWriter`) and sync its compressed
+    siblings, then finish `split` (the `sink` that produced `lines`), if any.
+    Returns every path written or removed.
+    """
+
+    writer = PackWriter(out_path, count=split is not None)
+    if split is not None:
+        split.pack = writer
+    try:
+        writer.write(lines)
+    except BaseException:
+        writer.abort()
+        if split is not None:
+            split.abort()
+        raise
+    changed = writer.close()
+    written = [out_path] if changed else []
+    written.extend(sync_siblings(out_path, changed=changed, compress=compress))
+    if split is not None:
+        written.extend(split.close())
+    return written
+
+
+# Rough stand-in for a BPE tokenizer, so budgets need no model files or
+# network: letters cost one token per 5 characters, digits go in threes,
+# punctuation in pairs, and each line break run and indentation run costs one.
+# It errs high on code-heavy pages, which keeps chunks inside the budget.
+TOKEN_PIECE = re.compile(r"[^\W\d_]+|\d{1,3}|\n+|[ \t]{2,}|[^\w\s]{1,2}|_")
+TOKEN_ESTIMATOR = "pieces-v1"
+DEFAULT_CHUNK_TOKENS = 32_000
+
+
+# Memoized: the monolithic pack and the split packs estimate the same lines,
+# and build-all.py --watch hands unchanged entries back between builds.
+@functools.lru_cache(maxsize=1 << 16)
+def estimate_tokens(text: str) -> int:
+    tokens = 0
+    for piece in TOKEN_PIECE.findall(text):
+        tokens += 1 + (len(piece) - 1) // 5 if piece[0].isalpha() else 1
+    return tokens
+
+
+def estimate_lines(lines: Iterable[str]) -> int:
+    return sum(estimate_tokens(line) + 1 for line in lines)
+
+
+def split_header(title: str, note: str) -> list[str]:
+    return [
+        title,
+        "=" * len(title),
+        "",
+        note,
+        "",
+        "How to link:",
+        "- Docs: /silk/docs/?p=<id>",
+        "- Wiki: /silk/wiki/?p=<id>",
+        "",
+    ]
+
+
+# Retrieval statistics for `llms_bm25.py`. Terms are lowercased `\w+` runs,
+# the same split the viewer's search index uses.
+BM25_TOKEN = re.compile(r"\w+")
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+@dataclass
+class Bm25Stats:
+    """
+    Per-document term counts of a pack, stored as an inverted index: each
+    term maps to a `"n,tf;n,tf"` posting string (document position in `docs`,
+    term frequency), so a term's document frequency is its posting count and
+    a query only has to decode the postings of its own terms.
+    """
+
+    docs: list[str] = field(default_factory=list)
+    lengths: list[int] = field(default_factory=list)
+    postings: dict[str, list[str]] = field(default_factory=dict)
+
+    def add(self, key: str, lines: list[str]) -> None:
+        counts = bm25_term_counts(tuple(lines))
+        n = len(self.docs)
+        self.docs.append(key)
+        self.lengths.append(sum(counts.values()))
+        for term, tf in counts.items():
+            self.postings.setdefault(term, []).append(f"{n},{tf}")
+
+    def payload(self, pack: PackWriter) -> dict:
+        return {
+            "version": 1,
+            "pack": pack.path.name,
+            "index": pack.index_path.name,
+            "tokenizer": BM25_TOKEN.pattern,
+            "k1": BM25_K1,
+            "b": BM25_B,
+            "avgLength": round(sum(self.lengths) / len(self.lengths), 3) if self.lengths else 0.0,
+            "docs": self.docs,
+            "lengths": self.lengths,
+            "terms": {term: ";".join(self.postings[term]) for term in sorted(self.postings)},
+        }
+
+
+# Memoized: build-all.py --watch hands unchanged entries back between builds.
+@functools.lru_cache(maxsize=1 << 12)
+def bm25_term_counts(lines: tuple[str, ...]) -> Counter[str]:
+    return Counter(BM25_TOKEN.findall("\n".join(lines).lower()))
+
+
+@dataclass
+class SplitPacks:
+    """
+    Sink for `iter_llms_lines` that writes, next to the monolithic pack:
+
+    - `llms-<section>.txt`: every document of one section;
+    - `llms-chunks/NNN.txt`: the pack cut into consecutive chunks of at most
+      `budget` estimated tokens (a document larger than the budget is split at
+      blank lines outside code fences);
+    - `llms-manifest.json`: each file's document ids and token estimate;
+    - `<stem>.idx.json` for the monolithic and section packs: each document's
+      byte offset, length and sha256, for Range requests or mmap;
+    - `llms.bm25.json`: BM25 statistics of the monolithic pack's documents
+      (see `Bm25Stats`).
+
+    `write_pack` attaches the monolithic pack's writer as `pack`. The sink
+    runs before a document's lines are yielded, so `pack` has written
+    everything before them and can `mark` where they start.
+    """
+
+    root: Path
+    budget: int = DEFAULT_CHUNK_TOKENS
+    compress: bool = True
+    sections: dict[str, PackWriter] = field(default_factory=dict)
+    pack: PackWriter | None = None
+    chunks: list[dict] = field(default_factory=list)
+    chunk: PackWriter | None = None
+    finished: list[tuple[Path, bool]] = field(default_factory=list)
+    bm25: Bm25Stats = field(default_factory=Bm25Stats)
+
+    @property
+    def chunk_root(self) -> Path:
+        return self.root / "llms-chunks"
+
+    def __call__(self, item: DocItem, lines: list[str]) -> None:
+        tokens = estimate_lines(lines)
+        key = doc_key(item)
+        if self.pack is not None:
+            self.pack.mark(key, lines)
+        self.bm25.add(key, lines)
+
+        writer = self.sections.get(item.section)
+        if writer is None:
+            writer = PackWriter(self.root / f"llms-{item.section}.txt")
+            writer.write(
+                split_header(
+                    f"Silk · LLMS Pack · {section_label(item.section)}",
+                    f"The {section_label(item.section)} section of the full pack at /silk/llms.txt.",
+                )
+            )
+            self.sections[item.section] = writer
+        writer.mark(key, lines)
+        writer.write(lines, tokens=tokens)
+
+        # Every chunk opens with a header, so a part only gets what is left of
+        # the budget after it.
+        room = self.budget - estimate_lines(self._chunk_header(len(self.chunks) + 1))
+        parts = [(lines, tokens)] if tokens <= room else split_entry(lines, room)
+        for part, part_tokens in parts:
+            if self.chunk is None or (self.chunks[-1]["docs"] and self.chunk.tokens + part_tokens > self.budget):
+                self._next_chunk()
+            assert self.chunk is not None
+            self.chunk.write(part, tokens=part_tokens)
+            docs = self.chunks[-1]["docs"]
+            if not docs or docs[-1] != key:
+                docs.append(key)
+
+    def _next_chunk(self) -> None:
+        self._finish_chunk()
+        number = len(self.chunks) + 1
+        self.chunk = PackWriter(self.chunk_root / f"{number:03d}.txt")
+        self.chunk.write(self._chunk_header(number))
+        self.chunks.append({"file": f"llms-chunks/{self.chunk.path.name}", "docs": [], "tokens": 0})
+
+    def _chunk_header(self, number: int) -> list[str]:
+        return split_header(
+            f"Silk · LLMS Pack · Chunk {number}",
+            "Consecutive slice of the full pack at /silk/llms.txt; see llms-manifest.json for the others.",
+        )
+
+    def _finish_chunk(self) -> None:
+        if self.chunk is not None:
+            self.chunks[-1]["tokens"] = self.chunk.tokens
+            self.finished.append((self.chunk.path, self.chunk.close()))
+            self.chunk = None
+
+    def abort(self) -> None:
+        for writer in [*self.sections.values(), *([self.chunk] if self.chunk else [])]:
+            writer.abort()
+
+    def close(self) -> list[Path]:
+        """
+        Finish every file, drop stale ones and write the manifest and indexes.
+        Call after the monolithic pack is closed.
+        """
+
+        assert self.pack is not None
+        self._finish_chunk()
+        self.finished.append((self.pack.index_path, self.pack.write_index()))
+        sections = []
+        for name, writer in self.sections.items():
+            sections.append(
+                {
+                    "section": name,
+                    "file": writer.path.name,
+                    "index": writer.index_path.name,
+                    "docs": list(writer.entries),
+                    "tokens": writer.tokens,
+                }
+            )
+            self.finished.append((writer.path, writer.close()))
+            self.finished.append((writer.index_path, writer.write_index()))
+
+        manifest = {
+            "generatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "estimator": TOKEN_ESTIMATOR,
+            "budget": self.budget,
+            "pack": {"file": self.pack.path.name, "index": self.pack.index_path.name, "tokens": self.pack.tokens},
+            "sections": sections,
+            "chunks": self.chunks,
+        }
+        manifest_path = self.root / "llms-manifest.json"
+        self.finished.append((manifest_path, write_json_if_changed(manifest_path, manifest)))
+        bm25_path = self.root / "llms.bm25.json"
+        self.finished.append((bm25_path, write_json_if_changed(bm25_path, self.bm25.payload(self.pack), compact=True)))
+
+        written: list[Path] = []
+        for path, changed in self.finished:
+            if changed:
+                written.append(path)
+            written.extend(sync_siblings(path, changed=changed, compress=self.compress))
+
+        keep = {path.name for path, _ in self.finished}
+        stale = [
+            *self.root.glob("llms-*.txt*"),
+            *self.root.glob("llms-*.idx.json*"),
+            *self.chunk_root.glob("*.txt*"),
+        ]
+        for path in sorted(stale):
+            if path.name.removesuffix(siblings.GZIP_SUFFIX).removesuffix(siblings.BROTLI_SUFFIX) not in keep:
+                path.unlink()
+                written.append(path)
+        return written
+
+
+def split_entry(lines: list[str], budget: int) -> list[tuple[list[str], int]]:
+    """
+    Cut an entry larger than `budget` at blank lines outside code fences.
+    Each part repeats the entry's banner with a `(part i/n)` suffix; a single
+    block larger than the budget is kept whole.
+    """
+
+    banner, body = lines[:5], entry_body(lines)
+    # Reserve the banner as it reads once the `(part i/n)` suffix is added.
+    widest = [*banner]
+    widest[1] = f"{banner[1]} (part 999/999)"
+    room = max(budget - estimate_lines(widest), 1)
+
+    parts: list[list[str]] = [[]]
+    used = 0
+    for block in iter_blocks([*body, ""]):
+        tokens = estimate_lines(block)
+        if parts[-1] and used + tokens > room:
+            parts.append([])
+            used = 0
+        parts[-1].extend(block)
+        used += tokens
+
+    out = []
+    for n, part in enumerate(parts, start=1):
+        head = [*banner]
+        head[1] = f"{banner[1]} (part {n}/{len(parts)})"
+        part_lines = head + part
+        out.append((part_lines, estimate_lines(part_lines)))
+    return out
+
+
+def write_json_if_changed(path: Path, payload: dict, *, compact: bool = False) -> bool:
+    """Write `payload` unless it only differs from the existing file in `generatedAt`."""
+
+    try:
+        existing = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        existing = None
+    if isinstance(existing, dict) and {**existing, "generatedAt": None} == {**payload, "generatedAt": None}:
+        return False
+    if compact:
+        text = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    else:
+        text = json.dumps(payload, indent=2)
+    path.write_text(text + "\n", encoding="utf-8")
+    return True
 
 
 def main() -> None:
@@ -398,21 +1034,44 @@ def main() -> None:
         default=None,
         help="Output path (defaults to website/silk/llms.txt).",
     )
+    parser.add_argument(
+        "--no-compress",
+        action="store_true",
+        help="Skip the precompressed .gz/.br siblings (siblings of a rewritten pack are removed).",
+    )
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=DEFAULT_CHUNK_TOKENS,
+        help=f"Estimated token budget per llms-chunks/ file (default {DEFAULT_CHUNK_TOKENS}).",
+    )
+    parser.add_argument(
+        "--no-split",
+        action="store_true",
+        help="Only write llms.txt (skip the section packs, chunks and llms-manifest.json).",
+    )
+    parser.add_argument(
+        "--no-dedupe",
+        action="store_true",
+        help="Keep wiki paragraphs that repeat a docs paragraph instead of cross-referencing them.",
+    )
     args = parser.parse_args()
 
     repo_root = Path(__file__).resolve().parents[3]
     site_root = repo_root / "website" / "silk"
     out_path: Path = args.output if args.output is not None else (site_root / "llms.txt")
 
-    next_text = build_llms_txt(site_root)
-    prev_text = out_path.read_text(encoding="utf-8") if out_path.exists() else None
-
-    if prev_text is not None and normalize_generated_line(prev_text) == normalize_generated_line(next_text):
+    compress = not args.no_compress
+    split = None if args.no_split else SplitPacks(out_path.parent, budget=args.chunk_tokens, compress=compress)
+    dedupe = None if args.no_dedupe else ParagraphDedupe()
+    lines = iter_llms_lines(site_root, sink=split, dedupe=dedupe)
+    written = write_pack(out_path, lines, split=split, compress=compress)
+    if out_path not in written:
         print(f"Unchanged: {out_path}")
-        return
-
-    out_path.write_text(next_text, encoding="utf-8")
-    print(f"Wrote: {out_path}")
+    for path in written:
+        print(f"Wrote: {path}")
+    if dedupe is not None:
+        print(dedupe.report())
 
 
 if __name__ == "__main__":
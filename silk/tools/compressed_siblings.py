@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import gzip
+import shutil
+import subprocess
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+
+GZIP_SUFFIX = ".gz"
+BROTLI_SUFFIX = ".br"
+COMPRESSED_SUFFIXES = (GZIP_SUFFIX, BROTLI_SUFFIX)
+
+
+@dataclass(frozen=True)
+class Codec:
+    suffix: str
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+    # What `decompress` raises on a corrupt or truncated sibling.
+    errors: tuple[type[Exception], ...] = ()
+
+
+def gzip_codec() -> Codec:
+    # mtime=0 keeps the output byte-stable across rebuilds.
+    return Codec(
+        GZIP_SUFFIX,
+        lambda data: gzip.compress(data, compresslevel=9, mtime=0),
+        gzip.decompress,
+        (EOFError, zlib.error),
+    )
+
+
+def brotli_codec() -> Codec | None:
+    """
+    Prefer the `brotli` Python module, fall back to the `brotli` CLI, and
+    return None when neither is available.
+    """
+
+    try:
+        import brotli  # type: ignore[import-not-found]
+    except ImportError:
+        brotli = None
+    if brotli is not None:
+        return Codec(
+            BROTLI_SUFFIX,
+            lambda data: brotli.compress(data, quality=11),
+            brotli.decompress,
+            (brotli.error,),
+        )
+
+    exe = shutil.which("brotli")
+    if exe is None:
+        return None
+
+    def run(args: list[str], data: bytes) -> bytes:
+        return subprocess.run([exe, *args], input=data, capture_output=True, check=True).stdout
+
+    return Codec(
+        BROTLI_SUFFIX,
+        lambda data: run(["-c", "-q", "11", "-"], data),
+        lambda data: run(["-d", "-c", "-"], data),
+        (subprocess.CalledProcessError,),
+    )
+
+
+def write_compressed_siblings(path: Path, *, changed: bool) -> list[Path]:
+    """
+    Keep `<path>.gz` (and `<path>.br` when an encoder is available) in sync
+    with `path`.
+
+    A sibling is rewritten only when it is missing or, after the artifact
+    changed, no longer decompresses to the artifact's bytes; an unchanged
+    artifact's existing siblings are not decompressed at all. Without a brotli
+    encoder a `.br` sibling can't be refreshed, so it is removed when the
+    artifact changed rather than left serving stale content.
+    """
+
+    data: bytes | None = None
+    codecs = [gzip_codec()]
+    br = brotli_codec()
+    if br is not None:
+        codecs.append(br)
+
+    written: list[Path] = []
+    for codec in codecs:
+        sibling = path.with_name(path.name + codec.suffix)
+        exists = sibling.exists()
+        if exists and not changed:
+            continue
+        if data is None:
+            data = path.read_bytes()
+        if exists:
+            try:
+                if codec.decompress(sibling.read_bytes()) == data:
+                    continue
+            except (OSError, *codec.errors):
+                pass
+        sibling.write_bytes(codec.compress(data))
+        written.append(sibling)
+
+    if br is None and changed:
+        stale = path.with_name(path.name + BROTLI_SUFFIX)
+        if stale.exists():
+            stale.unlink()
+            written.append(stale)
+    return written
+
+
+def drop_compressed_siblings(path: Path) -> list[Path]:
+    removed = []
+    for suffix in COMPRESSED_SUFFIXES:
+        sibling = path.with_name(path.name + suffix)
+        if sibling.exists():
+            sibling.unlink()
+            removed.append(sibling)
+    return removed
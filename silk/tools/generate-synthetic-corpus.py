@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+
+GENERATOR_VERSION = 1
+
+# Pages per section in silk/docs/source and silk/wiki/source ("overview" is the
+# top-level start.md). `--scale N` multiplies these counts.
+DOCS_SECTIONS = {
+    "overview": 1,
+    "compiler": 15,
+    "guides": 8,
+    "language": 56,
+    "man": 18,
+    "spec": 1,
+    "std": 61,
+    "usage": 10,
+}
+WIKI_SECTIONS = {
+    "overview": 1,
+    "language": 49,
+    "std": 34,
+}
+
+# Page sizes are log-normal around the real corpus' median (bytes).
+PAGE_MEDIAN = {"docs": 4000, "wiki": 770}
+PAGE_SIGMA = {"docs": 0.9, "wiki": 0.6}
+PAGE_MAX = 200_000
+
+# The docs mostly fence Silk, then plain blocks, shell and the odd TypeScript.
+FENCE_LANGS = {"silk": 60, "": 20, "bash": 12, "ts": 8}
+
+WORDS = (
+    "allocator arena array borrow buffer byte call capacity channel checker compiler const context "
+    "default document element enum error export field function generic handle import index input "
+    "integer interface iterator layout length lifetime linker module mutable option output owner "
+    "package parser pointer range reference region result runtime scalar scope signature slice slot "
+    "source stream string struct target task thread token trait type value vector view width"
+).split()
+VERBS = "accepts allocates borrows checks copies defines emits lowers moves owns parses resolves returns stores".split()
+TYPES = "i32 i64 u8 u64 f64 bool string usize".split()
+
+# Phrases the index and pack sanitizers rewrite or drop, so their rules get exercised.
+STATUS_LABELS = (
+    "Implemented subset + design",
+    "Initial implementation + design",
+    "Planned",
+    "Design draft",
+)
+STATUS_PHRASES = (
+    "This works today in the current compiler subset.",
+    "Implemented in `compiler/src/{word}.zig`.",
+    "See `docs/{section}/{word}.md` for details.",
+    "In the current subset, `{word}` values are scalar-slot backed.",
+    "The remaining {word} rules are planned (Planned).",
+    "Tracked in STATUS.md.",
+)
+SECTION_HEADINGS = (
+    "Overview",
+    "Syntax (Selected)",
+    "What works today",
+    "Current limitations",
+    "Examples (Works today)",
+    "Semantics",
+    "Errors",
+    "Notes",
+)
+
+
+def page_rng(seed: int, *parts: object) -> random.Random:
+    """
+    An RNG for one page. String seeds are hashed (SHA-512) by `random`, so a
+    page's text depends only on the seed and its position, never on how many
+    pages come before or after it.
+    """
+
+    return random.Random(":".join(str(part) for part in (GENERATOR_VERSION, seed, *parts)))
+
+
+@dataclass
+class TextGenerator:
+    rng: random.Random
+
+    def word(self) -> str:
+        return self.rng.choice(WORDS)
+
+    def ident(self) -> str:
+        return "_".join(self.word() for _ in range(self.rng.randint(1, 2)))
+
+    def title(self) -> str:
+        return " ".join(self.word() for _ in range(self.rng.randint(1, 3))).capitalize()
+
+    def sentence(self, section: str) -> str:
+        words = [self.word() for _ in range(self.rng.randint(6, 18))]
+        roll = self.rng.random()
+        if roll < 0.25:
+            words[self.rng.randrange(len(words))] = f"`{self.ident()}`"
+        elif roll < 0.35:
+            words[self.rng.randrange(len(words))] = f"**{self.word()}**"
+        words.insert(self.rng.randint(1, len(words) - 1), self.rng.choice(VERBS))
+        text = " ".join(words)
+        text = text[0].upper() + text[1:] + "."
+        if self.rng.random() < 0.12:
+            text += " " + self.rng.choice(STATUS_PHRASES).format(word=self.word(), section=section)
+        return text
+
+    def paragraph(self, section: str) -> list[str]:
+        text = " ".join(self.sentence(section) for _ in range(self.rng.randint(1, 5)))
+        return wrap(text)
+
+    def bullets(self, section: str) -> list[str]:
+        lines: list[str] = []
+        for _ in range(self.rng.randint(2, 7)):
+            lines.append(f"- {self.sentence(section)}")
+            if self.rng.random() < 0.2:
+                lines.extend(f"  - `{self.ident()}` {self.rng.choice(VERBS)} a {self.word()}" for _ in range(2))
+        return lines
+
+    def table(self) -> list[str]:
+        columns = self.rng.randint(2, 4)
+        header = [self.word().capitalize() for _ in range(columns)]
+        lines = ["| " + " | ".join(header) + " |", "|" + "|".join("---" for _ in header) + "|"]
+        for _ in range(self.rng.randint(2, 8)):
+            cells = [f"`{self.ident()}`", *(self.word() for _ in range(columns - 1))]
+            lines.append("| " + " | ".join(cells) + " |")
+        return lines
+
+    def comment(self, section: str) -> list[str]:
+        if self.rng.random() < 0.5:
+            return [f"<!-- {self.sentence(section)} -->"]
+        return ["<!--", *self.paragraph(section), "-->"]
+
+    def code(self) -> list[str]:
+        lang = self.rng.choices(list(FENCE_LANGS), weights=list(FENCE_LANGS.values()))[0]
+        body = {"silk": self.silk_code, "bash": self.bash_code, "ts": self.ts_code, "": self.plain_code}[lang]()
+        return [f"```{lang}", *body, "```"]
+
+    def silk_code(self) -> list[str]:
+        name = self.ident()
+        params = ", ".join(f"{self.word()}: {self.rng.choice(TYPES)}" for _ in range(self.rng.randint(0, 3)))
+        lines = [f"fn {name}({params}) -> {self.rng.choice(TYPES)} {{"]
+        for _ in range(self.rng.randint(1, 8)):
+            if self.rng.random() < 0.2:
+                lines.append(f"    // {self.rng.choice(('works today', 'current subset', self.word()))}: {self.word()}")
+            lines.append(f"    let {self.word()} = {self.ident()}({self.word()});")
+        lines.append(f"    return {self.word()};")
+        lines.append("}")
+        return lines
+
+    def bash_code(self) -> list[str]:
+        lines = []
+        for _ in range(self.rng.randint(1, 4)):
+            line = f"silk {self.rng.choice(('build', 'test', 'run', 'fmt'))} {self.word()}.slk"
+            if self.rng.random() < 0.3:
+                line += f"  # {self.word()} {self.word()}"
+            lines.append(line)
+        return lines
+
+    def ts_code(self) -> list[str]:
+        name = self.ident()
+        return [
+            f"import {{ {name} }} from 'oro:{self.word()}'",
+            "",
+            f"// {self.word()} {self.word()}",
+            f"const {self.word()} = await {name}({{ {self.word()}: {self.rng.randint(0, 99)} }})",
+        ]
+
+    def plain_code(self) -> list[str]:
+        return [" ".join(self.word() for _ in range(self.rng.randint(2, 8))) for _ in range(self.rng.randint(1, 5))]
+
+
+def wrap(text: str, width: int = 88) -> list[str]:
+    lines: list[str] = []
+    line = ""
+    for word in text.split(" "):
+        if line and len(line) + 1 + len(word) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+
+def page_title(gen: TextGenerator, section: str) -> str:
+    if section == "std":
+        return f"`std::{gen.ident()}`"
+    if section == "man":
+        return f"`silk-{gen.word()}` ({gen.rng.choice((1, 5, 7))}) — {gen.title()}"
+    return gen.title()
+
+
+def page_markdown(gen: TextGenerator, kind: str, section: str) -> str:
+    """One page: a title, an optional Status line, then `##` sections of mixed blocks up to a sampled size."""
+
+    target = min(PAGE_MAX, int(gen.rng.lognormvariate(0, PAGE_SIGMA[kind]) * PAGE_MEDIAN[kind]))
+    lines = [f"# {page_title(gen, section)}", ""]
+    if kind == "docs" and gen.rng.random() < 0.5:
+        lines.extend([f"Status: **{gen.rng.choice(STATUS_LABELS)}**. {gen.sentence(section)}", ""])
+    lines.extend([*gen.paragraph(section), ""])
+
+    size = sum(len(line) + 1 for line in lines)
+    while size < target:
+        heading = gen.rng.choice(SECTION_HEADINGS) if gen.rng.random() < 0.4 else gen.title()
+        block = [f"## {heading}", ""]
+        for _ in range(gen.rng.randint(1, 5)):
+            make = gen.rng.choices(
+                (gen.paragraph, gen.bullets, gen.code, gen.table, gen.comment, None),
+                weights=(40, 25, 20, 5, 3, 7),
+            )[0]
+            if make is None:
+                block.extend([f"### {gen.title()}", ""])
+            elif make in (gen.code, gen.table):
+                block.extend([*make(), ""])
+            else:
+                block.extend([*make(section), ""])
+        lines.extend(block)
+        size += sum(len(line) + 1 for line in block)
+
+    if section == "spec" and gen.rng.random() < 0.5:
+        lines.extend(["## Silk Proposal Process", "", *gen.paragraph(section), ""])
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def section_weights(kind: str) -> dict[str, int]:
+    return DOCS_SECTIONS if kind == "docs" else WIKI_SECTIONS
+
+
+def iter_pages(kind: str, *, seed: int, scale: int = 1) -> Iterator[tuple[str, str]]:
+    """
+    Yield `(rel, markdown)` for every page of one kind: `scale` times the real
+    number of pages per section, each named `<words>-<n>.md` (the overview
+    pages are `start.md`, `start-2.md`, ...).
+    """
+
+    for section, count in section_weights(kind).items():
+        for n in range(1, count * scale + 1):
+            gen = TextGenerator(page_rng(seed, kind, section, n))
+            if section == "overview":
+                rel = "start.md" if n == 1 else f"start-{n}.md"
+            else:
+                rel = f"{section}/{gen.word()}-{gen.word()}-{n}.md"
+            yield rel, page_markdown(gen, kind, section)
+
+
+def write_corpus(
+    dest: Path,
+    *,
+    seed: int,
+    scale: int = 1,
+    kinds: tuple[str, ...] = ("docs", "wiki"),
+) -> dict[str, dict]:
+    """Write `<dest>/<kind>/source/...` for each kind and return per-kind file and byte counts."""
+
+    stats: dict[str, dict] = {}
+    for kind in kinds:
+        source_root = dest / kind / "source"
+        if source_root.exists():
+            shutil.rmtree(source_root)
+        files = size = 0
+        for rel, text in iter_pages(kind, seed=seed, scale=scale):
+            path = source_root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            data = text.encode("utf-8")
+            path.write_bytes(data)
+            files += 1
+            size += len(data)
+        stats[kind] = {"files": files, "bytes": size}
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate a seeded, deterministic markdown tree shaped like the Silk docs + wiki sources."
+    )
+    parser.add_argument("dest", type=Path, help="Output directory (gets docs/source and wiki/source).")
+    parser.add_argument("--seed", type=int, default=1, help="Same seed, same bytes (default: 1).")
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=1,
+        help="Multiply the real corpus' page count per section (default: 1).",
+    )
+    args = parser.parse_args()
+    if args.scale < 1:
+        parser.error("--scale must be at least 1")
+
+    stats = write_corpus(args.dest, seed=args.seed, scale=args.scale)
+    for kind, counts in stats.items():
+        print(f"{kind}: {counts['files']} files, {counts['bytes'] / 1e6:.1f} MB -> {args.dest / kind / 'source'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import mimetypes
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable
+from urllib.parse import unquote, urlsplit
+
+from tool_loader import load_tool
+
+
+TOOLS_ROOT = Path(__file__).resolve().parent
+
+
+build_all = load_tool("build-all")
+indexes = build_all.indexes
+llms = build_all.llms
+
+mimetypes.add_type("text/markdown", ".md")
+
+
+@dataclass(frozen=True)
+class Resource:
+    body: bytes
+    etag: str
+    content_type: str
+
+
+def json_resource(payload: dict, *, compact: bool = False) -> Resource:
+    """
+    Serialize `payload` the way build-indexes.py writes it. The ETag is the
+    content digest without `generatedAt`, so re-rendering unchanged content
+    yields the same tag (see `Preview.cached`).
+    """
+
+    digest = indexes.content_digest(payload, exclude=("generatedAt",))
+    body = indexes.dump_json(indexes.stamp_content_digest(payload, digest), compact=compact)
+    return Resource(body.encode("utf-8"), f'"{digest[:32]}"', "application/json; charset=utf-8")
+
+
+def bytes_resource(body: bytes, content_type: str) -> Resource:
+    return Resource(body, f'"{hashlib.sha256(body).hexdigest()[:32]}"', content_type)
+
+
+def content_type(path: Path) -> str:
+    kind = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    if kind.startswith("text/") or kind in ("application/json", "application/javascript"):
+        kind += "; charset=utf-8"
+    return kind
+
+
+def now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+@dataclass
+class Preview:
+    """
+    The site's generated artifacts, kept in memory and brought up to date on
+    request.
+
+    Every request for a generated file or a markdown source first compares
+    source sizes and mtimes against the previous request; changed documents
+    are re-derived (see `SiteBuild.refresh`). Responses are rendered lazily
+    and memoized on the items they depend on, so an edit only re-renders
+    what it touched: index.json, the affected section's search shard and the
+    shard manifest. search.json and llms.txt are rebuilt the next time they
+    are asked for.
+    """
+
+    build: build_all.SiteBuild
+    web_root: Path
+    compact: bool = False
+    dedupe: bool = True
+    watcher: build_all.PollingWatcher | None = None
+    memo: dict[str, tuple[object, Resource]] = field(default_factory=dict)
+    shards: dict[tuple[str, str], tuple[tuple, dict, dict]] = field(default_factory=dict)
+    statics: dict[Path, tuple[tuple[int, int], Resource]] = field(default_factory=dict)
+    build_info: dict[str, dict] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def site_url(self) -> str:
+        return f"/{self.build.site_root.relative_to(self.web_root).as_posix()}/"
+
+    def start(self) -> None:
+        for kind in self.build.kinds:
+            self.build.collect(kind)
+        self.watcher = build_all.PollingWatcher([kind.source_root for kind in self.build.kinds])
+        self.refresh_build_info()
+
+    def refresh(self) -> None:
+        assert self.watcher is not None
+        changed = self.watcher.wait(0)
+        if changed:
+            for kind in self.build.kinds:
+                self.build.refresh(kind, changed)
+            self.refresh_build_info()
+
+    def refresh_build_info(self) -> None:
+        """Take each tree's `rulesDigest`/`sourceCommit` once per rebuild; it runs git."""
+
+        self.build_info = {kind.name: indexes.source_build_info(kind.source_root) for kind in self.build.kinds}
+
+    def cached(self, url: str, key: object, make: Callable[[], Resource]) -> Resource:
+        hit = self.memo.get(url)
+        if hit is not None and hit[0] == key:
+            return hit[1]
+        resource = make()
+        if hit is not None and hit[1].etag == resource.etag:
+            # Same content: keep the exact bytes clients already hold.
+            resource = hit[1]
+        self.memo[url] = (key, resource)
+        return resource
+
+    def shard(self, kind: build_all.Kind, name: str, items: list[indexes.Item]) -> tuple[dict, dict]:
+        key = tuple(items)
+        hit = self.shards.get((kind.name, name))
+        if hit is None or hit[0] != key:
+            payload, entry = indexes.search_shard(kind.name, name, items, now(), compact=self.compact)
+            hit = (key, payload, entry)
+            self.shards[(kind.name, name)] = hit
+        return hit[1], hit[2]
+
+    def resolve(self, url: str) -> Resource | None:
+        site_url = self.site_url
+        if not url.startswith(site_url):
+            return self.static(url)
+        with self.lock:
+            self.refresh()
+            rest = url[len(site_url) :]
+            if rest == "llms.txt":
+                return self.pack(url)
+            for kind in self.build.kinds:
+                prefix = f"{kind.name}/"
+                if rest.startswith(prefix):
+                    resource = self.generated(kind, url, rest[len(prefix) :])
+                    if resource is not None:
+                        return resource
+        return self.static(url)
+
+    def generated(self, kind: build_all.Kind, url: str, rest: str) -> Resource | None:
+        if rest.startswith("source/"):
+            path = kind.source_root / rest[len("source/") :]
+            if path.resolve().is_relative_to(kind.source_root.resolve()) and indexes.is_source_file(path):
+                return bytes_resource(self.build.sources.read_bytes(path), content_type(path))
+            return None
+
+        items = kind.ordered()
+        key = tuple(items)
+        info = self.build_info[kind.name]
+        if rest == "index.json":
+            return self.cached(
+                url,
+                (key, tuple(info.items())),
+                lambda: json_resource(indexes.index_payload(kind.name, items, kind.section_order, now(), **info)),
+            )
+        if rest == "search.json":
+            return self.cached(
+                url,
+                (key, tuple(info.items())),
+                lambda: json_resource(
+                    indexes.search_payload(items, kind=kind.name, generated_at=now(), compact=self.compact, **info),
+                    compact=self.compact,
+                ),
+            )
+
+        sections = indexes.ordered_sections(items, kind.section_order)
+        if rest == f"{indexes.SHARD_DIR}/manifest.json":
+
+            def manifest() -> Resource:
+                entries = [self.shard(kind, name, section)[1] for name, section in sections]
+                return json_resource(indexes.shard_manifest(kind.name, len(items), entries, now()))
+
+            return self.cached(url, key, manifest)
+        for name, section in sections:
+            if rest == f"{indexes.SHARD_DIR}/{name}.json":
+                payload = self.shard(kind, name, section)[0]
+                return self.cached(url, tuple(section), lambda: json_resource(payload, compact=self.compact))
+        return None
+
+    def pack(self, url: str) -> Resource:
+        build = self.build
+        kinds = [(kind, kind.ordered()) for kind in build.kinds]
+        key = tuple(
+            (item, build.sources.read_bytes(kind.source_root / item.file)) for kind, items in kinds for item in items
+        )
+
+        def make() -> Resource:
+            docs_items, wiki_items = (
+                llms.items_from_sections(indexes.group_sections(items, kind.section_order), kind.name)
+                for kind, items in kinds
+            )
+            lines = llms.iter_llms_lines(
+                build.site_root,
+                items=(docs_items, wiki_items),
+                read=build.sources.read_text,
+                dedupe=llms.ParagraphDedupe() if self.dedupe else None,
+                entry=build.entries,
+            )
+            # Same bytes as `PackWriter`: trailing whitespace dropped, one final newline.
+            body = ("\n".join(lines).rstrip() + "\n").encode("utf-8")
+            digest = llms.PackDigest()
+            digest.update(body)
+            return Resource(body, f'"{digest.hexdigest()[:32]}"', "text/plain; charset=utf-8")
+
+        return self.cached(url, key, make)
+
+    def static(self, url: str) -> Resource | None:
+        """
+        Any other file under the web root, re-hashed only when its size or
+        mtime moves. Dotfiles and anything under a dot-directory (`.git`,
+        `.cache`) are never served.
+        """
+
+        if any(part.startswith(".") for part in url.split("/")):
+            return None
+        path = self.web_root / url.lstrip("/")
+        if path.is_dir():
+            path = path / "index.html"
+        if not path.resolve().is_relative_to(self.web_root.resolve()) or not path.is_file():
+            return None
+        st = path.stat()
+        stamp = (st.st_size, st.st_mtime_ns)
+        hit = self.statics.get(path)
+        if hit is None or hit[0] != stamp:
+            hit = (stamp, bytes_resource(path.read_bytes(), content_type(path)))
+            self.statics[path] = hit
+        return hit[1]
+
+
+RANGE = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    The `[start, end)` span of a single-range `Range` header, or None to send
+    the whole body (no header, one we do not parse, or several ranges).
+    Raises ValueError when the range cannot be satisfied.
+    """
+
+    m = RANGE.fullmatch(header.strip()) if header else None
+    if m is None or m.group(1) == m.group(2) == "":
+        return None
+    first, last = m.groups()
+    if not first:
+        suffix = int(last)
+        if suffix == 0:
+            raise ValueError(header)
+        return max(size - suffix, 0), size
+    start = int(first)
+    end = size if not last else min(int(last) + 1, size)
+    if start >= size:
+        raise ValueError(header)
+    if end <= start:
+        return None
+    return start, end
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    """`If-None-Match` uses the weak comparison: `W/` prefixes are ignored."""
+
+    if header is None:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+class PreviewHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so a page's fetches share one connection.
+    protocol_version = "HTTP/1.1"
+    server: PreviewServer
+
+    def do_GET(self) -> None:
+        self.respond(head=False)
+
+    def do_HEAD(self) -> None:
+        self.respond(head=True)
+
+    def respond(self, *, head: bool) -> None:
+        resource = self.server.preview.resolve(unquote(urlsplit(self.path).path))
+        if resource is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        if etag_matches(self.headers.get("If-None-Match"), resource.etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_validators(resource)
+            self.end_headers()
+            return
+
+        size = len(resource.body)
+        if_range = self.headers.get("If-Range")
+        try:
+            span = parse_range(self.headers.get("Range"), size) if if_range in (None, resource.etag) else None
+        except ValueError:
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        start, end = span if span is not None else (0, size)
+        self.send_response(HTTPStatus.OK if span is None else HTTPStatus.PARTIAL_CONTENT)
+        self.send_validators(resource)
+        self.send_header("Content-Type", resource.content_type)
+        self.send_header("Content-Length", str(end - start))
+        if span is not None:
+            self.send_header("Content-Range", f"bytes {start}-{end - 1}/{size}")
+        self.end_headers()
+        if not head:
+            self.wfile.write(resource.body[start:end])
+
+    def send_validators(self, resource: Resource) -> None:
+        self.send_header("ETag", resource.etag)
+        self.send_header("Accept-Ranges", "bytes")
+        # Revalidate on every fetch, so edits show up and unchanged files cost a 304.
+        self.send_header("Cache-Control", "no-cache")
+
+
+class PreviewServer(ThreadingHTTPServer):
+    def __init__(self, address: tuple[str, int], preview: Preview) -> None:
+        super().__init__(address, PreviewHandler)
+        self.preview = preview
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Serve the website with the Silk indexes, search shards, sources and llms.txt rebuilt in memory."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default 8000).")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=TOOLS_ROOT / ".cache",
+        help="Incremental build cache used for the initial load (defaults to website/silk/tools/.cache).",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Derive every item from source on startup.")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Derive items in N worker processes on startup.")
+    parser.add_argument(
+        "--search-format",
+        choices=("full", "compact"),
+        default="full",
+        help="Layout of search.json and its shards (see build-indexes.py).",
+    )
+    parser.add_argument(
+        "--no-sidecar",
+        action="store_true",
+        help="Parse every source even when the sync step left a matching .sync-items.json entry.",
+    )
+    parser.add_argument(
+        "--no-dedupe",
+        action="store_true",
+        help="Keep wiki paragraphs that repeat a docs paragraph in llms.txt (see build-llms-txt.py).",
+    )
+    args = parser.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[3]
+    web_root = repo_root / "website"
+    site_root = web_root / "silk"
+    kinds = [
+        build_all.Kind("docs", site_root / "docs", indexes.SECTION_ORDER_DOCS),
+        build_all.Kind("wiki", site_root / "wiki", indexes.SECTION_ORDER_WIKI),
+    ]
+    preview = Preview(
+        build_all.SiteBuild(site_root, kinds, args),
+        web_root,
+        compact=args.search_format == "compact",
+        dedupe=not args.no_dedupe,
+    )
+    preview.start()
+
+    server = PreviewServer((args.host, args.port), preview)
+    print(f"Serving http://{args.host}:{server.server_port}{preview.site_url}docs/ (Ctrl-C to stop).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
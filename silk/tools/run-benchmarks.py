@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import re
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from tool_loader import load_tool
+
+
+indexes = load_tool("build-indexes")
+llms = load_tool("build-llms-txt")
+synthetic = load_tool("generate-synthetic-corpus")
+
+
+BENCHMARK_VERSION = 1
+DEFAULT_SCALES = (1, 10, 100)
+KINDS = (("docs", indexes.SECTION_ORDER_DOCS), ("wiki", indexes.SECTION_ORDER_WIKI))
+
+
+def proc_status_kb(key: str) -> int | None:
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith(f"{key}:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's high-water mark (VmHWM) to the current RSS (Linux 4.0+)."""
+
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_kb() -> int:
+    peak = proc_status_kb("VmHWM")
+    if peak is None:
+        # ru_maxrss is in KiB on Linux but bytes on macOS, and never resets.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            peak //= 1024
+    return peak
+
+
+@dataclass
+class Stage:
+    name: str
+    bytes: int
+    seconds: list[float] = field(default_factory=list)
+    rss_before_kb: int = 0
+    peak_rss_kb: int = 0
+    peak_is_per_stage: bool = True
+
+    def payload(self) -> dict:
+        best = min(self.seconds)
+        return {
+            "name": self.name,
+            "bytes": self.bytes,
+            "seconds": round(best, 6),
+            "runs": [round(s, 6) for s in self.seconds],
+            "mbPerSecond": round(self.bytes / best / 1e6, 3) if best > 0 else None,
+            "rssBeforeKb": self.rss_before_kb,
+            "peakRssKb": self.peak_rss_kb,
+            "peakRssDeltaKb": max(0, self.peak_rss_kb - self.rss_before_kb) if self.peak_is_per_stage else None,
+        }
+
+
+def clear_memos() -> None:
+    """Empty the build scripts' memoized helpers, so every run starts cold."""
+
+    for module in (indexes, llms):
+        for value in vars(module).values():
+            if hasattr(value, "cache_clear"):
+                value.cache_clear()
+
+
+def measure(name: str, size: int, run: Callable[[], object], repeat: int) -> Stage:
+    """
+    Time `run` `repeat` times (the best run is reported) and record the peak
+    RSS reached while it ran. On Linux the high-water mark is reset before
+    each run, so the peak belongs to this stage alone; elsewhere it is the
+    process peak so far.
+    """
+
+    stage = Stage(name=name, bytes=size)
+    for _ in range(repeat):
+        clear_memos()
+        gc.collect()
+        stage.peak_is_per_stage = reset_peak_rss()
+        rss = proc_status_kb("VmRSS")
+        start = time.perf_counter()
+        result = run()
+        stage.seconds.append(time.perf_counter() - start)
+        stage.peak_rss_kb = max(stage.peak_rss_kb, peak_rss_kb())
+        stage.rss_before_kb = max(stage.rss_before_kb, rss or 0)
+        del result
+    return stage
+
+
+def copy_title(markdown: str, n: int) -> str:
+    """Suffix the first `# ` heading so copies get distinct titles."""
+
+    return re.sub(r"^(# .*)$", rf"\1 (copy {n})", markdown, count=1, flags=re.M)
+
+
+@dataclass
+class Corpus:
+    """The docs and wiki sources repeated `scale` times under `root`, keyed by `<kind>/<rel>`."""
+
+    scale: int
+    root: Path
+    sources: dict[str, str]
+
+    @property
+    def bytes(self) -> int:
+        return sum(len(text.encode("utf-8")) for text in self.sources.values())
+
+
+def build_corpus(site_root: Path, scale: int, dest: Path) -> Corpus:
+    """
+    Copy every source into `dest/<kind>/source`, plus `scale - 1` renamed
+    copies next to the original (`name-copyN.md`) so each copy stays in its
+    section.
+    """
+
+    sources: dict[str, str] = {}
+    for kind, _ in KINDS:
+        source_root = site_root / kind / "source"
+        for path in sorted(source_root.rglob("*")):
+            if not indexes.is_source_file(path):
+                continue
+            rel = path.relative_to(source_root)
+            text = path.read_text(encoding="utf-8")
+            for n in range(scale):
+                copy_rel = rel if n == 0 else rel.with_name(f"{rel.stem}-copy{n}{rel.suffix}")
+                copy_text = text if n == 0 else copy_title(text, n)
+                out = dest / kind / "source" / copy_rel
+                out.parent.mkdir(parents=True, exist_ok=True)
+                out.write_text(copy_text, encoding="utf-8")
+                sources[f"{kind}/{copy_rel.as_posix()}"] = copy_text
+
+    return Corpus(scale=scale, root=dest, sources=sources)
+
+
+def synthetic_corpus(scale: int, dest: Path, seed: int) -> Corpus:
+    """Generate a seeded corpus `scale` times the real page count (see generate-synthetic-corpus.py)."""
+
+    synthetic.write_corpus(dest, seed=seed, scale=scale)
+    sources: dict[str, str] = {}
+    for kind, _ in KINDS:
+        source_root = dest / kind / "source"
+        for path in sorted(source_root.rglob("*")):
+            if indexes.is_source_file(path):
+                sources[f"{kind}/{path.relative_to(source_root).as_posix()}"] = path.read_text(encoding="utf-8")
+    return Corpus(scale=scale, root=dest, sources=sources)
+
+
+def collect_all(corpus: Corpus) -> list[list[indexes.Item]]:
+    return [indexes.collect_items(corpus.root / kind / "source", section_order) for kind, section_order in KINDS]
+
+
+def build_llms_txt(corpus: Corpus, items: list[list[indexes.Item]], out_root: Path, *, dedupe: bool) -> list[Path]:
+    """Write the LLM pack (and its split packs) for `items`, as build-all.py does, without compression."""
+
+    if out_root.exists():
+        shutil.rmtree(out_root)
+    out_root.mkdir(parents=True)
+    docs_items, wiki_items = (
+        llms.items_from_sections(indexes.group_sections(kind_items, section_order), kind)
+        for kind_items, (kind, section_order) in zip(items, KINDS)
+    )
+    split = llms.SplitPacks(out_root, compress=False)
+    lines = llms.iter_llms_lines(
+        corpus.root,
+        items=(docs_items, wiki_items),
+        sink=split,
+        dedupe=llms.ParagraphDedupe() if dedupe else None,
+    )
+    return llms.write_pack(out_root / "llms.txt", lines, split=split, compress=False)
+
+
+def run_scale(
+    site_root: Path,
+    scale: int,
+    work_dir: Path | None,
+    repeat: int,
+    *,
+    dedupe: bool,
+    seed: int | None,
+) -> dict:
+    with tempfile.TemporaryDirectory(prefix=f"bench-x{scale}-", dir=work_dir) as tmp:
+        tmp_root = Path(tmp)
+        if seed is None:
+            corpus = build_corpus(site_root, scale, tmp_root / "site")
+        else:
+            corpus = synthetic_corpus(scale, tmp_root / "site", seed)
+        texts = list(corpus.sources.values())
+        print(f"x{scale}: {len(texts)} files, {corpus.bytes / 1e6:.1f} MB markdown", file=sys.stderr)
+
+        items = collect_all(corpus)
+        stages = [
+            measure("collect_items", corpus.bytes, lambda: collect_all(corpus), repeat),
+            measure("strip_internal_refs", corpus.bytes, lambda: [indexes.strip_internal_refs(t) for t in texts], repeat),
+            measure("strip_markdown", corpus.bytes, lambda: [indexes.strip_markdown(t) for t in texts], repeat),
+            measure("sanitize_markdown", corpus.bytes, lambda: [llms.sanitize_markdown(t) for t in texts], repeat),
+            measure(
+                "build_llms_txt",
+                corpus.bytes,
+                lambda: build_llms_txt(corpus, items, tmp_root / "out", dedupe=dedupe),
+                repeat,
+            ),
+        ]
+        for stage in stages:
+            print(
+                f"  {stage.name:<19} {min(stage.seconds) * 1000:9.1f} ms  "
+                f"{stage.bytes / min(stage.seconds) / 1e6:7.1f} MB/s  peak {stage.peak_rss_kb / 1024:7.1f} MB",
+                file=sys.stderr,
+            )
+
+        return {
+            "scale": scale,
+            "files": len(texts),
+            "bytes": corpus.bytes,
+            "stages": [stage.payload() for stage in stages],
+            "totalSeconds": round(sum(min(stage.seconds) for stage in stages), 6),
+        }
+
+
+def parse_scales(value: str) -> list[int]:
+    try:
+        scales = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated integers, got {value!r}")
+    if not scales or any(scale < 1 for scale in scales):
+        raise argparse.ArgumentTypeError("scales must be positive integers")
+    return scales
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Silk docs + wiki build pipeline on scaled corpora.")
+    parser.add_argument(
+        "--scales",
+        type=parse_scales,
+        default=list(DEFAULT_SCALES),
+        help="Comma-separated corpus multipliers (default: 1,10,100; 1 is the real corpus).",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per stage; the fastest is reported (default: 1).")
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        help="Write the JSON report here instead of stdout (progress goes to stderr either way).",
+    )
+    parser.add_argument(
+        "--work-dir",
+        type=Path,
+        help="Where to build the scaled corpora (defaults to the system temp directory).",
+    )
+    parser.add_argument(
+        "--corpus",
+        choices=("copies", "synthetic"),
+        default="copies",
+        help="`copies` repeats the real sources; `synthetic` generates seeded pages (see generate-synthetic-corpus.py).",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Seed for `--corpus synthetic` (default: 1).")
+    parser.add_argument(
+        "--no-dedupe",
+        action="store_true",
+        help="Time the LLM pack without collapsing wiki paragraphs duplicated in the docs.",
+    )
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    seed = args.seed if args.corpus == "synthetic" else None
+
+    site_root = Path(__file__).resolve().parents[3] / "website" / "silk"
+    report = {
+        "version": BENCHMARK_VERSION,
+        "site": "silk",
+        "dedupe": not args.no_dedupe,
+        "generatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "corpus": args.corpus,
+        "seed": seed,
+        "runs": [
+            run_scale(site_root, scale, args.work_dir, args.repeat, dedupe=not args.no_dedupe, seed=seed)
+            for scale in args.scales
+        ],
+    }
+
+    text = json.dumps(report, indent=2) + "\n"
+    if args.output is None:
+        sys.stdout.write(text)
+    else:
+        args.output.write_text(text, encoding="utf-8")
+        print(f"Wrote {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
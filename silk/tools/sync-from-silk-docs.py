@@ -3,12 +3,19 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
 import re
-import shutil
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable
 
+from tool_loader import load_tool
+
+
+# Derives the items for `--sidecars`, exactly as build-indexes.py would.
+indexes = load_tool("build-indexes")
+
 
 EXCLUDE_BASENAMES = {
     # Arenas were removed from the user-facing surface; use regions instead.
@@ -24,6 +31,10 @@ EXCLUDE_BASENAMES = {
 }
 
 
+MANIFEST_NAME = ".sync-manifest.json"
+MANIFEST_VERSION = 2
+
+
 KEEP_DOCS_PREFIXES = (
     "guides/",
 )
@@ -87,9 +98,13 @@ KEEP_WIKI_FILES = {
 @dataclass(frozen=True)
 class SyncStats:
     copied: int = 0
+    unchanged: int = 0
     skipped: int = 0
     deleted: int = 0
 
+    def describe(self) -> str:
+        return f"copied: {self.copied}, unchanged: {self.unchanged}, skipped: {self.skipped}, deleted: {self.deleted}"
+
 
 def should_skip(rel: str, keep_files: set[str], keep_prefixes: tuple[str, ...]) -> bool:
     name = Path(rel).name
@@ -260,6 +275,105 @@ def sanitize_docs_markdown(markdown: str) -> str:
     return "\n".join(out_lines) + ("\n" if markdown.endswith("\n") else "")
 
 
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """
+    Write `data` unless `path` already holds exactly these bytes, so unchanged
+    files keep their mtime (and mtime-keyed caches downstream stay valid).
+    """
+
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+
+def rules_digest() -> str:
+    """
+    Digest of this script: the sanitizers and keep lists live here, so any
+    change to them invalidates every manifest entry.
+    """
+
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def read_manifest(path: Path, rules: str) -> dict[str, dict] | None:
+    """The `files` of a sync manifest written with the same rules, or None."""
+
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (
+        isinstance(manifest, dict)
+        and manifest.get("version") == MANIFEST_VERSION
+        and manifest.get("rules") == rules
+        and isinstance(manifest.get("files"), dict)
+    ):
+        return manifest["files"]
+    return None
+
+
+def intact_output(path: Path, entry: dict) -> dict | None:
+    """
+    `entry` if `path` still holds the output it records: the same size and
+    mtime, or failing the mtime, the same sha256 (the returned entry then
+    carries the new mtime). None if the file is gone or was edited.
+    """
+
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    if not path.is_file() or stat.st_size != entry.get("size"):
+        return None
+    if stat.st_mtime_ns == entry.get("mtime"):
+        return entry
+    if hashlib.sha256(path.read_bytes()).hexdigest() != entry.get("sha256"):
+        return None
+    return {**entry, "mtime": stat.st_mtime_ns}
+
+
+def write_manifest(path: Path, rules: str, files: dict[str, dict]) -> bool:
+    manifest = {"version": MANIFEST_VERSION, "rules": rules, "files": dict(sorted(files.items()))}
+    return write_if_changed(path, (json.dumps(manifest, indent=2) + "\n").encode("utf-8"))
+
+
+def write_sidecar(dst_root: Path, files: dict[str, dict]) -> bool:
+    """
+    Write the batch of derived items that `collect_items` in build-indexes.py
+    trusts for a source whose bytes still hash to the entry's `sha256`.
+    Only files build-indexes.py would index get an entry (`is_source_file`);
+    entries whose output did not change are carried over without parsing.
+    """
+
+    previous = indexes.load_sidecar(dst_root)
+    entries: dict[str, dict] = {}
+    for rel, entry in files.items():
+        if not indexes.is_source_file(dst_root / rel):
+            continue
+        old = previous.get(rel)
+        if old is not None and old["sha256"] == entry["sha256"]:
+            entries[rel] = old
+        else:
+            entries[rel] = indexes.sidecar_entry(rel, (dst_root / rel).read_bytes())
+    payload = json.dumps(indexes.sidecar_payload(entries), ensure_ascii=False, separators=(",", ":"))
+    return write_if_changed(dst_root / indexes.SIDECAR_NAME, payload.encode("utf-8"))
+
+
+def prune(path: Path, rel: str, keep_files: set[str], keep_prefixes: tuple[str, ...]) -> bool:
+    """Remove a destination file that is no longer synced, unless the website owns it."""
+
+    if path.name not in EXCLUDE_BASENAMES and should_skip(rel, keep_files, keep_prefixes):
+        return False
+    if not path.is_file():
+        return False
+    path.unlink()
+    return True
+
+
 def sync_tree(
     src_root: Path,
     dst_root: Path,
@@ -267,8 +381,28 @@ def sync_tree(
     keep_files: set[str],
     keep_prefixes: tuple[str, ...],
     sanitize: Callable[[str], str] | None = None,
+    sidecar: bool = False,
 ) -> SyncStats:
-    copied: set[str] = set()
+    """
+    Mirror `src_root` into `dst_root`, recording each synced path's source and
+    output digests in `dst_root/.sync-manifest.json`.
+
+    With a manifest from the previous run, a file whose source digest is
+    unchanged (and whose output still matches, see `intact_output`) is not
+    sanitized or compared again, and pruning only visits the paths that
+    dropped out of the manifest plus any file named in `EXCLUDE_BASENAMES`.
+    Without one, every output is compared and the whole destination tree is
+    scanned for stale files.
+
+    With `sidecar`, also write the item build-indexes.py derives from each
+    synced file to `dst_root/.sync-items.json` (see `write_sidecar`).
+    """
+
+    rules = rules_digest()
+    manifest_path = dst_root / MANIFEST_NAME
+    previous = read_manifest(manifest_path, rules)
+    files: dict[str, dict] = {}
+    copied = 0
     skipped = 0
     deleted = 0
 
@@ -283,36 +417,53 @@ def sync_tree(
             skipped += 1
             continue
 
+        source = path.read_bytes()
+        source_digest = hashlib.sha256(source).hexdigest()
         dst = dst_root / rel
-        dst.parent.mkdir(parents=True, exist_ok=True)
+        entry = previous.get(rel) if previous is not None else None
+        if entry and entry.get("source") == source_digest:
+            intact = intact_output(dst, entry)
+            if intact is not None:
+                files[rel] = intact
+                continue
 
         if sanitize and path.suffix == ".md":
-            dst.write_text(sanitize(path.read_text(encoding="utf-8")), encoding="utf-8")
+            data = sanitize(source.decode("utf-8")).encode("utf-8")
         else:
-            shutil.copyfile(path, dst)
-        copied.add(rel)
-
-    # Prune any previously-synced files that no longer exist upstream.
-    for path in sorted(dst_root.rglob("*")):
-        if not path.is_file():
-            continue
-        if path.suffix not in (".md", ".txt"):
-            continue
-
-        if path.name in EXCLUDE_BASENAMES:
-            path.unlink()
-            deleted += 1
-            continue
+            data = source
+        if write_if_changed(dst, data):
+            copied += 1
+        files[rel] = {
+            "source": source_digest,
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "size": len(data),
+            "mtime": dst.stat().st_mtime_ns,
+        }
+
+    if previous is not None:
+        for rel in sorted(previous.keys() - files.keys()):
+            deleted += prune(dst_root / rel, rel, keep_files, keep_prefixes)
+        # Excluded files never enter the manifest, so look for them by name.
+        for path in sorted(dst_root.rglob("*")):
+            if path.name in EXCLUDE_BASENAMES:
+                deleted += prune(path, path.relative_to(dst_root).as_posix(), keep_files, keep_prefixes)
+    else:
+        # No usable manifest: prune any previously-synced files that no longer exist upstream.
+        for path in sorted(dst_root.rglob("*")):
+            if not path.is_file():
+                continue
+            if path.suffix not in (".md", ".txt"):
+                continue
 
-        rel = path.relative_to(dst_root).as_posix()
-        if should_skip(rel, keep_files, keep_prefixes):
-            continue
-        if rel in copied:
-            continue
-        path.unlink()
-        deleted += 1
+            rel = path.relative_to(dst_root).as_posix()
+            if rel in files:
+                continue
+            deleted += prune(path, rel, keep_files, keep_prefixes)
 
-    return SyncStats(copied=len(copied), skipped=skipped, deleted=deleted)
+    write_manifest(manifest_path, rules, files)
+    if sidecar:
+        write_sidecar(dst_root, files)
+    return SyncStats(copied=copied, unchanged=len(files) - copied, skipped=skipped, deleted=deleted)
 
 
 def main() -> None:
@@ -325,6 +476,11 @@ def main() -> None:
         default=None,
         help="Path to repo root (auto-detected by default).",
     )
+    parser.add_argument(
+        "--sidecars",
+        action="store_true",
+        help="Also write .sync-items.json with the index item derived from each synced page (read by build-indexes.py).",
+    )
     args = parser.parse_args()
 
     repo_root = args.repo_root if args.repo_root else Path(__file__).resolve().parents[3]
@@ -345,6 +501,7 @@ def main() -> None:
         keep_files=KEEP_DOCS_FILES,
         keep_prefixes=KEEP_DOCS_PREFIXES + ("wiki/",),
         sanitize=sanitize_docs_markdown,
+        sidecar=args.sidecars,
     )
 
     # Wiki: copy everything under docs/wiki into website wiki source.
@@ -355,17 +512,14 @@ def main() -> None:
             keep_files=KEEP_WIKI_FILES,
             keep_prefixes=(),
             sanitize=sanitize_wiki_markdown,
+            sidecar=args.sidecars,
         )
     else:
         wiki_stats = SyncStats()
 
     print("Synced Silk docs to website:")
-    print(
-        f"- Docs copied:   {docs_stats.copied} (skipped: {docs_stats.skipped}, deleted: {docs_stats.deleted})"
-    )
-    print(
-        f"- Wiki copied:   {wiki_stats.copied} (skipped: {wiki_stats.skipped}, deleted: {wiki_stats.deleted})"
-    )
+    print(f"- Docs: {docs_stats.describe()}")
+    print(f"- Wiki: {wiki_stats.describe()}")
 
 
 if __name__ == "__main__":
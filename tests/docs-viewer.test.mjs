@@ -0,0 +1,139 @@
+// Run with `node --test tests/`. Loads assets/docs-viewer.js against a
+// minimal DOM and the committed Silk docs artifacts.
+
+import assert from "node:assert/strict";
+import { readFile } from "node:fs/promises";
+import { test } from "node:test";
+import { fileURLToPath } from "node:url";
+import vm from "node:vm";
+
+const root = new URL("../", import.meta.url);
+const siteUrl = "http://localhost/silk/docs/";
+
+class FakeElement {
+  constructor(attrs = {}) {
+    this.attrs = attrs;
+    this.children = [];
+    this.dataset = {};
+    this.listeners = {};
+    this.hidden = false;
+    this.innerHTML = "";
+    this.textContent = "";
+  }
+  getAttribute(name) {
+    return name in this.attrs ? this.attrs[name] : null;
+  }
+  querySelector() {
+    return null;
+  }
+  querySelectorAll() {
+    return [];
+  }
+  appendChild(child) {
+    this.children.push(child);
+    return child;
+  }
+  replaceChildren(...children) {
+    this.children = children;
+  }
+  addEventListener(type, listener) {
+    (this.listeners[type] ||= []).push(listener);
+  }
+}
+
+// Load the viewer as the docs page would and hand back its search box,
+// results list and every URL it fetched.
+async function openDocsPage() {
+  const elements = {
+    "[data-docs-nav]": new FakeElement(),
+    "[data-docs-content]": new FakeElement(),
+    "[data-docs-search]": new FakeElement(),
+    "[data-docs-results]": new FakeElement(),
+  };
+  const app = new FakeElement({
+    "data-kind": "docs",
+    "data-index": "./index.json",
+    "data-search": "./search.json",
+    "data-search-manifest": "./search/manifest.json",
+    "data-base": "./source/",
+  });
+  app.querySelector = (selector) => elements[selector] || null;
+
+  const fetched = [];
+  const fetch = async (url) => {
+    const href = new URL(url, siteUrl).href;
+    fetched.push(href);
+    // Pages themselves are not needed for search.
+    if (!href.endsWith(".json")) return { ok: false, status: 404, statusText: "Not Found" };
+    const path = fileURLToPath(new URL(new URL(href).pathname.slice(1), root));
+    try {
+      const body = await readFile(path, "utf-8");
+      return { ok: true, json: async () => JSON.parse(body) };
+    } catch {
+      return { ok: false, status: 404, statusText: "Not Found" };
+    }
+  };
+
+  const context = vm.createContext({
+    URL,
+    URLSearchParams,
+    TextEncoder,
+    atob,
+    fetch,
+    console,
+    document: {
+      querySelector: (selector) => (selector === "[data-docs-app]" ? app : null),
+      createElement: () => new FakeElement(),
+      createDocumentFragment: () => new FakeElement(),
+      getElementById: () => null,
+    },
+    location: { href: siteUrl, search: "", hash: "", pathname: "/silk/docs/" },
+    history: { replaceState() {}, pushState() {} },
+    addEventListener() {},
+  });
+  context.globalThis = context;
+  const source = await readFile(new URL("assets/docs-viewer.js", root), "utf-8");
+  vm.runInContext(source, context);
+
+  const search = elements["[data-docs-search]"];
+  const results = elements["[data-docs-results]"];
+  await settle(() => search.listeners.input);
+  return { search, results, fetched };
+}
+
+async function settle(done) {
+  for (let i = 0; i < 200 && !done(); i++) await new Promise((resolve) => setTimeout(resolve, 5));
+  assert.ok(done(), "viewer did not settle");
+}
+
+function shardsFetched(page) {
+  return new Set(page.fetched.filter((url) => url.includes("/search/") && !url.endsWith("manifest.json")));
+}
+
+async function type(page, query) {
+  page.search.value = query;
+  page.results.children = [];
+  for (const listener of page.search.listeners.input) await listener();
+  return page.results.children[0]?.children.map((a) => a.dataset.docId) || [];
+}
+
+test("a two-character query on a cold page searches every shard", async () => {
+  const page = await openDocsPage();
+  const manifest = JSON.parse(await readFile(new URL("silk/docs/search/manifest.json", root), "utf-8"));
+  assert.equal(shardsFetched(page).size, 0);
+
+  const ids = await type(page, "fs");
+  assert.ok(ids.includes("std/filesystem"), `expected std/filesystem in ${JSON.stringify(ids)}`);
+  const shards = shardsFetched(page);
+  assert.equal(shards.size, manifest.shards.length);
+});
+
+test("a long term only fetches the shards its bloom filters admit", async () => {
+  const page = await openDocsPage();
+  const manifest = JSON.parse(await readFile(new URL("silk/docs/search/manifest.json", root), "utf-8"));
+
+  const ids = await type(page, "channel");
+  assert.ok(ids.length > 0);
+  const shards = shardsFetched(page);
+  assert.ok(shards.size < manifest.shards.length, `fetched all ${shards.size} shards`);
+});
@@ -0,0 +1,147 @@
+import importlib.util
+import re
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "silk" / "tools"))
+
+from tool_loader import load_tool  # noqa: E402
+
+indexes = load_tool("build-indexes")
+
+GENERATED_AT = re.compile(rb'"generatedAt":\s*"[^"]*"')
+
+SOURCES = {
+    "start.md": "# Start\n\nWhere the docs begin.\n",
+    "language/borrowing.md": "# Borrowing\n\nShared and unique borrows.\n\n## Rules\n\nOne writer at a time.\n",
+    "std/channel.md": "# Channels\n\nSend values between tasks.\n",
+}
+
+
+def git(root: Path, *args: str) -> None:
+    subprocess.run(["git", "-C", str(root), *args], check=True, capture_output=True)
+
+
+class BuildOnlyTest(unittest.TestCase):
+    """`--only` must write exactly what a full build writes, `generatedAt` aside."""
+
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.kind_root = Path(tmp.name)
+        self.source_root = self.kind_root / "source"
+        for rel, text in SOURCES.items():
+            self.write(rel, text)
+        git(self.kind_root, "init", "-q")
+        self.commit("sources")
+        self.build()
+
+    def write(self, rel: str, text: str) -> None:
+        path = self.source_root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+    def commit(self, message: str) -> None:
+        git(self.kind_root, "add", "source")
+        git(self.kind_root, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "-m", message)
+
+    def build(self) -> None:
+        indexes.build(self.kind_root, "docs", indexes.SECTION_ORDER_DOCS, compress=False, sidecar=False)
+
+    def build_only(self, *doc_ids: str) -> None:
+        indexes.build_only(self.kind_root, "docs", indexes.SECTION_ORDER_DOCS, list(doc_ids), compress=False)
+
+    def artifacts(self) -> dict[str, bytes]:
+        return {
+            path.relative_to(self.kind_root).as_posix(): GENERATED_AT.sub(b"", path.read_bytes())
+            for path in sorted(self.kind_root.rglob("*.json"))
+            if self.source_root not in path.parents
+        }
+
+    def assertMatchesFullBuild(self) -> dict[str, bytes]:
+        only = self.artifacts()
+        self.build()
+        full = self.artifacts()
+        self.assertEqual(only.keys(), full.keys())
+        for name in full:
+            self.assertEqual(only[name], full[name], name)
+        return full
+
+    def source_commit(self) -> str | None:
+        return indexes.read_json(self.kind_root / "index.json")[indexes.SOURCE_COMMIT_KEY]
+
+    def test_uncommitted_edit(self) -> None:
+        self.write("std/channel.md", "# Channels\n\nSend and receive values between tasks.\n")
+        self.build_only("std/channel")
+        self.assertMatchesFullBuild()
+        self.assertIsNone(self.source_commit())
+
+    def test_committed_edit(self) -> None:
+        self.write("std/channel.md", "# Channels\n\nBounded and unbounded queues.\n")
+        self.commit("edit")
+        self.build_only("std/channel")
+        self.assertMatchesFullBuild()
+        self.assertIsNotNone(self.source_commit())
+
+    def test_added_and_removed_documents(self) -> None:
+        self.write("std/task.md", "# Tasks\n\nSpawn work.\n")
+        (self.source_root / "language/borrowing.md").unlink()
+        self.commit("add and remove")
+        self.build_only("std/task", "language/borrowing")
+        self.assertMatchesFullBuild()
+
+    def test_unlisted_change_records_no_commit(self) -> None:
+        self.write("std/channel.md", "# Channels\n\nClosed channels.\n")
+        self.write("start.md", "# Start\n\nA new introduction.\n")
+        self.commit("two edits")
+        self.build_only("std/channel")
+        # `start` is stale, so the output matches no commit.
+        self.assertIsNone(self.source_commit())
+
+
+def load_variant(source: str) -> object:
+    """build-indexes.py with `source` as its text, loaded as a separate module."""
+
+    tmp = tempfile.TemporaryDirectory()
+    path = Path(tmp.name) / "build_indexes_variant.py"
+    path.write_text(source, encoding="utf-8")
+    spec = importlib.util.spec_from_file_location("build_indexes_variant", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    try:
+        spec.loader.exec_module(module)
+        module.rules_digest()
+    finally:
+        del sys.modules[spec.name]
+        tmp.cleanup()
+    return module
+
+
+class RulesDigestTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.source = Path(indexes.__file__).read_text(encoding="utf-8")
+
+    def test_covers_helpers_of_derive_item(self) -> None:
+        code = indexes.derivation_code([indexes.derive_item])
+        for name in ("split_chunks", "strip_markdown", "first_paragraph", "Slugger"):
+            self.assertIn(name, code["sources"])
+        self.assertIn("SLASH_COMMENT_LANGS", code["constants"])
+
+    def test_helper_edit_changes_digest(self) -> None:
+        old = "def first_paragraph(markdown: str) -> str:\n"
+        self.assertIn(old, self.source)
+        edited = load_variant(self.source.replace(old, old + "    markdown = markdown.strip()\n", 1))
+        self.assertNotEqual(edited.rules_digest(), indexes.rules_digest())
+
+    def test_writer_edit_keeps_digest(self) -> None:
+        old = "def write_json_if_changed(\n"
+        self.assertIn(old, self.source)
+        edited = load_variant(self.source.replace(old, "# Unrelated edit.\n" + old, 1))
+        self.assertEqual(edited.rules_digest(), indexes.rules_digest())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "silk" / "tools"))
+
+from tool_loader import load_tool  # noqa: E402
+
+llms = load_tool("build-llms-txt")
+
+PARAGRAPH = (
+    "Use `#require` on a `struct` to state requirements that must hold for all values constructed "
+    "for that type, checked whenever a value of the type is built."
+)
+
+
+def item(kind: str, doc_id: str, title: str) -> llms.DocItem:
+    section = doc_id.split("/")[0]
+    return llms.DocItem(kind=kind, section=section, id=doc_id, title=title, file=f"{doc_id}.md")
+
+
+def lines(doc: llms.DocItem, body: str) -> list[str]:
+    return llms.entry_lines(doc, Path(__file__), lambda _: body)
+
+
+def source(dedupe: llms.ParagraphDedupe, wiki: llms.DocItem) -> str:
+    (match,) = [match for (key, _), match in dedupe.matches.items() if key == llms.doc_key(wiki)]
+    return llms.doc_key(match[1])
+
+
+class ParagraphDedupeTest(unittest.TestCase):
+    def test_tie_prefers_docs_page_with_the_wiki_id(self) -> None:
+        wiki = item("wiki", "language/struct-requirements", "Struct requirements")
+        dedupe = llms.ParagraphDedupe()
+        dedupe.add_wiki(wiki, lines(wiki, f"# Struct requirements\n\n{PARAGRAPH}\n"))
+        for doc_id in ("guides/overview", "language/refinement-types", "language/struct-requirements"):
+            doc = item("docs", doc_id, doc_id)
+            dedupe(doc, lines(doc, f"# {doc_id}\n\n{PARAGRAPH}\n"))
+        self.assertEqual(source(dedupe, wiki), "docs:language/struct-requirements")
+
+    def test_tie_prefers_same_section(self) -> None:
+        wiki = item("wiki", "language/struct-requirements", "Struct requirements")
+        dedupe = llms.ParagraphDedupe()
+        dedupe.add_wiki(wiki, lines(wiki, f"# Struct requirements\n\n{PARAGRAPH}\n"))
+        for doc_id in ("guides/overview", "language/refinement-types"):
+            doc = item("docs", doc_id, doc_id)
+            dedupe(doc, lines(doc, f"# {doc_id}\n\n{PARAGRAPH}\n"))
+        self.assertEqual(source(dedupe, wiki), "docs:language/refinement-types")
+
+    def test_struct_requirements_points_at_its_docs_page(self) -> None:
+        # Regression: the identical paragraph in "Refinement Types (Removed)"
+        # is scanned first and used to win the tie.
+        site = ROOT / "silk"
+        wiki = item("wiki", "language/struct-requirements", "Struct requirements")
+        dedupe = llms.ParagraphDedupe()
+        dedupe.add_wiki(wiki, llms.entry_lines(wiki, site / "wiki/source" / wiki.file, Path.read_text))
+        for doc_id in ("language/refinement-types", "language/struct-requirements"):
+            doc = item("docs", doc_id, doc_id)
+            dedupe(doc, llms.entry_lines(doc, site / "docs/source" / doc.file, Path.read_text))
+        self.assertEqual(source(dedupe, wiki), "docs:language/struct-requirements")
+
+
+if __name__ == "__main__":
+    unittest.main()
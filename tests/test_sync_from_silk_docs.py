@@ -0,0 +1,45 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "silk" / "tools"))
+
+from tool_loader import load_tool  # noqa: E402
+
+sync = load_tool("sync-from-silk-docs")
+
+
+class SyncTreeTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.src_root = Path(tmp.name) / "upstream"
+        self.dst_root = Path(tmp.name) / "source"
+        self.write(self.src_root / "std/channel.md", "# Channels\n\nSend values between tasks.\n")
+
+    def write(self, path: Path, text: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+    def sync(self) -> None:
+        sync.sync_tree(self.src_root, self.dst_root, keep_files=set(), keep_prefixes=("guides/",))
+
+    def test_excluded_files_are_removed_with_a_manifest(self) -> None:
+        self.sync()
+        self.assertTrue((self.dst_root / sync.MANIFEST_NAME).is_file())
+        for rel in ("README.md", "std/PLAN.md", "guides/STATUS.md"):
+            self.write(self.dst_root / rel, "# Leftover\n")
+        self.write(self.dst_root / "guides/intro.md", "# Intro\n")
+
+        self.sync()
+        self.assertFalse((self.dst_root / "README.md").exists())
+        self.assertFalse((self.dst_root / "std/PLAN.md").exists())
+        self.assertFalse((self.dst_root / "guides/STATUS.md").exists())
+        # Website-owned files stay.
+        self.assertTrue((self.dst_root / "guides/intro.md").is_file())
+        self.assertTrue((self.dst_root / "std/channel.md").is_file())
+
+
+if __name__ == "__main__":
+    unittest.main()